@@ -0,0 +1,145 @@
+"""
+Measures the console/file logging path, before and after precompiling the
+per-level formatters and moving the handlers behind a queue.
+
+Two numbers for each: how many records per second the formatter alone gets
+through, and how many records per second the *logging call* gets through as
+seen by the caller (the event loop), with the console going to /dev/null and
+the file to a temporary directory.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_logging --records 50000
+"""
+
+from __future__ import annotations
+import argparse
+import logging
+import os
+import queue
+import tempfile
+import time
+from logging.handlers import QueueListener
+
+from utils_v2.log_handler import LogHandler
+
+FILE_FORMAT = logging.Formatter(
+    "[{asctime}] [{levelname:<8}] {name}: {message}", "%Y-%m-%d %H:%M:%S", style="{"
+)
+
+
+class LegacyFormatter(LogHandler.LoggingFormatter):
+    """The formatter as it was: string replaces and a new ``Formatter`` for
+    every record."""
+
+    def __init__(self):
+        logging.Formatter.__init__(self)
+
+    def format(self, record):
+        log_color = self.COLORS[record.levelno]
+        format = "(black){asctime}(reset) (levelcolor){levelname:<8}(reset) (green){name}(reset) {message}"
+        format = format.replace("(black)", self.black + self.bold)
+        format = format.replace("(reset)", self.reset)
+        format = format.replace("(levelcolor)", log_color)
+        format = format.replace("(green)", self.green + self.bold)
+        formatter = logging.Formatter(format, "%Y-%m-%d %H:%M:%S", style="{")
+        return formatter.format(record)
+
+
+def make_records(count: int) -> list[logging.LogRecord]:
+    # mostly DEBUG, like discord.py's gateway chatter
+    levels = [logging.DEBUG] * 8 + [logging.INFO, logging.WARNING]
+    return [
+        logging.LogRecord(
+            "discord.gateway",
+            levels[i % len(levels)],
+            __file__,
+            i,
+            "Keeping shard ID %s websocket alive with sequence %s.",
+            (None, i),
+            None,
+        )
+        for i in range(count)
+    ]
+
+
+def bench_format(formatter: logging.Formatter, records) -> float:
+    start = time.perf_counter()
+    for record in records:
+        # formatters cache the message on the record, start from scratch
+        record.message = None
+        formatter.format(record)
+    return len(records) / (time.perf_counter() - start)
+
+
+def make_handlers(console_formatter: logging.Formatter, directory: str):
+    console = logging.StreamHandler(open(os.devnull, "w", encoding="utf-8"))
+    console.setFormatter(console_formatter)
+    file = logging.FileHandler(
+        os.path.join(directory, "bench.log"), encoding="utf-8", mode="w"
+    )
+    file.setFormatter(FILE_FORMAT)
+    return console, file
+
+
+def bench_logger(name: str, handlers, use_queue: bool, count: int):
+    """Returns (records/s seen by the caller, records/s until all written)."""
+    logger = logging.getLogger(f"bench.{name}")
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+
+    listener = None
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        logger.addHandler(LogHandler.LazyQueueHandler(log_queue))
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
+
+    start = time.perf_counter()
+    for i in range(count):
+        logger.debug("Keeping shard ID %s websocket alive with sequence %s.", None, i)
+    caller = time.perf_counter() - start
+    if listener:
+        listener.stop()
+    total = time.perf_counter() - start
+
+    for handler in handlers:
+        handler.close()
+    return count / caller, count / total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--records", type=int, default=50000, help="records per run (default 50000)"
+    )
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    print(f"{args.records} records\n")
+    print(f"{'formatter':<28} {'records/s':>12}")
+    legacy = bench_format(LegacyFormatter(), records)
+    current = bench_format(LogHandler.LoggingFormatter(), records)
+    print(f"{'before (per record)':<28} {legacy:>12,.0f}")
+    print(f"{'after (precompiled)':<28} {current:>12,.0f}  x{current / legacy:.1f}")
+
+    print(f"\n{'logging call':<28} {'caller rec/s':>12} {'written rec/s':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        runs = [
+            ("before (inline handlers)", LegacyFormatter(), False),
+            ("after (queue + listener)", LogHandler.LoggingFormatter(), True),
+        ]
+        for label, formatter, use_queue in runs:
+            handlers = make_handlers(formatter, directory)
+            caller, written = bench_logger(
+                label.split()[0], handlers, use_queue, args.records
+            )
+            print(f"{label:<28} {caller:>12,.0f} {written:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
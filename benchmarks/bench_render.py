@@ -0,0 +1,138 @@
+"""
+Compares the leaderboard render backends on latency and peak memory.
+
+Every backend runs in its own fresh (spawned) process, the same way the
+render workers do, so import cost and peak RSS aren't skewed by whichever
+backend ran first.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_render --rows 50 --runs 20
+"""
+
+from __future__ import annotations
+import argparse
+import multiprocessing
+import random
+import resource
+import statistics
+import string
+import sys
+import time
+from typing import Any
+
+from leaderboard_draw import RENDER_BACKENDS
+
+HEADERS = ["rank", "osu_username", "initial_pp", "current_pp", "pp_change", "points"]
+
+# Same values LeaderboardRenderer._style() produces for the default theme.
+STYLE = {
+    "odd_row_color": "#000000",
+    "even_row_color": "#222222",
+    "text_color": "white",
+    "header_color": "#FF69B4",
+    "font_size": 14,
+    "dpi": 250,
+    "bold_columns": ["osu_username", "challenger", "challenged"],
+}
+
+
+def make_rows(count: int, seed: int = 0) -> list[tuple[Any, ...]]:
+    """League-like rows: username, pp values, a change and points."""
+    rng = random.Random(seed)
+    rows = []
+    for rank in range(1, count + 1):
+        name = "".join(rng.choices(string.ascii_letters + "_", k=rng.randint(3, 15)))
+        initial = rng.randint(1000, 12000)
+        current = initial + rng.randint(0, 800)
+        rows.append(
+            (rank, name, initial, current, current - initial, rng.randint(0, 5000))
+        )
+    return rows
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_backend(backend: str, rows: int, runs: int, results) -> None:
+    """Body of the per backend subprocess, puts a result dict on ``results``."""
+    try:
+        draw = RENDER_BACKENDS[backend]
+        table = make_rows(rows)
+        style = dict(STYLE, backend=backend)
+        baseline = peak_rss_mb()
+
+        start = time.perf_counter()
+        size = len(draw(HEADERS, table, style))
+        first = time.perf_counter() - start
+
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            draw(HEADERS, table, style)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+
+        results.put(
+            {
+                "backend": backend,
+                "first": first,
+                "mean": statistics.fmean(timings),
+                "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+                "baseline_mb": baseline,
+                "peak_mb": peak_rss_mb(),
+                "png_kb": size / 1024,
+            }
+        )
+    except Exception as error:
+        results.put({"backend": backend, "error": f"{type(error).__name__}: {error}"})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50, help="table rows (default 50)")
+    parser.add_argument(
+        "--runs", type=int, default=20, help="timed renders (default 20)"
+    )
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=sorted(RENDER_BACKENDS),
+        help="backend to run, repeatable (default: all)",
+    )
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    reports = []
+    for backend in args.backend or sorted(RENDER_BACKENDS):
+        process = ctx.Process(
+            target=run_backend, args=(backend, args.rows, args.runs, results)
+        )
+        process.start()
+        reports.append(results.get())
+        process.join()
+
+    print(f"{args.rows} rows, {args.runs} timed renders per backend\n")
+    print(
+        f"{'backend':<10} {'first ms':>9} {'mean ms':>8} {'p95 ms':>8} "
+        f"{'peak MB':>8} {'+MB':>6} {'png KB':>7}"
+    )
+    for report in reports:
+        if "error" in report:
+            print(f"{report['backend']:<10} failed: {report['error']}")
+            continue
+        print(
+            f"{report['backend']:<10} {report['first'] * 1000:>9.1f} "
+            f"{report['mean'] * 1000:>8.1f} {report['p95'] * 1000:>8.1f} "
+            f"{report['peak_mb']:>8.1f} "
+            f"{report['peak_mb'] - report['baseline_mb']:>6.1f} "
+            f"{report['png_kb']:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,12 @@ from utils_v2 import (
     InitExterns,
     ChallengeView,
     DynamicButtons,
+    ShowPageButton,
+    OsuAPI_Handler,
+    IdentityCache,
+    RenderCache,
+    RenderPool,
+    SingleFlight,
 )
 
 
@@ -32,17 +38,40 @@ class OsuArena(commands.Bot):
         self.logger = self.log_handler.logger
 
         self.db_handler = None
+        self.render_cache = RenderCache(
+            max_bytes=ENV.RENDER_CACHE_MB * 1024 * 1024,
+            disk_dir=ENV.RENDER_CACHE_DIR,
+            max_disk_files=ENV.RENDER_CACHE_DISK_FILES,
+        )
+        self.render_pool = RenderPool(
+            workers=ENV.RENDER_WORKERS,
+            max_pending=ENV.RENDER_QUEUE_SIZE,
+            timeout=ENV.RENDER_TIMEOUT,
+        )
+        self.render_backend = ENV.RENDER_BACKEND
+        self.render_flight = SingleFlight("render")
         self.supabase_client = None
         self.osu_client = None
         self.osu_auth = None
+        self.osu_api = None
+        self.osu_pool = None
 
     async def setup_hook(self) -> None:
         self.logger.info(f"Logged in as {self.user.name}")
         self.add_view(ChallengeView())
 
         self.add_dynamic_items(DynamicButtons)
+        self.add_dynamic_items(ShowPageButton)
         await self.init_externs()
-        self.db_handler = DatabaseHandler(self.log_handler, self.supabase_client)
+        self.db_handler = DatabaseHandler(
+            self.log_handler,
+            self.supabase_client,
+            IdentityCache(ENV.IDENTITY_CACHE_SIZE, ENV.IDENTITY_CACHE_TTL),
+            season_cache_ttl=ENV.SEASON_CACHE_TTL,
+            chunk_size=ENV.DB_CHUNK_SIZE,
+        )
+        # warm the season cache, most commands check it
+        await self.db_handler.get_current_season(refresh=True)
 
         await self.load_cogs()
 
@@ -91,6 +120,22 @@ class OsuArena(commands.Bot):
             ENV.SUPABASE_URL, ENV.SUPABASE_KEY
         )
         self.osu_client = await init_obj.setup_osu_client(self.osu_auth)
+        # every app's budget is split between the processes using it, the
+        # limiters are per process and would add up otherwise
+        self.osu_api = OsuAPI_Handler(
+            self.osu_client,
+            requests_per_minute=max(1, ENV.OSU_API_RPM - ENV.WEB_OSU_API_RPM),
+        )
+        # secondary apps, only used for background fetches
+        self.osu_pool = await init_obj.setup_osu_pool(
+            [
+                (ENV.OSU_CLIENT_ID, ENV.OSU_CLIENT_SECRET),
+                (ENV.OSU_CLIENT2_ID, ENV.OSU_CLIENT2_SECRET),
+            ],
+            ENV.REDIRECT_URL,
+            max(1, ENV.OSU_API_RPM - ENV.UPDATER_OSU_API_RPM),
+            ENV.OSU_POOL_STRATEGY,
+        )
 
     @property
     def guild(self) -> discord.Guild | None:
@@ -115,6 +160,8 @@ class OsuArena(commands.Bot):
                 await self.log_handler.report_info("Bot is closing")
             except Exception as e:
                 self.logger.error(f"Failed to report shutdown: {e}")
+            await self.log_handler.close()
+        self.render_pool.close()
         await super().close()
 
 
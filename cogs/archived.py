@@ -33,7 +33,9 @@ class Archives(commands.Cog):
                 )
                 return
 
-            await self._render_and_send(interaction, headers, rows, title)
+            # finished seasons never change, live rivals do
+            permanent = league_name != ArchivedTable.RIVALS
+            await self._render_and_send(interaction, headers, rows, title, permanent)
 
         except Exception as e:
             self.bot.error_handler.logger.error(f"Archive Error: {e}")
@@ -129,8 +131,10 @@ class Archives(commands.Cog):
         title = f"📜 {league.capitalize()} League - Season {season}"
         return (*data, title) if data else ([], [], title)
 
-    async def _render_and_send(self, interaction, headers, rows, title):
-        image_buf = await self.renderer.leaderboard.render_image(headers, rows)
+    async def _render_and_send(self, interaction, headers, rows, title, permanent):
+        image_buf = await self.renderer.leaderboard.render_image(
+            headers, rows, permanent=permanent
+        )
 
         if not image_buf:
             await interaction.followup.send(
@@ -1,18 +1,24 @@
 from __future__ import annotations
 import asyncio
+import time
 from typing import Any, TYPE_CHECKING
 import discord
 import datetime
+from discord import app_commands
 from discord.ext import commands, tasks
 from supabase import AsyncClient
 from utils_v2 import (
     ChallengeStatus,
     RivalsColumn,
     TablesRivals,
-    RivalsData,
+    MessageIdColumn,
     DiscordOsuColumn,
     Renderer,
     TablesLeagues,
+    RequestPriority,
+    TableMiscellaneous,
+    ChangeListener,
+    AdaptiveScheduler,
 )
 from zoneinfo import ZoneInfo
 from load_env import ENV
@@ -22,38 +28,284 @@ if TYPE_CHECKING:
     from bot import OsuArena
 
 MAX_TRIES = 3
+# How long a processed row is remembered, so the poller and the change feed
+# don't both announce the same thing
+HANDLED_TTL = 300
 
 weekly_time = datetime.time(hour=0, minute=0, tzinfo=ZoneInfo("America/Chicago"))
 
 
 class Monitor(commands.Cog, name="monitor"):
+    CHANGE_SUBSCRIPTIONS = [
+        # only rows with something to announce, the identity cache
+        # gets the rest through its TTL and the deletes
+        (
+            "INSERT",
+            TableMiscellaneous.DISCORD_OSU,
+            f"{DiscordOsuColumn.NEW_PLAYER_ANNOUNCE}=eq.true",
+        ),
+        (
+            "UPDATE",
+            TableMiscellaneous.DISCORD_OSU,
+            f"{DiscordOsuColumn.NEW_PLAYER_ANNOUNCE}=eq.true",
+        ),
+        (
+            "UPDATE",
+            TableMiscellaneous.DISCORD_OSU,
+            f"{DiscordOsuColumn.TOP_PLAY_ANNOUNCE}=eq.true",
+        ),
+        ("DELETE", TableMiscellaneous.DISCORD_OSU, None),
+        (
+            "UPDATE",
+            TablesRivals.RIVALS,
+            f"{RivalsColumn.CHALLENGE_STATUS}=eq.{ChallengeStatus.UNFINISHED}",
+        ),
+    ]
+    CHANGE_PRIMARY_KEYS = {
+        TableMiscellaneous.DISCORD_OSU: DiscordOsuColumn.DISCORD_ID,
+        TablesRivals.RIVALS: RivalsColumn.CHALLENGE_ID,
+    }
+
     def __init__(self, bot: OsuArena, supabase_client: AsyncClient):
         self.bot = bot
         self.supabase_client = supabase_client
         self.log_handler = self.bot.log_handler
         self.db_handler = self.bot.db_handler
         self.osu_client = self.bot.osu_client
+        self.osu_api = self.bot.osu_api
+        self.osu_pool = self.bot.osu_pool
         self.renderer = Renderer(self.bot)
         self.logger = self.log_handler.logger
-        self.monitor_database.start()
+
+        self.change_listener = ChangeListener(
+            self.log_handler,
+            self.supabase_client,
+            self.CHANGE_SUBSCRIPTIONS,
+            self.CHANGE_PRIMARY_KEYS,
+            on_delete=self.dispatch_delete,
+        )
+        self.change_consumer: asyncio.Task | None = None
+        self._claimed: set[tuple] = set()
+        self._handled: dict[tuple, float] = {}
+
+        self.scheduler = AdaptiveScheduler(
+            self.log_handler, "Monitor", max_failures=MAX_TRIES
+        )
+        for name, detector in (
+            ("monitor_new_players", self.monitor_new_players),
+            ("monitor_top_plays", self.monitor_top_plays),
+            ("monitor_rivals", self.monitor_rivals),
+        ):
+            self.scheduler.add_job(
+                name,
+                detector,
+                ENV.MONITOR_MIN_INTERVAL,
+                ENV.MONITOR_MAX_INTERVAL,
+                floor=self._poll_floor,
+            )
+
         self.weekly_point_update.start()
 
-    def cog_unload(self):
-        self.monitor_database.cancel()
+    async def cog_load(self):
+        self.scheduler.start(wait_for=self.bot.wait_until_ready())
+        if not ENV.MONITOR_REALTIME:
+            return
+        if await self.change_listener.start():
+            self.change_consumer = asyncio.create_task(self.consume_changes())
+
+    async def cog_unload(self):
+        self.scheduler.stop()
         self.weekly_point_update.cancel()
+        if self.change_consumer:
+            self.change_consumer.cancel()
+        await self.change_listener.stop()
+
+    @app_commands.command(
+        name="monitor_status",
+        description="Show the monitor's detector intervals and latencies",
+    )
+    @app_commands.checks.has_any_role(ENV.REQ_ROLE)
+    async def monitor_status(self, interaction: discord.Interaction):
+        embed = discord.Embed(
+            title="Monitor Status",
+            color=(
+                discord.Color.green() if self.scheduler.running else discord.Color.red()
+            ),
+        )
+        for job in self.scheduler.status():
+            latency = (
+                f"{job['last_latency'] * 1000:.0f} ms"
+                if job["last_latency"] is not None
+                else "never ran"
+            )
+            if job["avg_latency"] is not None:
+                latency += (
+                    f" (avg {job['avg_latency'] * 1000:.0f} ms, "
+                    f"max {job['max_latency'] * 1000:.0f} ms)"
+                )
+            state = "" if job["running"] else " ⚠️ stopped"
+            value = (
+                f"Interval: **{job['interval']:.1f}s** (next in {job['next_in']:.0f}s){state}\n"
+                f"Last run: {latency}\n"
+                f"Runs: {job['runs']} | Events: {job['events']} | "
+                f"Failures: {job['failures']} ({job['consecutive_failures']} in a row)"
+            )
+            if job["last_error"]:
+                value += f"\nLast error: `{job['last_error'][:200]}`"
+            embed.add_field(name=job["name"], value=value, inline=False)
+
+        changes = self.change_listener.stats()
+        feed = "live" if changes["connected"] else "down"
+        if not ENV.MONITOR_REALTIME:
+            feed = "disabled"
+        embed.add_field(
+            name="Realtime feed",
+            value=(
+                f"{feed} | Events: {changes['received']} | "
+                f"Pending: {changes['pending']}/{self.change_listener.max_pending} | "
+                f"Coalesced: {changes['coalesced']} | Dropped: {changes['dropped']}"
+            ),
+            inline=False,
+        )
+        cache = self.db_handler.identity_cache.stats()
+        embed.add_field(
+            name="Identity cache",
+            value=(
+                f"Players: {cache['size']} | Hits: {cache['hits']} | "
+                f"Misses: {cache['misses']} ({cache['hit_rate']:.0%} hit rate)"
+            ),
+            inline=False,
+        )
+        db_flight = self.db_handler.flight.stats()
+        render_flight = self.bot.render_flight.stats()
+        embed.add_field(
+            name="Coalesced requests",
+            value=(
+                f"DB: {db_flight['deduplicated']}/"
+                f"{db_flight['calls'] + db_flight['deduplicated']} | "
+                f"Renders: {render_flight['deduplicated']}/"
+                f"{render_flight['calls'] + render_flight['deduplicated']}"
+            ),
+            inline=False,
+        )
+        pool = self.osu_pool.stats()
+        osu_lines = [self._osu_api_line("Main", self.osu_api.stats())]
+        osu_lines += [
+            self._osu_api_line(f"Pool #{i + 1}", client)
+            for i, client in enumerate(pool["clients"])
+        ]
+        embed.add_field(
+            name=f"osu! API (queued interactive/background, pool {pool['strategy']})",
+            value="\n".join(osu_lines),
+            inline=False,
+        )
+        logs = self.log_handler.stats()
+        embed.add_field(
+            name="Log webhook",
+            value=(
+                f"Sent: {logs['reports_sent']} in {logs['sent']} msgs | "
+                f"Failed: {logs['failed']} | "
+                f"Avg: {logs['avg_latency'] * 1000:.0f} ms\n"
+                f"Queued: {logs['queued']} | Coalesced: {logs['coalesced']} | "
+                f"Dropped: {logs['dropped']} | Spilled: {logs['spilled']}\n"
+                f"Suppressed: {logs['suppressed']} | "
+                f"Breaker: {logs['breaker']} ({logs['breaker_trips']} trips)"
+                + (
+                    f"\nLast failure: {logs['last_failure'][:200]}"
+                    if logs["failed"]
+                    else ""
+                )
+            ),
+            inline=False,
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @monitor_status.error
+    async def monitor_status_error(self, interaction: discord.Interaction, error):
+        sender = (
+            interaction.followup.send
+            if interaction.response.is_done()
+            else interaction.response.send_message
+        )
 
-    @tasks.loop(seconds=10)
-    async def monitor_database(self):
-        try:
-            await self.monitor_new_players()
-            await self.monitor_top_plays()
-            await self.monitor_rivals()
-        except Exception as e:
-            await self.log_handler.report_error("Monitor.monitor_database_loop", e)
+        if isinstance(error, app_commands.MissingAnyRole):
+            await sender("❌ **Access Denied.** Admin role required.", ephemeral=True)
+            await self.log_handler.report_info(
+                f"<@{interaction.user.id}> unauthorized access to /monitor_status"
+            )
+        else:
+            await self.log_handler.report_error("Monitor.monitor_status_error()", error)
+            await sender("❌ An unexpected error occurred.", ephemeral=True)
+
+    @staticmethod
+    def _osu_api_line(name: str, stats: dict[str, Any]) -> str:
+        interactive = stats["lanes"]["interactive"]
+        background = stats["lanes"]["background"]
+        return (
+            f"{name}: Queued {interactive['queued']}/{background['queued']} "
+            f"(max {interactive['max_queued']}/{background['max_queued']}) | "
+            f"Wait {interactive['avg_wait']:.2f}s/{background['avg_wait']:.2f}s | "
+            f"In flight: {stats['in_flight']} | Tokens: {stats['tokens']:.1f} | "
+            f"Errors: {stats['errors']} ({stats['rate_limited']} rate limited)"
+        )
 
-    @monitor_database.before_loop
-    async def before_monitor_database(self):
+    def _poll_floor(self) -> float:
+        # with a live change feed the poller is only a slow reconciler
+        if self.change_listener.connected:
+            return ENV.MONITOR_FALLBACK_INTERVAL
+        return 0.0
+
+    async def consume_changes(self):
         await self.bot.wait_until_ready()
+        while True:
+            batch = await self.change_listener.get_batch()
+            try:
+                await self.dispatch_changes(batch)
+            except Exception as e:
+                await self.log_handler.report_error(
+                    "Monitor.consume_changes()",
+                    e,
+                    f"Failed handling a batch of {len(batch)} changes",
+                )
+
+    async def dispatch_changes(self, batch: list[tuple[str, dict[str, Any]]]) -> None:
+        """Hands a batch of changed rows to the same handlers the polling
+        detectors use, all new players and all top plays at once."""
+        new_players, top_plays, rivals_ended = [], [], False
+        for table, record in batch:
+            if table == TableMiscellaneous.DISCORD_OSU:
+                if record.get(DiscordOsuColumn.DISCORD_ID) is not None:
+                    self.db_handler.identity_cache.put(
+                        record[DiscordOsuColumn.DISCORD_ID],
+                        osu_username=record.get(DiscordOsuColumn.OSU_USERNAME),
+                        osu_id=record.get(DiscordOsuColumn.OSU_ID),
+                    )
+                if record.get(DiscordOsuColumn.NEW_PLAYER_ANNOUNCE):
+                    new_players.append(record)
+                if record.get(DiscordOsuColumn.TOP_PLAY_ANNOUNCE):
+                    top_plays.append(record)
+            elif table == TablesRivals.RIVALS:
+                if record.get(
+                    RivalsColumn.CHALLENGE_STATUS
+                ) == ChallengeStatus.UNFINISHED and await self.check_end(record):
+                    rivals_ended = True
+
+        if new_players:
+            await self.process_new_players(new_players)
+        if top_plays:
+            await self.process_top_plays(top_plays)
+        if rivals_ended:
+            # settles every finished challenge, not only the ones in the batch
+            await self.monitor_rivals()
+
+    def dispatch_delete(self, table: str, old_record: dict[str, Any]) -> None:
+        # a removed player must stop resolving right away, not after the TTL
+        if table == TableMiscellaneous.DISCORD_OSU:
+            self.db_handler.identity_cache.invalidate(
+                discord_id=old_record.get(DiscordOsuColumn.DISCORD_ID),
+                osu_username=old_record.get(DiscordOsuColumn.OSU_USERNAME),
+                osu_id=old_record.get(DiscordOsuColumn.OSU_ID),
+            )
 
     @tasks.loop(time=weekly_time)
     async def weekly_point_update(self):
@@ -78,56 +330,114 @@ class Monitor(commands.Cog, name="monitor"):
                 )
             return
 
-        for a_league in TablesLeagues:
-            try:
-                await self.supabase_client.rpc(
-                    "sync_table_pp", {"tbl_name": a_league}
-                ).execute()
-            except Exception as error:
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(max(1, ENV.WEEKLY_CONCURRENCY))
+
+        async def bounded(league: str) -> dict[str, Any]:
+            async with semaphore:
+                return await self.weekly_league_update(league, channel)
+
+        results = await asyncio.gather(
+            *(bounded(league) for league in TablesLeagues), return_exceptions=True
+        )
+
+        reports = []
+        for league, result in zip(TablesLeagues, results):
+            if isinstance(result, BaseException):
+                # weekly_league_update handles its own errors, this is a bug
                 await self.log_handler.report_error(
                     "Monitor.weekly_point_update()",
-                    error,
-                    f"Error syncing {a_league.capitalize()}",
+                    result,
+                    f"Weekly update of {league.capitalize()} crashed.",
                 )
-                continue
+                result = {"league": league, "status": "crashed", "winners": 0}
+            reports.append(result)
+
+        await self.log_handler.report_info(
+            self._weekly_report(reports, time.perf_counter() - start),
+            "Weekly Point Update",
+        )
 
+    async def weekly_league_update(
+        self, league: str, channel: discord.TextChannel | None
+    ) -> dict[str, Any]:
+        """Syncs one league, awards its weekly winner(s) and announces them in
+        one message. Never raises, a failure only ends this league's run.
+
+        Returns the league's entry for the run report: ``status``, ``winners``
+        and the seconds spent in each step.
+        """
+        report = {"league": league, "status": "ok", "winners": 0}
+        step_start = league_start = time.perf_counter()
+
+        def lap(step: str) -> None:
+            nonlocal step_start
+            now = time.perf_counter()
+            report[step] = now - step_start
+            step_start = now
+
+        # both report their own errors
+        synced = await self.db_handler.sync_league_pp(league)
+        lap("sync")
+        if synced is None:
+            report["status"] = "sync failed"
+            return self._finish_report(report, league_start)
+
+        winners = await self.db_handler.award_weekly_winner(league)
+        lap("award")
+        if winners is None:
+            report["status"] = "award failed"
+            return self._finish_report(report, league_start)
+        report["winners"] = len(winners)
+
+        if winners and channel:
+            lines = [f"🏆 **Weekly Winner: {league}**"]
+            for row in winners:
+                discord_id = await self.db_handler.get_discord_id(
+                    osu_username=row["osu_username"]
+                )
+                player = f"<@{discord_id}>" if discord_id else row["osu_username"]
+                lines.append(
+                    f"Congratulations {player}! You've been awarded **+100 points**.\n"
+                    f"> **Total Points:** {row['new_points']}\n"
+                    f"> **Seasonal Points:** {row['new_seasonal_points']}"
+                )
             try:
-                response = await self.supabase_client.rpc(
-                    "award_weekly_winner", {"league_table_name": a_league}
-                ).execute()
+                await channel.send(content="\n".join(lines))
             except Exception as error:
+                report["status"] = "announce failed"
                 await self.log_handler.report_error(
-                    "Monitor.weekly_point_update()",
+                    "Monitor.weekly_league_update()",
                     error,
-                    "Error at function rpc function awark weekly winner()",
+                    f"Error sending the {league.capitalize()} winners to the channel.",
                 )
-                return
-
-            datas = response.data
-
-            if datas and channel:
-                for row in datas:
-                    # 1. Parse the dictionary keys returned by Postgres
-                    discord_id = row["discord_id"]
-                    total_points = row["new_points"]
-                    seasonal_points = row["new_seasonal_points"]
-
-                    # 2. Create a nice formatted message
-                    message = (
-                        f"🏆 **Weekly Winner: {a_league}**\n"
-                        f"Congratulations <@{discord_id}>! You've been awarded **+100 points**.\n"
-                        f"> **Total Points:** {total_points}\n"
-                        f"> **Seasonal Points:** {seasonal_points}"
-                    )
-
-                    try:
-                        await channel.send(content=message)
-                    except Exception as error:
-                        await self.log_handler.report_error(
-                            "Monitor.weekly_point_update()",
-                            error,
-                            "Error sending message to channel.",
-                        )
+            lap("announce")
+
+        return self._finish_report(report, league_start)
+
+    @staticmethod
+    def _finish_report(report: dict[str, Any], league_start: float) -> dict[str, Any]:
+        report["total"] = time.perf_counter() - league_start
+        return report
+
+    @staticmethod
+    def _weekly_report(reports: list[dict[str, Any]], duration: float) -> str:
+        ok = sum(1 for report in reports if report["status"] == "ok")
+        lines = [
+            f"{ok}/{len(reports)} leagues done in {duration:.1f}s "
+            f"(concurrency {max(1, ENV.WEEKLY_CONCURRENCY)})."
+        ]
+        for report in reports:
+            steps = " | ".join(
+                f"{step} {report[step]:.2f}s"
+                for step in ("sync", "award", "announce", "total")
+                if step in report
+            )
+            lines.append(
+                f"**{report['league'].capitalize()}**: {report['status']}, "
+                f"{report['winners']} winner(s)" + (f" | {steps}" if steps else "")
+            )
+        return "\n".join(lines)
 
     @weekly_point_update.before_loop
     async def before_weekly_point_update(self):
@@ -176,6 +486,8 @@ class Monitor(commands.Cog, name="monitor"):
                 .eq("discord_id", discord_id)
                 .execute()
             )
+            # get_username() above just cached this player again
+            self.db_handler.identity_cache.invalidate(discord_id=discord_id)
 
             if response.data:
                 msg = f"Successfully wiped data for {user_name}."
@@ -221,133 +533,160 @@ class Monitor(commands.Cog, name="monitor"):
                 f"Monitor.on_member_remove({user_name})", e
             )
 
-    async def monitor_new_players(self):
-        for tries in range(MAX_TRIES):
+    async def monitor_new_players(self) -> int:
+        new_players = await self.db_handler.new_player_detector()
+        if not new_players:
+            return 0
+        await self.process_new_players(new_players)
+        return len(new_players)
+
+    async def monitor_top_plays(self) -> int:
+        top_plays = await self.db_handler.top_play_detector()
+        if not top_plays:
+            return 0
+        await self.process_top_plays(top_plays)
+        return len(top_plays)
+
+    async def monitor_rivals(self) -> int:
+        # settling happens in one RPC, and each challenge is returned by
+        # exactly one call, so the poller and the change feed can both call it
+        settled = await self.db_handler.settle_finished_rivals()
+        if settled is None:
+            raise Exception("settle_finished_rivals RPC failed")
+        for row in settled:
             try:
-                new_players = await self.db_handler.new_player_detector()
-                if not new_players:
-                    return
-                for player in new_players:
-                    try:
-                        discord_id = player[DiscordOsuColumn.DISCORD_ID]
-                        if not await self.db_handler.negate_new_player_announce(
-                            discord_id
-                        ):
-                            raise Exception(
-                                f"New player announce negation failed! Got False for <@{discord_id}>"
-                            )
-                        await self.give_role_nickname(player)
-                        await self.announce_new_player(player)
-                    except Exception as error:
-                        await self.log_handler.report_error(
-                            "Monitor.monitor_new_players() loop", error
-                        )
-                return
+                await self.send_announcement(row)
             except Exception as e:
-                if tries == MAX_TRIES - 1:
-                    await self.log_handler.report_error(
-                        "Monitor.monitor_new_players() outer", e
-                    )
-                await self.log_handler.report_info(
-                    f"Failed running Monitor.monitor_new_players(). Current tries : {tries + 1}/{MAX_TRIES}.\nThis process will sleep for 5 extra seconds before trying again."
-                )
-                await asyncio.sleep(5)
+                await self.log_handler.report_error("Monitor.monitor_rivals() loop", e)
+        return len(settled)
+
+    async def process_new_players(self, players: list[dict[str, Any]]) -> None:
+        claimed = {}
+        for player in players:
+            discord_id = player[DiscordOsuColumn.DISCORD_ID]
+            key = ("new_player", discord_id)
+            if self._claim(key):
+                claimed[discord_id] = (key, player)
+        if not claimed:
+            return
 
-    async def monitor_top_plays(self):
-        for tries in range(MAX_TRIES):
+        # flags are cleared up front in one go, a player missing from the
+        # result was already handled elsewhere (or the update failed, which
+        # the db handler reports) and gets picked up again on a later run
+        acked = await self.db_handler.negate_new_player_announces(list(claimed))
+        for discord_id, (key, player) in claimed.items():
+            if discord_id not in acked:
+                self._release(key, False)
+                continue
             try:
-                top_plays = await self.db_handler.top_play_detector()
-
-                if not top_plays:
-                    return
-
-                for play in top_plays:
-                    discord_id = play[DiscordOsuColumn.DISCORD_ID]
-                    top_play_id = play[DiscordOsuColumn.TOP_PLAY_ID]
-                    prev_top_pp = play[DiscordOsuColumn.PREV_TOP_PP]
-                    top_play_pp = play[DiscordOsuColumn.TOP_PLAY_PP]
-                    current_league = play[DiscordOsuColumn.LEAGUE]
-                    points_earned = int(
-                        self.calcuate_points(prev_top_pp, top_play_pp, current_league)
-                    )
-                    if (
-                        await self.db_handler.add_points(points_earned, discord_id)
-                        is False
-                    ):
-                        error = Exception(
-                            f"Unsuccessful to add calcuated points amount {points_earned} for player <@{discord_id}> earned through top play!"
-                        )
-                        points_earned = None
-                        await self.log_handler.report_error(
-                            "Monitor.monitor_top_plays() loop",
-                            error,
-                            f"Error for top_play: {top_play_id}, error announcing for <@{discord_id}>",
-                        )
-
-                    for tries in range(MAX_TRIES):
-                        try:
-                            await self.announce_new_top_play(
-                                top_play_id, discord_id, points_earned
-                            )
-                            if not await self.db_handler.negate_top_play(discord_id):
-                                raise Exception(
-                                    f"Top play negation failed! Got False for <@{discord_id}>"
-                                )
-                            break
-                        except Exception as error:
-                            if tries == MAX_TRIES - 1:
-                                await self.log_handler.report_error(
-                                    "Monitor.monitor_top_plays() loop",
-                                    error,
-                                    f"Error for top_play: {top_play_id}, error announcing for <@{discord_id}>",
-                                )
-                            await self.log_handler.report_info(
-                                f"Failed running Monitor.monitor_top_plays() loop . Current tries : {tries + 1}/{MAX_TRIES}.\nThis process will sleep for 5 seconds before trying again.\n Error announcing top play for player <@{discord_id}>."
-                            )
-                            await asyncio.sleep(5)
+                await self.give_role_nickname(player)
+                await self.announce_new_player(player)
+            except Exception as error:
+                await self.log_handler.report_error(
+                    "Monitor.process_new_players() loop", error
+                )
+            finally:
+                self._release(key, True)
+
+    async def process_top_plays(self, plays: list[dict[str, Any]]) -> None:
+        claimed = []
+        for play in plays:
+            key = (
+                "top_play",
+                play[DiscordOsuColumn.DISCORD_ID],
+                play[DiscordOsuColumn.TOP_PLAY_ID],
+            )
+            if self._claim(key):
+                claimed.append((key, play))
+        if not claimed:
+            return
 
-            except Exception as e:
-                if tries == MAX_TRIES - 1:
+        announced = set()
+        try:
+            for _, play in claimed:
+                try:
+                    if await self.award_top_play(play):
+                        announced.add(play[DiscordOsuColumn.DISCORD_ID])
+                except Exception as error:
                     await self.log_handler.report_error(
-                        "Monitor.monitor_top_plays() outer", e
+                        "Monitor.process_top_plays() loop", error
                     )
 
-                await self.log_handler.report_info(
-                    f"Failed running Monitor.monitor_top_plays(). Current tries : {tries + 1}/{MAX_TRIES}.\nThis process will sleep for 5 seconds before trying again."
+            # unannounced plays keep their flag and are retried on a later run
+            acked = await self.db_handler.negate_top_plays(list(announced))
+            if missing := announced - acked:
+                await self.log_handler.report_error(
+                    "Monitor.process_top_plays()",
+                    Exception("Top play negation failed after announcing"),
+                    "Not acknowledged: "
+                    + ", ".join(f"<@{discord_id}>" for discord_id in missing),
                 )
-                await asyncio.sleep(5)
+        finally:
+            for key, play in claimed:
+                # announced ones count as handled even if the ack failed, so
+                # the same play isn't announced twice while the flag is stuck
+                self._release(key, play[DiscordOsuColumn.DISCORD_ID] in announced)
+
+    async def award_top_play(self, play: dict[str, Any]) -> bool:
+        """Adds the points for a new top play and announces it.
+
+        Returns whether the announcement went out, the flag is left alone.
+        """
+        discord_id = play[DiscordOsuColumn.DISCORD_ID]
+        top_play_id = play[DiscordOsuColumn.TOP_PLAY_ID]
+        prev_top_pp = play[DiscordOsuColumn.PREV_TOP_PP]
+        top_play_pp = play[DiscordOsuColumn.TOP_PLAY_PP]
+        current_league = play[DiscordOsuColumn.LEAGUE]
+        points_earned = int(
+            self.calcuate_points(prev_top_pp, top_play_pp, current_league)
+        )
+        if await self.db_handler.add_points(points_earned, discord_id) is False:
+            error = Exception(
+                f"Unsuccessful to add calcuated points amount {points_earned} for player <@{discord_id}> earned through top play!"
+            )
+            points_earned = None
+            await self.log_handler.report_error(
+                "Monitor.award_top_play()",
+                error,
+                f"Error for top_play: {top_play_id}, error announcing for <@{discord_id}>",
+            )
 
-    async def monitor_rivals(self):
         for tries in range(MAX_TRIES):
             try:
-                rivals_table = await self.get_rivals()
-
-                if not rivals_table:
-                    return
-
-                for row in rivals_table:
-                    try:
-                        is_end = await self.check_end(row)
-                        if is_end:
-                            winner, loser = is_end
-                            await self.end_challenge(row, winner, loser)
-                            await self.send_announcement(row, winner, loser)
-                    except Exception as e:
-                        await self.log_handler.report_error(
-                            "Monitor.monitor_rivals() loop", e
-                        )
-                return
-
-            except Exception as e:
+                await self.announce_new_top_play(top_play_id, discord_id, points_earned)
+                return True
+            except Exception as error:
                 if tries == MAX_TRIES - 1:
                     await self.log_handler.report_error(
-                        "Monitor.monitor_rivals() outer", e
+                        "Monitor.award_top_play()",
+                        error,
+                        f"Error for top_play: {top_play_id}, error announcing for <@{discord_id}>",
                     )
-
-                await self.log_handler.report_info(
-                    f"Failed running Monitor.monitor_rivals(). Current tries : {tries + 1}/{MAX_TRIES}.\nThis process will sleep for 5 seconds before trying again."
+                    break
+                # points are already in, so retry the announcement here
+                # instead of leaving it to the next detector run
+                self.logger.warning(
+                    f"Announcing top play {top_play_id} for <@{discord_id}> failed "
+                    f"({tries + 1}/{MAX_TRIES}): {error}"
                 )
-                await asyncio.sleep(5)
+                await asyncio.sleep(2**tries)
+        return False
+
+    def _claim(self, key: tuple) -> bool:
+        now = time.monotonic()
+        for old_key, handled_at in list(self._handled.items()):
+            if now - handled_at > HANDLED_TTL:
+                del self._handled[old_key]
+
+        if key in self._claimed or key in self._handled:
+            return False
+        self._claimed.add(key)
+        return True
+
+    def _release(self, key: tuple, handled: bool) -> None:
+        self._claimed.discard(key)
+        if handled:
+            self._handled[key] = time.monotonic()
 
     async def give_role_nickname(self, player: list[dict[str, Any]]) -> None:
         discord_id = player[DiscordOsuColumn.DISCORD_ID]
@@ -420,7 +759,9 @@ class Monitor(commands.Cog, name="monitor"):
     async def announce_new_top_play(
         self, top_play_id: int, discord_id: int, points_earned: int | None
     ):
-        top_play = await self.osu_client.get_score_by_id_only(top_play_id)
+        top_play = await self.osu_pool.get_score_by_id_only(
+            top_play_id, priority=RequestPriority.BACKGROUND
+        )
         embed = await self.renderer.score.render(top_play)
         content_str = (
             f"New Top Play from <@{discord_id}>! Points earned : {points_earned}"
@@ -449,8 +790,8 @@ class Monitor(commands.Cog, name="monitor"):
 
     async def check_end(self, row: RivalsColumn) -> tuple[str, str] | None:
         for_pp = row[RivalsColumn.FOR_PP]
-        challenger_stats = row[RivalsColumn.CHALLENGER_STATS]
-        challenged_stats = row[RivalsColumn.CHALLENGED_STATS]
+        challenger_stats = row[RivalsColumn.CHALLENGER_STATS] or 0
+        challenged_stats = row[RivalsColumn.CHALLENGED_STATS] or 0
         if challenger_stats >= for_pp:
             return (RivalsColumn.CHALLENGER, RivalsColumn.CHALLENGED)
         elif challenged_stats >= for_pp:
@@ -458,72 +799,22 @@ class Monitor(commands.Cog, name="monitor"):
         else:
             return None
 
-    async def get_rivals(self) -> list[RivalsData]:
-        REQ_COLUMNS = ", ".join(
-            [
-                RivalsColumn.CHALLENGER,
-                RivalsColumn.CHALLENGED,
-                RivalsColumn.CHALLENGE_ID,
-                RivalsColumn.FOR_PP,
-                RivalsColumn.CHALLENGER_STATS,
-                RivalsColumn.CHALLENGED_STATS,
-            ]
-        )
-        try:
-            query = (
-                await self.supabase_client.table(TablesRivals.RIVALS)
-                .select(REQ_COLUMNS)
-                .eq(RivalsColumn.CHALLENGE_STATUS, ChallengeStatus.UNFINISHED)
-                .execute()
-            )
-            return query.data if (query and query.data) else []
-        except Exception as e:
-            print(f"Exception fetching rivals: {e}")
-            return []
-
-    async def end_challenge(self, row: RivalsColumn, winner: str, loser: str) -> None:
-        winner_uname = row[winner]
-        loser_uname = row[loser]
-        challenge_id = row[RivalsColumn.CHALLENGE_ID]
-        try:
-            await (
-                self.supabase_client.table(TablesRivals.RIVALS)
-                .update(
-                    {
-                        RivalsColumn.CHALLENGE_STATUS: ChallengeStatus.FINISHED,
-                        RivalsColumn.WINNER: winner_uname,
-                    }
-                )
-                .eq(RivalsColumn.CHALLENGE_ID, challenge_id)
-                .execute()
-            )
-            await self.challenge_finish_point_distribution(
-                winner_uname, loser_uname, row[RivalsColumn.FOR_PP]
-            )
-        except Exception as e:
-            await self.log_handler.report_error(
-                "Monitor.end_challenge()",
-                e,
-                f"Failed updating Challenge Status for challenge_id {challenge_id}",
-            )
-
-    async def send_announcement(
-        self, row: RivalsColumn, winner: str, loser: str
-    ) -> None:
-        winner_uname = row[winner]
-        loser_uname = row[loser]
+    async def send_announcement(self, row: dict[str, Any]) -> None:
+        """Announces a challenge settled by ``settle_finished_rivals``."""
         for_pp = row[RivalsColumn.FOR_PP]
-        winner_id = await self.db_handler.get_discord_id(osu_username=winner_uname)
-        loser_id = await self.db_handler.get_discord_id(osu_username=loser_uname)
+        winner_id = row["winner_id"]
+        loser_id = row["loser_id"]
 
         if not winner_id or not loser_id:
             await self.log_handler.report_error(
                 "Monitor.send_announcement()",
-                Exception("Could not find winner/loser Discord IDs"),
+                Exception(
+                    f"Could not find winner/loser Discord IDs for challenge {row[RivalsColumn.CHALLENGE_ID]}"
+                ),
             )
             return
 
-        msg_id = await self.db_handler.get_msg_id(row[RivalsColumn.CHALLENGE_ID])
+        msg_id = row[MessageIdColumn.MSG_ID]
         guild = self.bot.guild
         if not guild:
             await self.log_handler.report_error(
@@ -555,22 +846,6 @@ class Monitor(commands.Cog, name="monitor"):
 
         await self.point_distribution_announcement(winner_id, loser_id, for_pp)
 
-    async def challenge_finish_point_distribution(self, winner, loser, for_pp):
-        try:
-            response1 = await self.db_handler.add_points(for_pp, osu_uname=winner)
-            response2 = await self.db_handler.add_points(
-                -int(round(for_pp / 2)), osu_uname=loser
-            )
-            if response1 and response2:
-                return True
-            raise Exception(
-                f"Unable to update rivarly_end points for {winner} and {loser}"
-            )
-        except Exception as error:
-            await self.log_handler.report_error(
-                "Monitor.challenge_finish_point_distribution()", error
-            )
-
     async def point_distribution_announcement(self, winner_id, loser_id, for_pp):
         win_points = for_pp
         lose_points = int(round(for_pp / 2))
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import time
 import discord
 from discord import app_commands
 from discord.ext import commands
 from typing import TYPE_CHECKING
 from load_env import ENV
-from utils_v2.enums.status import FuncStatus
 from utils_v2.enums.tables import TablesLeagues
 from utils_v2 import ResetConfirmView
 
@@ -15,6 +16,10 @@ if TYPE_CHECKING:
 
 class SeasonEnd(commands.Cog):
     GUILD = discord.Object(ENV.OSU_ARENA)
+    # seconds between progress edits while the season is being closed
+    PROGRESS_INTERVAL = 5
+    # attempts per league snapshot, a failed one leaves nothing behind
+    SNAPSHOT_ATTEMPTS = 2
 
     def __init__(self, bot: OsuArena):
         self.bot = bot
@@ -32,33 +37,21 @@ class SeasonEnd(commands.Cog):
             return
 
         try:
-            current_season = await self._step_archive_season(interaction)
+            current_season = await self.db_handler.get_current_season(refresh=True)
             if not current_season:
+                if not await self._resume_snapshots(interaction):
+                    await interaction.followup.send(
+                        "❌ No ongoing season found. Season Close Cancelled"
+                    )
                 return
 
-            if not await self._step_update_points(interaction):
+            if await self._run_close(interaction, current_season) is None:
                 return
 
-            if not await self._step_backup_points(interaction, current_season):
-                return
-
-            if not await self._step_backup_leagues(interaction, current_season):
-                return
-            await interaction.followup.send(
-                "**Success!** All tables have been archived, use /archive command to see the final result.\n"
-                f"🏁**Season {current_season}** has ended!"
-            )
-
-            guild = self.bot.guild
-            channel = guild.get_channel(ENV.BOT_UPDATES)
-            try:
-                await channel.send(
-                    f"🏁 **Season {current_season}** has ended! The final table for this season has being archived. 📜"
-                )
-            except Exception as e:
-                await self.log_handler.report_error(
-                    "Failed announcement for season end!", e
-                )
+            if await self._snapshot_leagues(
+                interaction, current_season, list(TablesLeagues)
+            ):
+                await self._announce_end(interaction, current_season)
 
         except Exception as e:
             await self.log_handler.report_error("Season Restart Critical Failure", e)
@@ -66,6 +59,48 @@ class SeasonEnd(commands.Cog):
                 content="❌ **CRITICAL ERROR** during restart sequence. Check logs."
             )
 
+    async def _announce_end(self, interaction: discord.Interaction, season: int):
+        await interaction.followup.send(
+            "**Success!** All tables have been archived, use /archive command to see the final result.\n"
+            f"🏁**Season {season}** has ended!"
+        )
+
+        guild = self.bot.guild
+        channel = guild.get_channel(ENV.BOT_UPDATES)
+        try:
+            await channel.send(
+                f"🏁 **Season {season}** has ended! The final table for this season has being archived. 📜"
+            )
+        except Exception as e:
+            await self.log_handler.report_error(
+                "Failed announcement for season end!", e
+            )
+
+    async def _resume_snapshots(self, interaction: discord.Interaction) -> bool:
+        """Retries the league snapshots of the last closed season, when the
+        season was closed but some of its snapshots failed.
+
+        Only runs before the next season starts (no ongoing season), the
+        leagues are still as the close left them then. Leagues that already
+        have their verified snapshot are skipped. Returns ``False`` if there
+        was nothing to resume.
+        """
+        archived = await self.db_handler.get_archived_season()
+        if not archived:
+            return False
+        season = max(archived)
+        missing = await self.db_handler.get_missing_snapshots(season)
+        if not missing:
+            return False
+
+        await interaction.followup.send(
+            f"⚠️ **Season {season}** is already closed but {len(missing)} league "
+            f"snapshot(s) are missing ({', '.join(missing)}). Retrying only those..."
+        )
+        if await self._snapshot_leagues(interaction, season, missing):
+            await self._announce_end(interaction, season)
+        return True
+
     async def _get_confirmation(self, interaction: discord.Interaction) -> bool:
         await interaction.response.defer(ephemeral=False)
 
@@ -91,81 +126,140 @@ class SeasonEnd(commands.Cog):
 
         return True
 
-    async def _step_archive_season(
-        self, interaction: discord.Interaction
-    ) -> str | None:
-        """Phase 1: Check if there's an ongoing season and mark it as Archived"""
-        current = await self.db_handler.get_current_season()
-        if not current:
-            await interaction.followup.send(
-                "❌ No ongoing season found. Season Close Cancelled"
-            )
-            return None
+    async def _run_close(
+        self, interaction: discord.Interaction, season: int
+    ) -> list[dict] | None:
+        """Archives the season, syncs and awards every league and backs the
+        points up in one transaction (``close_season`` RPC). The league
+        snapshots aren't part of it, they run after it in parallel
+        (:meth:`_snapshot_leagues`) and the missing ones can be retried.
 
-        success = await self.db_handler.mark_season_archived(current)
-        if not success:
-            await interaction.followup.send(
-                f"❌ Failed to mark Season {current} as archived."
+        The RPC only answers once it's done, so until then the progress
+        message shows the elapsed time, then it's replaced by the per step
+        report with the total time. Returns the report, ``None`` on failure.
+        """
+        msg = await interaction.followup.send(
+            f"⏳ Ending **Season {season}**: syncing and awarding points for "
+            f"{len(TablesLeagues)} leagues... (0s)",
+            wait=True,
+        )
+        start = time.perf_counter()
+        close = asyncio.create_task(self.db_handler.close_season())
+        while not close.done():
+            await asyncio.wait({close}, timeout=self.PROGRESS_INTERVAL)
+            if close.done():
+                break
+            try:
+                await msg.edit(
+                    content=f"⏳ Ending **Season {season}**: syncing and awarding "
+                    f"points for {len(TablesLeagues)} leagues... "
+                    f"({time.perf_counter() - start:.0f}s)"
+                )
+            except discord.HTTPException:
+                # only the progress display, the close keeps running
+                pass
+        report = close.result()
+        elapsed = time.perf_counter() - start
+
+        if report is None:
+            await msg.edit(
+                content=f"❌ Failed to end **Season {season}** after {elapsed:.1f}s. "
+                "Nothing was changed (rolled back), error has been logged."
             )
             return None
 
-        await interaction.followup.send(f"✅ Ending **Season {current}**.")
-        return current
-
-    async def _step_update_points(self, interaction: discord.Interaction) -> bool:
-        """Phase 2: Finalize point calculations."""
-        await interaction.followup.send("⏳ Updating end-of-season points...")
-        try:
-            response = await self.db_handler.seasonal_point_update()
-            if response is FuncStatus.GOOD:
-                await interaction.followup.send("✅ End-of-season points distributed.")
-                return True
-            raise Exception("Failed at phase 2, got error from seasonal_point_update()")
-        except Exception as error:
-            await self.log_handler.report_error(
-                "SeasonManagement._step_update_points()", error
+        lines = [f"✅ **Season {season}** closed in {elapsed:.1f}s"]
+        for row in report:
+            rows = row.get("rows_affected")
+            detail = f" • {rows} rows" if rows is not None else ""
+            lines.append(
+                f"`{row['step']:<24}` {row['elapsed_ms'] / 1000:>6.2f}s{detail}"
             )
-            await interaction.followup.send(
-                "❌ Error updating points. Error has been logged."
-            )
-            return False
+        await msg.edit(content="\n".join(lines))
+        await self.log_handler.report_info("\n".join(lines), f"Season {season} closed")
+        return report
 
-    async def _step_backup_points(
-        self, interaction: discord.Interaction, season: str
+    async def _snapshot_leagues(
+        self, interaction: discord.Interaction, season: int, leagues: list[str]
     ) -> bool:
-        """Phase 3: Backup points to history."""
-        await interaction.followup.send("⏳ Backing up seasonal points...")
-        try:
-            response = await self.db_handler.backup_seasonal_points(season)
-            if response is FuncStatus.GOOD:
-                await interaction.followup.send("✅ Seasonal points backed up.")
-                return True
-            raise Exception(
-                "Error at phase 3. Got error response from backup_seasonal_points()"
+        """Copies the given league tables to ``{league}_{season}``, up to
+        ``ENV.SNAPSHOT_CONCURRENCY`` at once.
+
+        Every copy is checked against its league (row count and checksum)
+        in the database, the followup lists the duration and row count of
+        each league as they finish. If some fail the season stays closed
+        without them, the admin is told and the failed leagues can be
+        retried with /season_end.
+        """
+        concurrency = max(1, ENV.SNAPSHOT_CONCURRENCY)
+        lines = {league: f"⏳ **{league.capitalize()}**" for league in leagues}
+        msg = await interaction.followup.send(
+            f"⏳ Archiving {len(leagues)} leagues (concurrency {concurrency})...",
+            wait=True,
+        )
+        semaphore = asyncio.Semaphore(concurrency)
+        edit_lock = asyncio.Lock()
+
+        async def refresh(header: str) -> None:
+            async with edit_lock:
+                try:
+                    await msg.edit(content="\n".join([header, *lines.values()]))
+                except discord.HTTPException:
+                    pass
+
+        async def snapshot(league: str) -> bool:
+            async with semaphore:
+                start = time.perf_counter()
+                result = None
+                for _ in range(self.SNAPSHOT_ATTEMPTS):
+                    result = await self.db_handler.snapshot_league(league, season)
+                    if result is not None:
+                        break
+                elapsed = time.perf_counter() - start
+            if result is None:
+                lines[league] = (
+                    f"❌ **{league.capitalize()}**: failed after {elapsed:.2f}s, "
+                    f"{league}_{season} was not created"
+                )
+            else:
+                lines[league] = (
+                    f"✅ **{league.capitalize()}**: {result['snapshot_rows']} rows, "
+                    f"{elapsed:.2f}s (checksum verified)"
+                )
+            await refresh(f"⏳ Archiving {len(leagues)} leagues...")
+            return result is not None
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(snapshot(league) for league in leagues), return_exceptions=True
+        )
+        elapsed = time.perf_counter() - start
+
+        failed = []
+        for league, result in zip(leagues, results):
+            if isinstance(result, BaseException):
+                await self.log_handler.report_error(
+                    "SeasonEnd._snapshot_leagues()", result, f"{league} crashed"
+                )
+                lines[league] = f"❌ **{league.capitalize()}**: crashed"
+            if result is not True:
+                failed.append(league)
+
+        if failed:
+            await refresh(
+                f"❌ Archived {len(leagues) - len(failed)}/{len(leagues)} leagues "
+                f"in {elapsed:.1f}s, {', '.join(failed)} failed (error has been logged)."
             )
-        except Exception as e:
-            await self.log_handler.report_error(
-                "SeasonManagement._step_backup_points()", e
+            note = (
+                f"**Season {season}** is closed, but the snapshots of "
+                f"{', '.join(failed)} are missing. Run /season_end again before "
+                "starting the next season to retry only those."
             )
-            await interaction.followup.send(f"❌ Error backing up points: {e}")
+            await interaction.followup.send(f"⚠️ {note}")
+            await self.log_handler.report_info(note, "⚠️ Season partly archived")
             return False
 
-    async def _step_backup_leagues(
-        self, interaction: discord.Interaction, season: str
-    ) -> bool:
-        """Phase 4: Duplicate league tables."""
-        for league in [leag for leag in TablesLeagues]:
-            msg = await interaction.followup.send(
-                f"⏳ Processing **{league} League**..."
-            )
-            response1 = await self.db_handler.duplicate_table(league, season)
-            if response1 == FuncStatus.ERROR:
-                await msg.edit(
-                    content=f"❌ Error duplicating {league}. Stopped at {league}_{season}."
-                )
-                return False
-            await msg.edit(content=f"✅ **{league.capitalize()} League**: Backed up")
-
+        await refresh(f"✅ Archived {len(leagues)} leagues in {elapsed:.1f}s")
         return True
 
     @season_end.error
@@ -33,12 +33,22 @@ class SeasonStarter(commands.Cog):
         if not await self._get_confirmation(interaction):
             return
 
-        if await self.db_handler.get_current_season():
+        if await self.db_handler.get_current_season(refresh=True):
             await interaction.followup.send(
                 "❌**Ongoing Season**: An ongoing season alreadly exist. Cannot start another one at the moment."
             )
             return
 
+        archived = await self.db_handler.get_archived_season()
+        if archived:
+            missing = await self.db_handler.get_missing_snapshots(max(archived))
+            if missing is None or missing:
+                await interaction.followup.send(
+                    f"❌**Unfinished Archive**: Season {max(archived)} is missing league snapshots. "
+                    "Run /season_end to finish archiving it before starting a new season."
+                )
+                return
+
         try:
             current_season = await self._step_add_new_season(interaction)
             if current_season == FuncStatus.ERROR:
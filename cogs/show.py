@@ -2,7 +2,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from bot import OsuArena
-from utils_v2 import ShowTable
+from utils_v2 import ShowTable, build_league_page
+from utils_v2.enums.status import FuncStatus
 from utils_v2.enums.status import ChallengeStatus
 from utils_v2.enums.tables import TablesLeagues, TablesPoints
 from utils_v2.enums.tables_internals import DiscordOsuColumn
@@ -26,6 +27,10 @@ class Show(commands.Cog):
             return
 
         try:
+            if league_name in [t.value for t in TablesLeagues]:
+                await self._send_league_page(interaction, league_name)
+                return
+
             headers, rows, title = await self._fetch_table_data(league_name)
 
             if not rows:
@@ -77,13 +82,26 @@ class Show(commands.Cog):
 
         return True
 
-    async def _fetch_table_data(self, league_name: str):
-        if league_name in [t.value for t in TablesLeagues]:
-            data = await self.db_handler.get_current_league_table(league_name)
-            title = f"{league_name.capitalize()}"
-            return (*data, title) if data else ([], [], title)
+    async def _send_league_page(
+        self, interaction: discord.Interaction, league_name: str
+    ):
+        """Sends the first page of a league table, the buttons load the rest."""
+        result = await build_league_page(self.bot, league_name, page=0)
+        if result is FuncStatus.EMPTY:
+            await interaction.followup.send("⚠️ This table is empty.")
+            return
+        if result is FuncStatus.ERROR:
+            await interaction.followup.send("⚠️ Failed to generate table image.")
+            return
 
-        elif league_name in [t.value for t in TablesPoints]:
+        embed, file, view = result
+        if view:
+            await interaction.followup.send(embed=embed, file=file, view=view)
+        else:
+            await interaction.followup.send(embed=embed, file=file)
+
+    async def _fetch_table_data(self, league_name: str):
+        if league_name in [t.value for t in TablesPoints]:
             if league_name == TablesPoints.S_POINTS:
                 league_name = DiscordOsuColumn.SEASONAL_POINTS
             elif league_name == TablesPoints.POINTS:
@@ -0,0 +1,195 @@
+"""
+Leaderboard render backends.
+
+Plain functions that take picklable arguments and return PNG bytes, run in
+the :class:`utils_v2.RenderPool` worker processes. This module stays outside
+``utils_v2`` and only imports the standard library at the top, so unpickling
+a backend in a fresh worker doesn't pull in discord, supabase and the rest of
+the package; each backend imports its drawing library when it runs.
+"""
+
+from __future__ import annotations
+from io import BytesIO
+from typing import Any, Callable, Sequence
+
+
+def draw_leaderboard(
+    headers: Sequence[str], rows: Sequence[Sequence[Any]], style: dict[str, Any]
+) -> bytes | None:
+    """Draws the table with matplotlib/plottable and returns the PNG bytes.
+
+    Runs inside a worker process, so everything it needs comes in through
+    the (picklable) arguments and the heavy imports happen here.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    from plottable import ColumnDefinition, Table
+
+    df = pd.DataFrame(list(rows), columns=list(headers))
+    first_col_name = df.columns[0]
+    n_rows, n_cols = df.shape
+
+    fig_width = n_cols * 3
+    fig_height = n_rows * 0.6 + 1
+
+    fig = None
+    try:
+        fig, ax = plt.subplots(figsize=(fig_width, fig_height))
+        fig.set_facecolor("black")
+        ax.axis("off")
+
+        Table(
+            df,
+            ax=ax,
+            index_col=first_col_name,
+            textprops={
+                "fontsize": style["font_size"],
+                "color": style["text_color"],
+                "ha": "center",
+                "family": "sans-serif",
+            },
+            column_definitions=[
+                ColumnDefinition(
+                    name=name, textprops={"weight": "bold", "ha": "left"}, width=1.2
+                )
+                for name in style["bold_columns"]
+            ],
+            col_label_cell_kw={
+                "facecolor": style["header_color"],
+                "edgecolor": "white",
+                "linewidth": 1.5,
+            },
+            cell_kw={"edgecolor": "white", "linewidth": 1.5},
+            odd_row_color=style["odd_row_color"],
+            even_row_color=style["even_row_color"],
+        )
+
+        buf = BytesIO()
+        plt.savefig(
+            buf,
+            format="png",
+            bbox_inches="tight",
+            dpi=style["dpi"],
+            facecolor=fig.get_facecolor(),
+        )
+        return buf.getvalue()
+    finally:
+        if fig:
+            plt.close(fig)
+
+
+def draw_leaderboard_pillow(
+    headers: Sequence[str], rows: Sequence[Sequence[Any]], style: dict[str, Any]
+) -> bytes | None:
+    """Draws the same dark, striped table as :func:`draw_leaderboard` straight
+    onto a Pillow image.
+
+    Much lighter than the plottable backend (no pandas/matplotlib import, a
+    fraction of the memory) at the cost of plottable's exact typography.
+    Sizes follow the same ``font_size`` (pt) at ``dpi`` as the plottable one.
+    """
+    from PIL import Image, ImageDraw
+
+    headers = [str(header) for header in headers]
+    cells = [["" if value is None else str(value) for value in row] for row in rows]
+    bold_columns = set(style["bold_columns"])
+
+    font_px = max(8, round(style["font_size"] * style["dpi"] / 72))
+    font = _pillow_font(font_px, bold=False)
+    bold_font = _pillow_font(font_px, bold=True)
+    border = max(1, round(1.5 * style["dpi"] / 72))
+    pad_x = font_px
+    row_height = round(font_px * 2)
+    margin = font_px
+
+    # the first column is the index column, plottable draws it bold too
+    column_fonts = [
+        bold_font if index == 0 or name in bold_columns else font
+        for index, name in enumerate(headers)
+    ]
+    measure = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+    widths = []
+    for index, header in enumerate(headers):
+        column_font = column_fonts[index]
+        width = measure.textlength(header, font=bold_font)
+        for row in cells:
+            width = max(width, measure.textlength(row[index], font=column_font))
+        widths.append(int(width) + 2 * pad_x)
+
+    table_width = sum(widths)
+    table_height = row_height * (len(cells) + 1)
+    image = Image.new(
+        "RGB", (table_width + 2 * margin, table_height + 2 * margin), "black"
+    )
+    draw = ImageDraw.Draw(image)
+
+    def draw_row(top: int, values: list[str], fill: str, header: bool) -> None:
+        left = margin
+        for index, value in enumerate(values):
+            right = left + widths[index]
+            draw.rectangle(
+                (left, top, right, top + row_height),
+                fill=fill,
+                outline="white",
+                width=border,
+            )
+            column_font = bold_font if header else column_fonts[index]
+            left_aligned = not header and (index == 0 or headers[index] in bold_columns)
+            center_y = top + row_height / 2
+            if left_aligned:
+                draw.text(
+                    (left + pad_x, center_y),
+                    value,
+                    fill=style["text_color"],
+                    font=column_font,
+                    anchor="lm",
+                )
+            else:
+                draw.text(
+                    ((left + right) / 2, center_y),
+                    value,
+                    fill=style["text_color"],
+                    font=column_font,
+                    anchor="mm",
+                )
+            left = right
+
+    draw_row(margin, headers, style["header_color"], header=True)
+    for number, row in enumerate(cells):
+        # plottable counts rows from 1, so the first one is "odd"
+        fill = style["odd_row_color"] if number % 2 == 0 else style["even_row_color"]
+        draw_row(margin + row_height * (number + 1), row, fill, header=False)
+
+    buf = BytesIO()
+    image.save(buf, format="PNG", optimize=False)
+    return buf.getvalue()
+
+
+def _pillow_font(size: int, bold: bool):
+    from PIL import ImageFont
+
+    names = (
+        ("DejaVuSans-Bold.ttf", "Arial Bold.ttf", "arialbd.ttf")
+        if bold
+        else ("DejaVuSans.ttf", "Arial.ttf", "arial.ttf")
+    )
+    for name in names:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        # Pillow >= 10.1 ships a scalable default font
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+# Backends selectable through ``Renderer``, by name.
+RENDER_BACKENDS: dict[str, Callable[..., bytes | None]] = {
+    "plottable": draw_leaderboard,
+    "pillow": draw_leaderboard_pillow,
+}
@@ -4,12 +4,19 @@ import os
 load_dotenv(dotenv_path="local.env")
 
 
+def _int_or_none(name: str) -> int | None:
+    # ids only some entry points need, the updater (supaabse.py) runs without
+    # the bot's guild/channel ids and mustn't fail on them at import
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
 class ENV:
     # Discord Token for your bot
     DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
     # Client ID and Client secret from osu. You can get this from your profile settings
     # Used for Oauth so Redirect URL is required as well
-    AUTH_ID = int(os.getenv("AUTH_ID"))
+    AUTH_ID = _int_or_none("AUTH_ID")
     AUTH_TOKEN = os.getenv("AUTH_TOKEN")
     REDIRECT_URL = os.getenv("REDIRECT_URL")
     # Secerate key for session data encryption. It's arbitary, but recommended you use a long random string.
@@ -18,11 +25,60 @@ class ENV:
     # Seconday Osu Client ID and Client Secret.
     # Primarily used to fetch data of users with known osu id, so no redirect url required.
     # You can arbitarily put anything in osu's 'Application Callback URLs' section. I would just write 'http://localhost'
-    OSU_CLIENT_ID = int(os.getenv("OSU_CLIENT_ID"))
+    OSU_CLIENT_ID = _int_or_none("OSU_CLIENT_ID")
     OSU_CLIENT_SECRET = os.getenv("OSU_CLIENT_SECRET")
     # Does the same job as above.
-    OSU_CLIENT2_ID = int(os.getenv("OSU_CLIENT2_ID"))
+    OSU_CLIENT2_ID = _int_or_none("OSU_CLIENT2_ID")
     OSU_CLIENT2_SECRET = os.getenv("OSU_CLIENT2_SECRET")
+    # Tuning for the supaabse.py background updater (optional).
+    # Max players refreshed at the same time and timeout (seconds) for every request.
+    UPDATER_CONCURRENCY = int(os.getenv("UPDATER_CONCURRENCY", 8))
+    UPDATER_TIMEOUT = float(os.getenv("UPDATER_TIMEOUT", 15))
+    # Client side osu! API budget (requests per minute) of one osu! application, over every process
+    # using it (optional). The bot and the updater share OSU_CLIENT_ID/OSU_CLIENT2_ID, the updater
+    # takes UPDATER_OSU_API_RPM of each. The bot and the web linker share AUTH_ID, the web linker
+    # takes WEB_OSU_API_RPM of it. The bot gets the rest of both.
+    OSU_API_RPM = int(os.getenv("OSU_API_RPM", 60))
+    UPDATER_OSU_API_RPM = int(os.getenv("UPDATER_OSU_API_RPM", 40))
+    WEB_OSU_API_RPM = int(os.getenv("WEB_OSU_API_RPM", 10))
+    # How background fetches are spread over the secondary clients: "least_loaded" or "round_robin" (optional).
+    OSU_POOL_STRATEGY = os.getenv("OSU_POOL_STRATEGY", "least_loaded")
+    # Push based monitoring through Supabase Realtime (optional, on by default).
+    # While the feed is live, the database poll only runs every MONITOR_FALLBACK_INTERVAL seconds.
+    MONITOR_REALTIME = os.getenv("MONITOR_REALTIME", "true").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    MONITOR_FALLBACK_INTERVAL = int(os.getenv("MONITOR_FALLBACK_INTERVAL", 120))
+    # Bounds (seconds) of the monitor detectors' adaptive polling interval (optional).
+    MONITOR_MIN_INTERVAL = float(os.getenv("MONITOR_MIN_INTERVAL", 2))
+    MONITOR_MAX_INTERVAL = float(os.getenv("MONITOR_MAX_INTERVAL", 30))
+    # Leagues processed at the same time by the weekly point update (optional).
+    WEEKLY_CONCURRENCY = int(os.getenv("WEEKLY_CONCURRENCY", 3))
+    # League tables /season_end snapshots at the same time (optional).
+    SNAPSHOT_CONCURRENCY = int(os.getenv("SNAPSHOT_CONCURRENCY", 3))
+    # In-process cache of discord_id <-> osu_username <-> osu_id lookups (optional).
+    IDENTITY_CACHE_SIZE = int(os.getenv("IDENTITY_CACHE_SIZE", 2048))
+    IDENTITY_CACHE_TTL = float(os.getenv("IDENTITY_CACHE_TTL", 300))
+    # Seconds the cached current season is trusted before re-reading it (optional).
+    SEASON_CACHE_TTL = float(os.getenv("SEASON_CACHE_TTL", 60))
+    # Rows per request when a whole table is read, at most PostgREST's max-rows (optional).
+    DB_CHUNK_SIZE = int(os.getenv("DB_CHUNK_SIZE", 1000))
+    # Rendered leaderboard image cache (optional). Memory budget in MB, and a
+    # directory for the disk tier (left empty, images are only kept in memory).
+    RENDER_CACHE_MB = int(os.getenv("RENDER_CACHE_MB", 64))
+    RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR") or None
+    RENDER_CACHE_DISK_FILES = int(os.getenv("RENDER_CACHE_DISK_FILES", 500))
+    # Leaderboard rendering worker processes, how many renders may be queued or
+    # running at once, and the timeout (seconds) of one render (optional).
+    RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", 2))
+    RENDER_QUEUE_SIZE = int(os.getenv("RENDER_QUEUE_SIZE", 8))
+    RENDER_TIMEOUT = float(os.getenv("RENDER_TIMEOUT", 30))
+    # Leaderboard image backend, "plottable" or the lighter "pillow" (optional).
+    RENDER_BACKEND = os.getenv("RENDER_BACKEND", "plottable")
+    # Rows per page of the paged /show league tables (optional).
+    SHOW_PAGE_SIZE = int(os.getenv("SHOW_PAGE_SIZE", 20))
     # To serialize and deserialize the url during Oauth
     SEC_KEY = os.getenv("SEC_KEY")
     # Database key and url. You can get one from free tier.
@@ -32,12 +88,12 @@ class ENV:
     SUPABASE_URL = os.getenv("SUPABASE_URL")
     # All the guild related constants.
     # The primary guild's id. i.e the guild you want your got to run on
-    OSU_ARENA = int(os.getenv("OSU_ARENA"))
+    OSU_ARENA = _int_or_none("OSU_ARENA")
     # Various channel id in the guild that bot will message in (moving all of them to be webhooks soon)
-    RIVAL_RESULTS_ID = int(os.getenv("RIVAL_RES_ID"))
-    WELCOME_ID = int(os.getenv("WELCOME_ID"))
-    BOT_UPDATES = int(os.getenv("BOT_UPDATES"))
-    TOP_PLAY_ID = int(os.getenv("TOP_PLAY_ID"))
+    RIVAL_RESULTS_ID = _int_or_none("RIVAL_RES_ID")
+    WELCOME_ID = _int_or_none("WELCOME_ID")
+    BOT_UPDATES = _int_or_none("BOT_UPDATES")
+    TOP_PLAY_ID = _int_or_none("TOP_PLAY_ID")
     # Roles for special commands
     # This one's for /season_reset, /delete and /points
     REQ_ROLE = os.getenv("REQ_ROLE")
@@ -45,7 +101,31 @@ class ENV:
     REQ_ROLE_POINTS = os.getenv("REQ_ROLE_POINTS")
     # Webhook of the channel you want the bot to log errors and occasionally infos
     LOGS_WEBHOOK = os.getenv("LOGS_WEBHOOK")
+    # Reports waiting to be shipped to LOGS_WEBHOOK at most, seconds a burst of
+    # reports is collected into one message, and a JSON-lines file reports go
+    # to when the queue is full (left empty, they're dropped) (optional).
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 200))
+    LOG_BATCH_DELAY = float(os.getenv("LOG_BATCH_DELAY", 2))
+    LOG_SPILL_FILE = os.getenv("LOG_SPILL_FILE") or None
+    # Seconds repeats of a report are only counted, then summarised (0 disables) (optional).
+    LOG_DEDUP_WINDOW = float(os.getenv("LOG_DEDUP_WINDOW", 300))
+    # Failed webhook sends in a row before sending pauses, and for how many seconds (optional).
+    LOG_BREAKER_FAILURES = int(os.getenv("LOG_BREAKER_FAILURES", 5))
+    LOG_BREAKER_COOLDOWN = float(os.getenv("LOG_BREAKER_COOLDOWN", 60))
+    # Log files (optional): directory, rotated at LOG_FILE_MAX_MB or once LOG_FILE_MAX_AGE
+    # hours old (0 is no limit), LOG_FILE_BACKUPS rotated files kept, gzipped with
+    # LOG_FILE_GZIP. LOG_FILE_FORMAT is "text" or "json" (one JSON object per line).
+    LOG_DIR = os.getenv("LOG_DIR") or "."
+    LOG_FILE_MAX_MB = float(os.getenv("LOG_FILE_MAX_MB", 10))
+    LOG_FILE_MAX_AGE = float(os.getenv("LOG_FILE_MAX_AGE", 24))
+    LOG_FILE_BACKUPS = int(os.getenv("LOG_FILE_BACKUPS", 5))
+    LOG_FILE_GZIP = os.getenv("LOG_FILE_GZIP", "false").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    LOG_FILE_FORMAT = os.getenv("LOG_FILE_FORMAT", "text").lower()
 
-    WELCOME_CHANNEL_ID = int(os.getenv("WELCOME_CHANNEL_ID"))
-    SIGN_UP_ID = int(os.getenv("SIGN_UP_ID"))
-    RHYTHMIC_OCEAN_ID = int(os.getenv("RHYTHMIC_OCEAN_ID"))
+    WELCOME_CHANNEL_ID = _int_or_none("WELCOME_CHANNEL_ID")
+    SIGN_UP_ID = _int_or_none("SIGN_UP_ID")
+    RHYTHMIC_OCEAN_ID = _int_or_none("RHYTHMIC_OCEAN_ID")
@@ -1,179 +1,50 @@
-import sys
+import asyncio
 from flask import Flask
-from supabase import create_client
-from osu import GameModeStr, UserScoreType, SoloScore
-import osu
-import os
-from pathlib import Path
-from dotenv import load_dotenv
 from threading import Thread, Lock
 
-LEAGUE_MODES = {
-    1000: "master",
-    3000: "elite",
-    10000: "diamond",
-    30000: "platinum",
-    80000: "gold",
-    150000: "silver",
-    250000: "bronze",
-    sys.maxsize: "novice",
-}
+from load_env import ENV
+from utils_v2 import InitExterns, LogHandler, PlayerUpdater
 
-BASE_DIR = Path(__file__).resolve().parent
-dotenv_path = BASE_DIR / "local.env"
-
-load_dotenv(dotenv_path=dotenv_path)
 update_lock = Lock()
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-
 redirect_url = "http://127.0.0.1:8080"  # not used directly, fine to keep
 
-OSU_CLIENT_ID = os.getenv("OSU_CLIENT_ID")
-OSU_CLIENT_SECRET = os.getenv("OSU_CLIENT_SECRET")
-
-client_updater = osu.Client.from_credentials(
-    OSU_CLIENT_ID, OSU_CLIENT_SECRET, redirect_url
-)
-
 app = Flask(__name__)
+log_handler = LogHandler(logger_name="updater")
 
 
-def get_user_data(osu_id):
-    if osu_id:
-        try:
-            user = client_updater.get_user(osu_id, GameModeStr.STANDARD)
-            pp = round(user.statistics.pp)
-            username = user.username
-            global_rank = user.statistics.global_rank
-            secs_played = user.statistics.play_time
-            hours_played = secs_played / 3600
-            ii = get_ii(pp, hours_played)
-            print(ii)
-            return username, global_rank, pp, ii
-        except Exception as e:
-            print(f"Error fetching data for {osu_id}: {e}")
-    return None
-
-
-def get_top_play(osu_id):
-    if osu_id:
-        try:
-            top_scores = client_updater.get_user_scores(
-                osu_id, UserScoreType.BEST, mode=GameModeStr.STANDARD, limit=1
-            )
-            if not top_scores:
-                return
-            for _, score in enumerate(top_scores):
-                print(f"Type of 'score' is: {type(score)}")
-                if isinstance(score, SoloScore):
-                    return (score.beatmapset.title, score.ended_at, score.pp, score.id)
-                else:
-                    return (
-                        score.beatmapset.title,
-                        score.created_at,
-                        score.pp,
-                        score.id,
-                    )
-
-        except Exception as e:
-            print(f"{e}")
-    return None
-
-
-def get_ii(pp, hours):
-    numerator = -12 + 0.0781 * pp + 6.01e-6 * (pp**2)
-    if hours == 0:
-        return 0
-    ii = round(numerator / hours, 2)
-    return ii
-
-
-def update_scores(data, osu_id):
-    username, rank, pp, ii = data
-    league = "Unranked"
-    for threshold, league_try in LEAGUE_MODES.items():
-        if rank < threshold:
-            league = league_try
-            break
-    try:
-        supabase.table("discord_osu").update(
-            {
-                "current_pp": pp,
-                "osu_username": username,
-                "global_rank": rank,
-                "future_league": league,
-                "ii": ii,
-            }
-        ).eq("osu_id", osu_id).execute()
-        print(f"{username}'s osu! pp: {pp}, rank: {rank} updated. League: {league}")
-    except Exception as e:
-        print(f"Failed to update {osu_id}: {e}")
-
-
-def update_top_plays(top_play_data, osu_id, top_play_pp, announce_bool):
-    title, date, p_points, score_id = top_play_data
-    formatted_date = date.isoformat()
-    update_payload = {
-        "top_play_map": title,
-        "top_play_pp": int(p_points) if p_points else 0,
-        "top_play_date": formatted_date,
-        "top_play_id": score_id,
-        "prev_top_pp": top_play_pp,
-    }
-
-    if announce_bool:
-        update_payload["top_play_announce"] = True
-    try:
-        supabase.table("discord_osu").update(update_payload).eq(
-            "osu_id", osu_id
-        ).execute()
-        print(f"Updated for {osu_id}, with {title}  {p_points}")
-    except Exception as e:
-        print("\n----Error Summary----")
-        print(f"Error at update_top_players {e}")
-
-
-def update_player():
-    response = (
-        supabase.table("discord_osu")
-        .select("osu_id, top_play_id, top_play_pp, current_pp, ii")
-        .execute()
+async def update_player():
+    # a fresh event loop is made for every pass, so the clients are too
+    init_obj = InitExterns(log_handler)
+    supabase_client = await init_obj.setup_supabase_client(
+        ENV.SUPABASE_URL, ENV.SUPABASE_KEY
+    )
+    osu_pool = await init_obj.setup_osu_pool(
+        [
+            (ENV.OSU_CLIENT_ID, ENV.OSU_CLIENT_SECRET),
+            (ENV.OSU_CLIENT2_ID, ENV.OSU_CLIENT2_SECRET),
+        ],
+        redirect_url,
+        # the bot uses the same apps, this is the updater's part of their budget
+        ENV.UPDATER_OSU_API_RPM,
+        ENV.OSU_POOL_STRATEGY,
     )
-    if not response.data:
-        print("No users found in the discord_osu table.")
-        return
-
-    users = response.data
-
-    for user in users:
-        osu_id = user.get("osu_id")
-        top_play_id = user.get("top_play_id")
-        top_play_pp = user.get("top_play_pp")
-        current_pp = user.get("current_pp")
-        current_ii = user.get("ii", 0)
-
-        data = get_user_data(osu_id)
-        top_play_data = get_top_play(osu_id)
-
-        if data is not None:
-            _, _, pp, ii = data
-            if current_pp != pp or current_ii != ii:
-                update_scores(data, osu_id)
-            else:
-                print(f"Same pp for {osu_id}")
 
-        if top_play_data is not None:
-            _, _, _, score_id = top_play_data
-            if score_id != top_play_id:
-                if top_play_id is None:  # first time player so no announcement
-                    update_top_plays(top_play_data, osu_id, top_play_pp, False)
-                else:
-                    update_top_plays(top_play_data, osu_id, top_play_pp, True)
-            else:
-                print(f"Same top score for {osu_id}")
+    updater = PlayerUpdater(
+        log_handler,
+        supabase_client,
+        osu_pool,
+        concurrency=ENV.UPDATER_CONCURRENCY,
+        request_timeout=ENV.UPDATER_TIMEOUT,
+        chunk_size=ENV.DB_CHUNK_SIZE,
+    )
+    try:
+        return await updater.run()
+    finally:
+        # the clients and the log session belong to this pass' loop
+        await osu_pool.close()
+        await init_obj.close_supabase_client(supabase_client)
+        await log_handler.close()
 
 
 @app.route("/")
@@ -185,7 +56,7 @@ def index():
 def handle_update():
     def run_update():
         with update_lock:
-            update_player()
+            asyncio.run(update_player())
 
     if update_lock.locked():
         return "Update already in progress.", 202
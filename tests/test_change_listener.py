@@ -0,0 +1,203 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from cogs.monitor import Monitor
+from utils_v2 import ChangeListener, IdentityCache
+
+DISCORD_OSU = "discord_osu"
+RIVALS = "rivals"
+
+
+class FakeChannel:
+    def __init__(self):
+        self.subscriptions = []
+
+    def on_postgres_changes(self, event, schema, table, callback, filter=None):
+        self.subscriptions.append((event, table, filter, callback))
+        return self
+
+    async def subscribe(self, callback):
+        callback("SUBSCRIBED")
+
+
+class FakeRealtime:
+    """Stands in for Postgres + Supabase Realtime: applies the subscription
+    filters the way the server does and pushes realtime-py shaped payloads."""
+
+    def __init__(self):
+        self.channels = []
+
+    def channel(self, name):
+        channel = FakeChannel()
+        self.channels.append(channel)
+        return channel
+
+    async def remove_channel(self, channel):
+        self.channels.remove(channel)
+
+    def change(self, event, table, record=None, old_record=None):
+        for channel in self.channels:
+            for sub_event, sub_table, row_filter, callback in channel.subscriptions:
+                if sub_table != table or sub_event not in ("*", event):
+                    continue
+                if row_filter and not self._matches(row_filter, record or {}):
+                    continue
+                data = {"type": event, "schema": "public", "table": table}
+                if record is not None:
+                    data["record"] = record
+                if old_record is not None:
+                    data["old_record"] = old_record
+                callback({"data": data, "ids": [1]})
+
+    @staticmethod
+    def _matches(row_filter, record):
+        column, _, value = row_filter.partition("=eq.")
+        actual = record.get(column)
+        if isinstance(actual, bool):
+            actual = str(actual).lower()
+        return str(actual) == value
+
+
+class MonitorStub:
+    """The parts of :class:`Monitor` the change feed goes through, with the
+    announcing handlers recorded instead."""
+
+    consume_changes = Monitor.consume_changes
+    dispatch_changes = Monitor.dispatch_changes
+    dispatch_delete = Monitor.dispatch_delete
+    check_end = Monitor.check_end
+
+    def __init__(self):
+        self.calls = []
+        self.handled = asyncio.Event()
+        self.bot = SimpleNamespace(wait_until_ready=self._ready)
+        self.db_handler = SimpleNamespace(identity_cache=IdentityCache())
+        self.log_handler = SimpleNamespace(
+            logger=logging.getLogger("test_change_listener"),
+            report_error=self._report_error,
+        )
+
+    async def _ready(self):
+        pass
+
+    async def _report_error(self, location, error, note=None):
+        raise AssertionError(f"{location}: {error}")
+
+    async def process_new_players(self, players):
+        self.calls.append(("new_players", players))
+
+    async def process_top_plays(self, plays):
+        self.calls.append(("top_plays", plays))
+
+    async def monitor_rivals(self):
+        self.calls.append(("rivals", None))
+        self.handled.set()
+
+
+def player(discord_id, **flags):
+    return {
+        "discord_id": discord_id,
+        "osu_username": f"player{discord_id}",
+        "osu_id": discord_id * 10,
+        "new_player_announce": False,
+        "top_play_announce": False,
+        **flags,
+    }
+
+
+def make_listener(monitor, realtime, max_pending=1000):
+    return ChangeListener(
+        monitor.log_handler,
+        realtime,
+        Monitor.CHANGE_SUBSCRIPTIONS,
+        Monitor.CHANGE_PRIMARY_KEYS,
+        on_delete=monitor.dispatch_delete,
+        max_pending=max_pending,
+    )
+
+
+def test_changes_are_filtered_coalesced_and_dispatched():
+    async def scenario():
+        monitor = MonitorStub()
+        realtime = FakeRealtime()
+        monitor.change_listener = make_listener(monitor, realtime)
+        assert await monitor.change_listener.start()
+        assert monitor.change_listener.connected
+
+        # nothing to announce, the filters keep it off the socket
+        realtime.change("UPDATE", DISCORD_OSU, player(1))
+        # the same player flagged twice before the consumer runs
+        realtime.change("INSERT", DISCORD_OSU, player(2, new_player_announce=True))
+        realtime.change(
+            "UPDATE",
+            DISCORD_OSU,
+            player(2, new_player_announce=True, osu_username="renamed"),
+        )
+        realtime.change("UPDATE", DISCORD_OSU, player(3, top_play_announce=True))
+        realtime.change(
+            "UPDATE",
+            RIVALS,
+            {
+                "challenge_id": 7,
+                "challenge_status": "Unfinished",
+                "for_pp": 100,
+                "challenger_stats": 120,
+                "challenged_stats": 40,
+            },
+        )
+        realtime.change(
+            "UPDATE", RIVALS, {"challenge_id": 8, "challenge_status": "Won"}
+        )
+
+        consumer = asyncio.create_task(monitor.consume_changes())
+        await asyncio.wait_for(monitor.handled.wait(), 5)
+        consumer.cancel()
+
+        assert monitor.calls == [
+            (
+                "new_players",
+                [player(2, new_player_announce=True, osu_username="renamed")],
+            ),
+            ("top_plays", [player(3, top_play_announce=True)]),
+            ("rivals", None),
+        ]
+        assert monitor.change_listener.stats() == {
+            "connected": True,
+            "received": 4,
+            "pending": 0,
+            "coalesced": 1,
+            "dropped": 0,
+        }
+        cache = monitor.db_handler.identity_cache
+        assert cache.get(2).osu_username == "renamed"
+
+        realtime.change("DELETE", DISCORD_OSU, old_record={"discord_id": 2})
+        assert cache.get(2) is None
+
+    asyncio.run(scenario())
+
+
+def test_pending_changes_are_bounded():
+    async def scenario():
+        monitor = MonitorStub()
+        realtime = FakeRealtime()
+        listener = make_listener(monitor, realtime, max_pending=2)
+        await listener.start()
+
+        for discord_id in (1, 2, 3):
+            realtime.change(
+                "UPDATE", DISCORD_OSU, player(discord_id, top_play_announce=True)
+            )
+        # a row that's already pending still takes its latest change
+        realtime.change(
+            "UPDATE", DISCORD_OSU, player(2, top_play_announce=True, osu_id=99)
+        )
+
+        assert listener.stats()["dropped"] == 1
+        batch = await listener.get_batch()
+        assert [record["discord_id"] for _, record in batch] == [1, 2]
+        assert batch[1][1]["osu_id"] == 99
+        assert listener.stats()["pending"] == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,89 @@
+import pytest
+
+from utils_v2 import identity_cache as identity_cache_module
+from utils_v2 import IdentityCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(identity_cache_module, "time", clock)
+    return clock
+
+
+def test_lookup_from_any_side(clock):
+    cache = IdentityCache()
+    cache.put(1, osu_username="peppy", osu_id=2)
+
+    assert cache.get(discord_id=1).osu_username == "peppy"
+    assert cache.get(osu_username="peppy").discord_id == 1
+    assert cache.get(osu_id=2).discord_id == 1
+    assert cache.get(osu_username="nobody") is None
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = IdentityCache(ttl=300)
+    cache.put(1, osu_username="peppy", osu_id=2)
+
+    clock.now += 299
+    assert cache.get(osu_id=2) is not None
+    clock.now += 1
+    assert cache.get(osu_id=2) is None
+    # the expired entry is gone from every index
+    assert cache.stats()["size"] == 0
+    assert cache.get(osu_username="peppy") is None
+
+
+def test_least_recently_used_is_evicted(clock):
+    cache = IdentityCache(max_size=2)
+    cache.put(1, osu_username="a")
+    cache.put(2, osu_username="b")
+    cache.get(discord_id=1)
+    cache.put(3, osu_username="c")
+
+    assert cache.get(osu_username="b") is None
+    assert cache.get(osu_username="a").discord_id == 1
+    assert cache.get(osu_username="c").discord_id == 3
+
+
+def test_username_refresh_replaces_the_old_name(clock):
+    cache = IdentityCache()
+    cache.put(1, osu_username="old", osu_id=2)
+    cache.put(1, osu_username="new")
+
+    assert cache.get(osu_username="old") is None
+    entry = cache.get(osu_username="new")
+    # fields that weren't given keep their value
+    assert entry.osu_id == 2
+
+
+def test_name_taken_over_by_another_player(clock):
+    cache = IdentityCache()
+    cache.put(1, osu_username="shared")
+    cache.put(2, osu_username="shared")
+    cache.invalidate(discord_id=1)
+
+    assert cache.get(osu_username="shared").discord_id == 2
+
+
+def test_invalidate_by_any_identifier(clock):
+    cache = IdentityCache()
+    cache.put(1, osu_username="a", osu_id=10)
+    cache.put(2, osu_username="b", osu_id=20)
+
+    cache.invalidate(osu_username="a")
+    cache.invalidate(osu_id=20)
+
+    assert cache.stats()["size"] == 0
+    assert cache.get(discord_id=1) is None
+    assert cache.get(osu_id=10) is None
@@ -0,0 +1,309 @@
+import asyncio
+import json
+import logging
+import time
+
+import discord
+import pytest
+
+from load_env import ENV
+from utils_v2 import log_handler as log_handler_module
+from utils_v2.log_handler import LogHandler, _Report
+
+LOGGER_NAME = "test_log_handler"
+
+
+@pytest.fixture
+def log_handler(tmp_path, monkeypatch):
+    monkeypatch.setattr(ENV, "LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(ENV, "LOG_FILE_FORMAT", "json")
+    logger = logging.getLogger(LOGGER_NAME)
+    # pytest's capture handler on the root logger would count as "already set
+    # up", the logger gets its handlers, level and propagation back afterwards
+    monkeypatch.setattr(logger, "propagate", False)
+    monkeypatch.setattr(logger, "handlers", [])
+    monkeypatch.setattr(logger, "level", logger.level)
+
+    log_handler = LogHandler(logger_name=LOGGER_NAME)
+    handlers = log_handler.listener.handlers
+    # the console handler, keep the test output clean
+    handlers[0].setLevel(logging.CRITICAL + 1)
+    yield log_handler
+
+    log_handler.stop_listener()
+    for handler in handlers:
+        handler.close()
+
+
+class FakeClock:
+    """Replaces ``time`` inside the log handler module, asyncio's own clock
+    keeps running normally."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def __getattr__(self, name):
+        # the formatters still want the real wall clock
+        return getattr(time, name)
+
+
+class FakeWebhook:
+    def __init__(self):
+        self.sent = []
+        self.failing = False
+
+    async def send(self, **kwargs):
+        if self.failing:
+            raise ConnectionError("webhook is down")
+        self.sent.append(kwargs)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(log_handler_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def webhook(log_handler, monkeypatch):
+    webhook = FakeWebhook()
+    monkeypatch.setattr(log_handler, "webhook_url", "https://discord.invalid/hook")
+    monkeypatch.setattr(log_handler, "_get_webhook", lambda: webhook)
+    return webhook
+
+
+def make_report(key, username="OsuArena Error", description="boom") -> _Report:
+    return _Report(
+        key=key,
+        username=username,
+        embed=discord.Embed(title="⚠️ System Error", description=description),
+    )
+
+
+def read_log(tmp_path) -> list[dict]:
+    lines = (tmp_path / f"discord.{LOGGER_NAME}.log").read_text().splitlines()
+    return [json.loads(line) for line in lines]
+
+
+def test_json_log_keeps_exception_separate(log_handler, tmp_path):
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        log_handler.logger.exception("Division failed for %s", "player")
+    log_handler.stop_listener()
+
+    entry = read_log(tmp_path)[-1]
+
+    assert entry["level"] == "ERROR"
+    assert entry["message"] == "Division failed for player"
+    assert "exception" in entry
+    assert "ZeroDivisionError: division by zero" in entry["exception"]
+
+
+def test_message_is_merged_when_logged(log_handler, tmp_path):
+    payload = {"op": 0, "t": "READY"}
+    # the listener doesn't get to it before the payload changes
+    log_handler.listener.stop()
+    log_handler.logger.debug("Gateway event %s", payload)
+    payload["t"] = "RESUMED"
+    log_handler.listener.start()
+    log_handler.stop_listener()
+
+    assert read_log(tmp_path)[-1]["message"] == "Gateway event {'op': 0, 't': 'READY'}"
+
+
+def test_batches_are_split_by_embeds_chars_and_username(log_handler):
+    batch = [make_report(i) for i in range(12)]
+    batch.append(make_report("info", username="OsuArena Info"))
+    # two of these don't fit in one message's 6000 characters
+    batch += [make_report(f"big{i}", description="x" * 2500) for i in range(3)]
+    batch[0].count = 3
+
+    messages = log_handler._messages(batch)
+
+    assert [len(message) for message in messages] == [10, 2, 1, 2, 1]
+    assert [report.key for report in messages[2]] == ["info"]
+    for message in messages:
+        assert len({report.username for report in message}) == 1
+        assert sum(len(report.embed) for report in message) <= 6000
+    assert batch[0].embed.footer.text == "Repeated x3"
+
+
+def test_rate_limit_waits_for_the_oldest_send(log_handler, clock, monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        clock.now += delay
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    async def send(times):
+        for _ in range(times):
+            await log_handler._wait_rate_limit()
+
+    # 5 per 2 s: the 6th waits until the 1st is 2 s old
+    asyncio.run(send(6))
+    assert sleeps == [pytest.approx(2.0)]
+
+    # 30 per minute: after 30 sends the next one waits for the minute to end
+    clock.now += 60
+    log_handler._sent_at.clear()
+    start = clock.now
+    asyncio.run(send(31))
+    assert clock.now - start == pytest.approx(60.0)
+
+
+def test_full_queue_spills_to_disk_then_ships(log_handler, webhook, tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    log_handler.queue_size = 2
+    log_handler.batch_delay = 0
+    log_handler.spill_file = str(spill)
+
+    async def scenario():
+        # nothing runs the shipper until the queue is awaited below
+        for key in ("a", "b", "a", "c", "d"):
+            log_handler._enqueue(make_report(key))
+        await asyncio.wait_for(log_handler._queue.join(), 5)
+
+    asyncio.run(scenario())
+
+    assert log_handler.coalesced == 1
+    assert log_handler.spilled == 2
+    spilled = [json.loads(line) for line in spill.read_text().splitlines()]
+    assert [line["embed"]["title"] for line in spilled] == ["⚠️ System Error"] * 2
+    # what fit in the queue went out as one message, "a" with its repeat
+    assert len(webhook.sent) == 1
+    embeds = webhook.sent[0]["embeds"]
+    assert len(embeds) == 2
+    assert embeds[0].footer.text == "Repeated x2"
+    assert log_handler.stats()["reports_sent"] == 2
+
+
+def test_full_queue_drops_without_spill_file(log_handler):
+    log_handler.queue_size = 1
+    log_handler.spill_file = None
+
+    async def scenario():
+        log_handler._enqueue(make_report("a"))
+        log_handler._enqueue(make_report("b"))
+        log_handler._worker.cancel()
+
+    asyncio.run(scenario())
+
+    assert log_handler.dropped == 1
+    assert log_handler.spilled == 0
+
+
+def fail(message: str) -> Exception:
+    # raised from the same line every time, so the fingerprints match
+    try:
+        raise ConnectionError(message)
+    except ConnectionError as error:
+        return error
+
+
+def test_repeats_are_suppressed_then_summarised(log_handler, clock, monkeypatch):
+    reports = []
+    monkeypatch.setattr(log_handler, "webhook_url", "https://discord.invalid/hook")
+    monkeypatch.setattr(log_handler, "_enqueue", reports.append)
+    log_handler.dedup_window = 300
+
+    async def scenario():
+        # the message differs (ids, timestamps), the fingerprint doesn't
+        for attempt in range(57):
+            await log_handler.report_error("Monitor.tick()", fail(f"try {attempt}"))
+            clock.now += 1
+        await log_handler.report_error("Other.place()", fail("elsewhere"))
+        assert len(reports) == 2
+        assert log_handler.suppressed == 56
+
+        # the next one after the window summarises it and goes out itself
+        clock.now += 300
+        await log_handler.report_error("Monitor.tick()", fail("again"))
+
+    asyncio.run(scenario())
+
+    titles = [report.embed.title for report in reports]
+    assert titles == [
+        "⚠️ System Error",
+        "⚠️ System Error",
+        "🔁 Repeated Error",
+        "⚠️ System Error",
+    ]
+    count = reports[2].embed.fields[-1]
+    assert count.name == "Count"
+    assert count.value == "x57 in last 5 min"
+
+
+def test_window_timer_summarises_without_another_report(
+    log_handler, clock, monkeypatch
+):
+    reports = []
+    monkeypatch.setattr(log_handler, "webhook_url", "https://discord.invalid/hook")
+    monkeypatch.setattr(log_handler, "_enqueue", reports.append)
+    log_handler.dedup_window = 0.05
+
+    async def scenario():
+        for _ in range(3):
+            await log_handler.report_info("Retrying sync", "Updater")
+        assert len(reports) == 1
+        clock.now += 0.05
+        # the timer runs on the real loop clock
+        await asyncio.sleep(0.2)
+
+    asyncio.run(scenario())
+
+    assert [report.embed.title for report in reports] == ["Updater", "🔁 Repeated Info"]
+    assert reports[1].embed.fields[-1].value == "x3 in last 1 s"
+    assert log_handler._repeats == {}
+
+
+def test_breaker_opens_after_failures_and_recovers(log_handler, webhook, clock):
+    log_handler.breaker_failures = 2
+    log_handler.breaker_cooldown = 30
+
+    async def scenario():
+        webhook.failing = True
+        assert not await log_handler._send(content="1")
+        assert not log_handler._breaker_open()
+        assert not await log_handler._send(content="2")
+        assert log_handler._breaker_open()
+        assert log_handler.stats()["breaker"] == "open"
+
+        # the one send after the cooldown failing opens it again right away
+        clock.now += 30
+        assert not log_handler._breaker_open()
+        assert not await log_handler._send(content="3")
+        assert log_handler._breaker_open()
+        assert log_handler.breaker_trips == 2
+
+        clock.now += 30
+        webhook.failing = False
+        assert await log_handler._send(content="4")
+        assert log_handler.stats()["breaker"] == "closed"
+        assert log_handler._consecutive_failures == 0
+
+    asyncio.run(scenario())
+    assert log_handler.failed == 3
+    assert [kwargs["content"] for kwargs in webhook.sent] == ["4"]
+
+
+def test_open_breaker_spills_instead_of_sending(log_handler, webhook, clock, tmp_path):
+    log_handler.batch_delay = 0
+    log_handler.spill_file = str(tmp_path / "spill.jsonl")
+    log_handler._breaker_until = clock.now + 30
+
+    async def scenario():
+        log_handler._enqueue(make_report("a"))
+        log_handler._enqueue(make_report("b"))
+        await asyncio.wait_for(log_handler._queue.join(), 5)
+
+    asyncio.run(scenario())
+
+    assert webhook.sent == []
+    assert log_handler.spilled == 2
@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+import pytest
+
+from utils_v2.render_worker import RenderPool
+
+
+def hang(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def double(value: int) -> int:
+    return value * 2
+
+
+def test_timeout_recycles_the_pool():
+    async def scenario():
+        pool = RenderPool(workers=1, max_pending=2, timeout=60)
+        try:
+            # warm up, the first job pays for the worker start
+            assert await pool.run(double, 1) == 2
+            pool.timeout = 0.5
+            hung_executor = pool._executor
+            workers = list(hung_executor._processes.values())
+
+            with pytest.raises(asyncio.TimeoutError):
+                await pool.run(hang, 60)
+
+            assert pool._executor is None
+            for worker in workers:
+                worker.join(5)
+                assert not worker.is_alive()
+            # the hung job's slot comes back once its future fails
+            for _ in range(50):
+                if pool.stats()["pending"] == 0:
+                    break
+                await asyncio.sleep(0.1)
+            assert pool.stats()["pending"] == 0
+
+            pool.timeout = 60
+            assert await pool.run(double, 21) == 42
+            assert pool.stats()["timeouts"] == 1
+        finally:
+            pool.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from utils_v2 import SingleFlight, coalesced
+
+
+class Fetcher:
+    def __init__(self):
+        self.flight = SingleFlight("test")
+        self.started = 0
+        self.release = asyncio.Event()
+
+    @coalesced
+    async def fetch(self, league: str, refresh: bool = False) -> list[str]:
+        self.started += 1
+        await self.release.wait()
+        if league == "missing":
+            raise LookupError(league)
+        return [league, str(refresh)]
+
+
+def test_concurrent_calls_share_one_result():
+    async def scenario():
+        fetcher = Fetcher()
+        waiters = [asyncio.create_task(fetcher.fetch("gold")) for _ in range(5)]
+        other = asyncio.create_task(fetcher.fetch("gold", refresh=True))
+        await asyncio.sleep(0)
+        fetcher.release.set()
+
+        results = await asyncio.gather(*waiters)
+        assert await other == ["gold", "True"]
+        assert fetcher.started == 2
+        assert all(result is results[0] for result in results)
+        assert fetcher.flight.stats()["deduplicated"] == 4
+        assert fetcher.flight.stats()["calls"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_calls_share_one_exception():
+    async def scenario():
+        fetcher = Fetcher()
+        waiters = [asyncio.create_task(fetcher.fetch("missing")) for _ in range(3)]
+        await asyncio.sleep(0)
+        fetcher.release.set()
+
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert fetcher.started == 1
+        assert all(isinstance(result, LookupError) for result in results)
+        assert results[1] is results[0]
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_cancel_the_others():
+    async def scenario():
+        fetcher = Fetcher()
+        first = asyncio.create_task(fetcher.fetch("gold"))
+        second = asyncio.create_task(fetcher.fetch("gold"))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        fetcher.release.set()
+
+        assert await second == ["gold", "False"]
+        assert fetcher.started == 1
+
+    asyncio.run(scenario())
+
+
+def test_key_is_cleared_once_done():
+    async def scenario():
+        fetcher = Fetcher()
+        fetcher.release.set()
+        await fetcher.fetch("gold")
+        assert fetcher.flight.stats()["in_flight"] == 0
+
+        # not a cache, the next call runs again
+        await fetcher.fetch("gold")
+        assert fetcher.started == 2
+
+        with pytest.raises(LookupError):
+            await fetcher.fetch("missing")
+        assert fetcher.flight.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
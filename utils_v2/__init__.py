@@ -35,11 +35,29 @@ from .log_handler import LogHandler
 from .db_handler import DatabaseHandler
 
 from .renderer import BaseRenderer, Renderer
+from .show_pager import ShowPageButton, ShowPageView, build_league_page
 
 from .reset_utils import ResetConfirmView
 
 from .init_externs import InitExterns
 
+from .osuapi_handler import (
+    OsuAPI_Handler,
+    OsuClientPool,
+    PoolStrategy,
+    RequestPriority,
+    TokenBucket,
+)
+
+from .player_updater import PlayerUpdater
+from .change_listener import ChangeListener
+from .scheduler import AdaptiveInterval, AdaptiveScheduler
+from .identity_cache import Identity, IdentityCache
+from .render_cache import RenderCache
+from .single_flight import SingleFlight, coalesced
+from .render_worker import RenderPool, RenderQueueFull
+from leaderboard_draw import RENDER_BACKENDS, draw_leaderboard, draw_leaderboard_pillow
+
 __all__ = [
     # Table Namespaces
     "TableAll",
@@ -84,6 +102,33 @@ __all__ = [
     "ChallengeView",
     "DynamicButtons",
     "ResetConfirmView",
+    "ShowPageButton",
+    "ShowPageView",
+    "build_league_page",
     # Init
     "InitExterns",
+    # Updater
+    "PlayerUpdater",
+    # Monitor
+    "ChangeListener",
+    "AdaptiveInterval",
+    "AdaptiveScheduler",
+    # Caches
+    "Identity",
+    "IdentityCache",
+    "RenderCache",
+    "SingleFlight",
+    "coalesced",
+    # Rendering
+    "RenderPool",
+    "RenderQueueFull",
+    "draw_leaderboard",
+    "draw_leaderboard_pillow",
+    "RENDER_BACKENDS",
+    # osu! API
+    "OsuAPI_Handler",
+    "OsuClientPool",
+    "PoolStrategy",
+    "RequestPriority",
+    "TokenBucket",
 ]
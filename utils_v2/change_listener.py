@@ -0,0 +1,187 @@
+"""
+Push based change feed for the Monitor cog, built on Supabase Realtime
+(postgres_changes, which rides on the database's logical replication).
+"""
+
+from __future__ import annotations
+import asyncio
+from typing import Any, Callable
+
+from supabase import AsyncClient
+
+from utils_v2.log_handler import LogHandler
+
+
+class ChangeListener:
+    """Subscribes to row changes and keeps the latest version of every
+    changed row until the consumer takes it.
+
+    Each subscription is an ``(event, table, filter)`` triple: ``event`` is
+    ``"INSERT"``, ``"UPDATE"``, ``"DELETE"`` or ``"*"`` and ``filter`` uses
+    the Realtime filter syntax (e.g. ``"top_play_announce=eq.true"``) or is
+    ``None`` for every row. Realtime can't filter deletes.
+
+    Pending rows are keyed by ``(table, primary key)``, a newer change of a
+    row replaces the one still waiting (the consumer only cares about the
+    latest state), so a burst of updates to one row is handled once. At
+    most ``max_pending`` rows wait at a time, changes of other rows are
+    dropped beyond that and left to the polling detectors. The consumer
+    takes everything pending at once with :meth:`get_batch`. Deleted rows
+    aren't kept, they go to ``on_delete`` right away.
+
+    Parameters
+    -----------
+    log_handler: :class:`LogHandler`
+        The logger used for error handling and exception reporting.
+    supabase_client: :class:`supabase.AsyncClient`
+        The client whose Realtime socket is used.
+    subscriptions: list[tuple[str, str, str | None]]
+        The ``(event, table, filter)`` triples to listen to.
+    primary_keys: dict[str, str]
+        Primary key column per table, changes of rows without one aren't
+        coalesced.
+    channel_name: :class:`str`
+        Name of the Realtime channel.
+    on_delete: Callable[[str, dict[str, Any]], None] | None
+        Called with ``(table, old_record)`` for every deleted row. The old
+        record only has the primary key unless the table's replica identity
+        is ``FULL``.
+    max_pending: :class:`int`
+        Rows allowed to wait for the consumer at the same time.
+    """
+
+    def __init__(
+        self,
+        log_handler: LogHandler,
+        supabase_client: AsyncClient,
+        subscriptions: list[tuple[str, str, str | None]],
+        primary_keys: dict[str, str],
+        channel_name: str = "monitor",
+        on_delete: Callable[[str, dict[str, Any]], None] | None = None,
+        max_pending: int = 1000,
+    ):
+        self.log_handler = log_handler
+        self.logger = log_handler.logger
+        self.supabase_client = supabase_client
+        self.subscriptions = subscriptions
+        self.primary_keys = primary_keys
+        self.channel_name = channel_name
+        self.on_delete = on_delete
+        self.max_pending = max(1, max_pending)
+
+        self._pending: dict[tuple[str, Any], dict[str, Any]] = {}
+        self._has_pending = asyncio.Event()
+        self._channel = None
+
+        self.connected = False
+        self.events_received = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    async def start(self) -> bool:
+        """|coro|
+        Opens the channel and registers every subscription.
+
+        Returns
+        -----------
+        bool
+            ``True`` if the subscribe request went out, ``False`` otherwise.
+            :attr:`connected` only flips once the server confirms it.
+        """
+        try:
+            channel = self.supabase_client.channel(self.channel_name)
+            for event, table, row_filter in self.subscriptions:
+                kwargs = {"filter": row_filter} if row_filter else {}
+                channel.on_postgres_changes(
+                    event,
+                    schema="public",
+                    table=table,
+                    callback=self._on_change,
+                    **kwargs,
+                )
+            await channel.subscribe(self._on_status)
+            self._channel = channel
+            return True
+        except Exception as error:
+            self.connected = False
+            await self.log_handler.report_error(
+                "ChangeListener.start()",
+                error,
+                "Realtime subscription failed, falling back to polling.",
+            )
+            return False
+
+    async def stop(self) -> None:
+        self.connected = False
+        if self._channel is None:
+            return
+        try:
+            await self.supabase_client.remove_channel(self._channel)
+        except Exception as error:
+            self.logger.error(f"ChangeListener.stop(): {error}")
+        self._channel = None
+
+    async def get_batch(self) -> list[tuple[str, dict[str, Any]]]:
+        """|coro|
+        Waits for at least one pending row, then takes all of them as
+        ``(table, record)`` tuples, in the order the rows first changed.
+        """
+        await self._has_pending.wait()
+        batch = [(table, record) for (table, _), record in self._pending.items()]
+        self._pending.clear()
+        self._has_pending.clear()
+        return batch
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "received": self.events_received,
+            "pending": len(self._pending),
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
+
+    def _on_status(self, status, error=None) -> None:
+        was_connected = self.connected
+        self.connected = str(getattr(status, "value", status)) == "SUBSCRIBED"
+        if was_connected != self.connected:
+            self.logger.info(
+                f"Realtime channel '{self.channel_name}' is now {status}"
+                + (f" ({error})" if error else "")
+            )
+
+    def _on_change(self, payload: dict[str, Any]) -> None:
+        # realtime-py nests the change under "data", the JS style payload doesn't
+        data = payload.get("data", payload)
+        event = data.get("type") or data.get("eventType")
+        if event == "DELETE":
+            old_record = data.get("old_record") or data.get("old")
+            if self.on_delete and old_record and data.get("table"):
+                self.events_received += 1
+                try:
+                    self.on_delete(data["table"], old_record)
+                except Exception as error:
+                    self.logger.error(f"ChangeListener.on_delete(): {error}")
+            return
+
+        record = data.get("record") or data.get("new")
+        table = data.get("table")
+        if not record or not table:
+            return
+
+        self.events_received += 1
+        primary_key = record.get(self.primary_keys.get(table, ""))
+        # rows without a primary key are never coalesced
+        key = (table, primary_key if primary_key is not None else object())
+        if key in self._pending:
+            self.coalesced += 1
+        elif len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                self.logger.warning(
+                    f"ChangeListener: {self.dropped} changes dropped so far, "
+                    f"{self.max_pending} already pending. The poller picks them up."
+                )
+            return
+        self._pending[key] = record
+        self._has_pending.set()
@@ -4,8 +4,10 @@ Common class for both the website and the bot for database access
 """
 
 from __future__ import annotations
+import asyncio
 import datetime
-from typing import Any
+import time
+from typing import Any, AsyncIterator
 from aiohttp.connector import NamedPipeConnector
 import discord
 from supabase import AsyncClient
@@ -13,6 +15,8 @@ from supabase import AsyncClient
 from utils_v2.enums.status import FuncStatus
 from utils_v2.enums.tables import TablesLeagues
 from utils_v2.log_handler import LogHandler
+from utils_v2.identity_cache import IdentityCache
+from utils_v2.single_flight import SingleFlight, coalesced
 
 from .enums import (
     HistoricalPointsColumn,
@@ -30,6 +34,23 @@ from .enums import (
     ChallengeUserColumn,
 )
 
+IDENTITY_COLUMNS = ", ".join(
+    [
+        DiscordOsuColumn.DISCORD_ID,
+        DiscordOsuColumn.OSU_USERNAME,
+        DiscordOsuColumn.OSU_ID,
+    ]
+)
+
+LEAGUE_TABLE_COLUMNS = [
+    LeagueColumn.OSU_USERNAME,
+    LeagueColumn.INITIAL_PP,
+    LeagueColumn.CURRENT_PP,
+    LeagueColumn.PP_CHANGE,
+    LeagueColumn.PERCENTAGE_CHANGE,
+    LeagueColumn.II,
+]
+
 
 class DatabaseHandler:
     """Represents an interface for interacting with the PostgreSQL database via Supabase.
@@ -45,11 +66,36 @@ class DatabaseHandler:
         either the bot or the web application.
     supabase_client: :class:`supabase.AsyncClient`
         The asynchronous client used to communicate with the Supabase API.
+    identity_cache: :class:`IdentityCache` | None
+        Cache for the discord_id <-> osu_username <-> osu_id lookups, a
+        default sized one is made if not given.
+    season_cache_ttl: :class:`float`
+        Seconds the cached current season is trusted before it's re-read, in
+        case the seasons table was changed outside this process.
+    chunk_size: :class:`int`
+        Rows per request for full table reads (see :meth:`iter_rows`). Keep
+        it at or below PostgREST's ``max-rows`` (1000 by default).
     """
 
-    def __init__(self, log_handler: LogHandler, supabase_client: AsyncClient):
+    def __init__(
+        self,
+        log_handler: LogHandler,
+        supabase_client: AsyncClient,
+        identity_cache: IdentityCache | None = None,
+        season_cache_ttl: float = 60.0,
+        chunk_size: int = 1000,
+    ):
         self.log_handler = log_handler
         self.supabase_client = supabase_client
+        self.identity_cache = identity_cache or IdentityCache()
+        self.chunk_size = max(1, chunk_size)
+        # concurrent identical reads (e.g. several /show gold at once) share
+        # one request, see utils_v2.single_flight
+        self.flight = SingleFlight("db")
+
+        self.season_cache_ttl = season_cache_ttl
+        self._current_season: int | None = None
+        self._season_loaded_at: float | None = None
 
     async def get_discord_id(
         self, osu_username: str | None = None, discord_username: str | None = None
@@ -76,6 +122,12 @@ class DatabaseHandler:
         # Users can change their Discord names, potentially
         # rendering database records stale. Always prefer
         # querying by osu_username or discord_id when possible.
+        # discord_username lookups skip the identity cache for the same reason
+        if not discord_username and (
+            cached := self.identity_cache.get(osu_username=osu_username)
+        ):
+            return cached.discord_id
+
         log_context = "Unknown"
         try:
             if discord_username:
@@ -88,6 +140,7 @@ class DatabaseHandler:
             if not query.data:
                 return None
 
+            self._cache_identity(query.data[0])
             return query.data[0][DiscordOsuColumn.DISCORD_ID]
 
         except Exception as error:
@@ -121,12 +174,17 @@ class DatabaseHandler:
         # (even better is discord_id which can't be changed).
         # But since Rivals Table doesn't have discord_id, this is the second
         # best choice
+        cached = self.identity_cache.get(discord_id=discord_id)
+        if cached and cached.osu_username is not None:
+            return cached.osu_username
+
         try:
             query = await self._osu_from_id(discord_id)
 
             if not query.data:
                 return None
 
+            self._cache_identity(query.data[0])
             return query.data[0][DiscordOsuColumn.OSU_USERNAME]
 
         except Exception as error:
@@ -207,13 +265,13 @@ class DatabaseHandler:
             DiscordOsuColumn.LEAGUE,
         ]
         try:
-            response = (
-                await self.supabase_client.table(TableMiscellaneous.DISCORD_OSU)
-                .select(", ".join(query_selector))
-                .eq(DiscordOsuColumn.TOP_PLAY_ANNOUNCE, True)
-                .execute()
+            rows = await self.fetch_all_rows(
+                TableMiscellaneous.DISCORD_OSU,
+                query_selector,
+                DiscordOsuColumn.DISCORD_ID,
+                filters={DiscordOsuColumn.TOP_PLAY_ANNOUNCE: True},
             )
-            return response.data if response.data else None
+            return rows or None
         except Exception as error:
             await self.log_handler.report_error(
                 "DatabaseHandler.top_play_detector()", error
@@ -255,6 +313,32 @@ class DatabaseHandler:
             )
             return False
 
+    async def negate_top_plays(self, discord_ids: list[int]) -> set[int]:
+        """|coro|
+        Bulk version of :meth:`negate_top_play`, clears the flag for every
+        given user in a single UPDATE.
+
+        Only rows whose flag is still ``True`` are touched, so an ID missing
+        from the result was either already acknowledged elsewhere or failed.
+
+        Accesses table : discord_osu
+
+        Parameters
+        -----------
+        discord_ids : list[class:`int`]
+            The users' unique Discord IDs.
+
+        Returns
+        -----------
+        set[int]
+            The Discord IDs whose flag was actually cleared. Empty on failure.
+        """
+        return await self._negate_flag(
+            DiscordOsuColumn.TOP_PLAY_ANNOUNCE,
+            discord_ids,
+            "DatabaseHandler.negate_top_plays()",
+        )
+
     async def new_player_detector(self) -> list[dict[str, Any]] | None:
         """|coro|
         Retrieves a list of newly registered users waiting for an announcement.
@@ -285,13 +369,13 @@ class DatabaseHandler:
             DiscordOsuColumn.OSU_USERNAME,
         ]
         try:
-            response = (
-                await self.supabase_client.table(TableMiscellaneous.DISCORD_OSU)
-                .select(", ".join(query_selector))
-                .eq(DiscordOsuColumn.NEW_PLAYER_ANNOUNCE, True)
-                .execute()
+            rows = await self.fetch_all_rows(
+                TableMiscellaneous.DISCORD_OSU,
+                query_selector,
+                DiscordOsuColumn.DISCORD_ID,
+                filters={DiscordOsuColumn.NEW_PLAYER_ANNOUNCE: True},
             )
-            return response.data if response.data else None
+            return rows or None
         except Exception as error:
             await self.log_handler.report_error(
                 "DatabaseHandler.new_player_detector()", error
@@ -333,14 +417,41 @@ class DatabaseHandler:
             )
             return False
 
+    async def negate_new_player_announces(self, discord_ids: list[int]) -> set[int]:
+        """|coro|
+        Bulk version of :meth:`negate_new_player_announce`, clears the flag for
+        every given user in a single UPDATE.
+
+        Only rows whose flag is still ``True`` are touched, so an ID missing
+        from the result was either already acknowledged elsewhere or failed.
+
+        Accesses table : discord_osu
+
+        Parameters
+        -----------
+        discord_ids : list[class:`int`]
+            The users' unique Discord IDs.
+
+        Returns
+        -----------
+        set[int]
+            The Discord IDs whose flag was actually cleared. Empty on failure.
+        """
+        return await self._negate_flag(
+            DiscordOsuColumn.NEW_PLAYER_ANNOUNCE,
+            discord_ids,
+            "DatabaseHandler.negate_new_player_announces()",
+        )
+
+    @coalesced
     async def get_current_league_table(
         self, league: str
     ) -> tuple[list[str], list[tuple[Any]]]:
         """|coro|
         Retrieves the current standings for a specific league.
 
-        This method first triggers a remote procedure call (``sync_table_pp``)
-        to ensure all player performance points are up-to-date, and then
+        This method first syncs the league with :meth:`sync_league_pp` (only
+        the players whose pp changed since the last sync get copied) and then
         fetches the sorted league data.
 
         Accesses table : f"{TablesLeagues.(any)}"
@@ -358,20 +469,12 @@ class DatabaseHandler:
             2. A list of rows, where each row is a tuple of values.
             Returns ``([], [])`` if the synchronization or fetch fails.
         """
-        try:
-            await self.supabase_client.rpc(
-                "sync_table_pp", {"tbl_name": league}
-            ).execute()
-        except Exception as error:
-            await self.log_handler.report_error(
-                f"get_current_league_table({league})",
-                error,
-                "Failed to sync PP values.",
-            )
+        if await self.sync_league_pp(league) is None:
             return [], []
 
         return await self._fetch_league_data(league)
 
+    @coalesced
     async def get_archived_league_table(
         self, league: str, season: int
     ) -> tuple[list[str], list[tuple[Any]]]:
@@ -399,6 +502,92 @@ class DatabaseHandler:
         table_name = f"{league}_{season}"
         return await self._fetch_league_data(table_name)
 
+    @coalesced
+    async def get_current_league_page(
+        self, league: str, page: int, page_size: int, sync: bool = True
+    ) -> tuple[list[str], list[tuple[Any]], int] | FuncStatus:
+        """|coro|
+        Retrieves one page of the current standings for a specific league.
+
+        Only the rows of the requested page are transferred, ordered the same
+        way as :meth:`get_current_league_table`. The total row count comes
+        back with the page so callers can work out the number of pages.
+
+        Accesses table : f"{TablesLeagues.(any)}"
+
+        Parameters
+        -----------
+        league : class:`str`
+            The name of the league table to retrieve (e.g., "silver", "gold").
+        page : class:`int`
+            Zero based page number.
+        page_size : class:`int`
+            Rows per page.
+        sync : class:`bool`
+            Run :meth:`sync_league_pp` before reading. Paging through a table
+            that was just synced can skip it.
+
+        Returns
+        -----------
+        tuple[list[str], list[tuple[Any]], int] | FuncStatus
+            Headers, the rows of the page and the total row count of the league,
+            ``([], [], 0)`` for an empty league.
+            Returns ``FuncStatus.ERROR`` if the synchronization or fetch fails.
+        """
+        if sync and await self.sync_league_pp(league) is None:
+            return FuncStatus.ERROR
+
+        return await self._fetch_league_page(league, max(0, page), max(1, page_size))
+
+    @coalesced
+    async def sync_league_pp(self, league: str, full: bool = False) -> int | None:
+        """|coro|
+        Copies the players' latest pp, username, rank and ii from discord_osu
+        into a league table.
+
+        By default only players changed since the league's last sync are
+        copied (``sync_table_pp_dirty``): discord_osu keeps a
+        ``pp_updated_at`` timestamp and the league's last sync time is kept
+        in ``league_sync_state``. When no changed player differs from their
+        league row the RPC returns before taking any lock or writing
+        anything, a /show with nothing new costs one indexed read. ``full`` runs the original
+        ``sync_table_pp`` over every row instead, for the season end where
+        the numbers must be exact no matter what.
+
+        Accesses table : f"{TablesLeagues.(any)}", discord_osu, league_sync_state
+
+        Parameters
+        -----------
+        league : class:`str`
+            The name of the league table to sync.
+        full : class:`bool`
+            Re-copy every row instead of only the changed ones.
+
+        Returns
+        -----------
+        int | None
+            Number of rows copied (always ``0`` for a full sync, which doesn't
+            count them), or ``None`` if the sync failed.
+        """
+        try:
+            if full:
+                await self.supabase_client.rpc(
+                    "sync_table_pp", {"tbl_name": league}
+                ).execute()
+                return 0
+            response = await self.supabase_client.rpc(
+                "sync_table_pp_dirty", {"tbl_name": league}
+            ).execute()
+            return response.data or 0
+        except Exception as error:
+            await self.log_handler.report_error(
+                f"DatabaseHandler.sync_league_pp({league})",
+                error,
+                "Failed to sync PP values.",
+            )
+            return None
+
+    @coalesced
     async def get_rivals_table(self, status: str) -> tuple[list[str], list[tuple[Any]]]:
         """|coro|
         Retrieves the rivals table filtered by challenge status.
@@ -450,14 +639,14 @@ class DatabaseHandler:
             ]
 
         try:
-            response = (
-                await self.supabase_client.table(TablesRivals.RIVALS)
-                .select(", ".join(query_selector))
-                .eq(RivalsColumn.CHALLENGE_STATUS, status)
-                .execute()
-            )
-            if response and response.data:
-                return await self._arrange_table(response.data)
+            rows = await self.fetch_all_rows(
+                TablesRivals.RIVALS,
+                query_selector,
+                RivalsColumn.CHALLENGE_ID,
+                filters={RivalsColumn.CHALLENGE_STATUS: status},
+            )
+            if rows:
+                return await self._arrange_table(rows)
             return [], []
         except Exception as error:
             await self.log_handler.report_error(
@@ -516,6 +705,7 @@ class DatabaseHandler:
             )
             return False
 
+    @coalesced
     async def get_current_points(
         self, point_type: str
     ) -> tuple[list[str], list[tuple[Any]]]:
@@ -561,6 +751,7 @@ class DatabaseHandler:
             )
             return [], []
 
+    @coalesced
     async def get_archived_points(
         self, season: int
     ) -> tuple[list[str], list[tuple[Any]]]:
@@ -919,6 +1110,36 @@ class DatabaseHandler:
             )
             return None
 
+    async def settle_finished_rivals(self) -> list[dict[str, Any]] | None:
+        """|coro|
+        Finishes every unfinished challenge where a player reached ``for_pp``.
+
+        This calls the Supabase RPC ``settle_finished_rivals``, which in one
+        transaction marks the challenges as finished (setting ``winner`` and
+        ``ended_at``), gives the winner ``for_pp`` points and takes half of it
+        (rounded) from the loser. Each challenge is only ever returned by one call.
+
+        Accesses table : rivals, discord_osu, mesg_id
+
+        Returns
+        -----------
+        list[dict[str, Any]] | None
+            One row per settled challenge with ``challenge_id``, ``winner``,
+            ``loser``, ``winner_id``, ``loser_id``, ``for_pp`` and ``msg_id``
+            (Discord IDs and ``msg_id`` may be ``None``). An empty list if
+            nothing finished, ``None`` if an error occurred.
+        """
+        try:
+            response = await self.supabase_client.rpc(
+                "settle_finished_rivals"
+            ).execute()
+            return response.data or []
+        except Exception as error:
+            await self.log_handler.report_error(
+                "DatabaseHandler.settle_finished_rivals()", error
+            )
+            return None
+
     async def revoke_challenge(self, challenge_id: int) -> bool:
         """|coro|
         Marks a specific challenge as revoked (Pending -> Revoked) in the rivals table.
@@ -990,43 +1211,40 @@ class DatabaseHandler:
                 f"Cannot store msg_id : {msg_id} as challenge_id : {challenge_id}",
             )
 
-    async def get_current_season(self) -> int:
+    async def get_current_season(self, refresh: bool = False) -> int:
         """|coro|
-        Retrieves the season number of the currently ongoing season. Used for
-        /season-reset command right now
+        Retrieves the season number of the currently ongoing season.
+
+        The value is cached, it's loaded once at startup, kept up to date by
+        :meth:`add_new_season` and :meth:`mark_season_archived` and re-read
+        once it's older than ``season_cache_ttl``. Errors are never cached,
+        concurrent misses share one read.
 
         It queries the :attr:`~TableMiscellaneous.SEASONS` table for a row where
         the status is ``SeasonStatus.ONGOING``.
 
         Accesses table : seasons
 
+        Parameters
+        -----------
+        refresh : :class:`bool`
+            Skip the cache and read the table, for the season commands
+            themselves.
+
         Returns
         -----------
         :class:`int` | None
             The current season number if found.
             Returns ``None`` if no ongoing season exists or if an error occurs.
         """
-        try:
-            response = (
-                await self.supabase_client.table(TableMiscellaneous.SEASONS)
-                .select(SeasonColumn.SEASON)
-                .eq(SeasonColumn.STATUS, SeasonStatus.ONGOING)
-                .maybe_single()
-                .execute()
-            )
-            if response and response.data:
-                return response.data[SeasonColumn.SEASON]
-            await self.log_handler.report_info(
-                "Couldn't find any ongoing season. Please check if it doesn't sound right!"
-            )
-            return None
-        except Exception as error:
-            await self.log_handler.report_error(
-                "DatabaseHandler.get_current_season()",
-                error,
-                "Can't get stuff for current ongoing season.",
-            )
-            return None
+        if (
+            not refresh
+            and self._season_loaded_at is not None
+            and time.monotonic() - self._season_loaded_at < self.season_cache_ttl
+        ):
+            return self._current_season
+
+        return await self._load_current_season()
 
     async def mark_season_archived(self, season: int) -> bool:
         """|coro|
@@ -1060,6 +1278,8 @@ class DatabaseHandler:
                 raise Exception(
                     f"No rows were updated when trying to mark season : {season} as archived."
                 )
+            if self._current_season == season:
+                self._set_current_season(None)
             return True
         except Exception as error:
             await self.log_handler.report_error(
@@ -1069,6 +1289,38 @@ class DatabaseHandler:
             )
             return False
 
+    async def award_weekly_winner(self, league: str) -> list[dict[str, Any]] | None:
+        """|coro|
+        Gives +100 points (universal and seasonal) to the player(s) with the
+        highest pp gain of a league, via the RPC ``award_weekly_winner``.
+
+        Sync the league first (:meth:`sync_league_pp`), the winner is read
+        from the league table as is.
+
+        Accesses table : f"{TablesLeagues.(any)}", discord_osu
+
+        Parameters
+        -----------
+        league : class:`str`
+            The name of the league table.
+
+        Returns
+        -----------
+        list[dict[str, Any]] | None
+            One row per winner with ``osu_username``, ``new_points`` and
+            ``new_seasonal_points`` (ties all win). ``None`` if an error occurred.
+        """
+        try:
+            response = await self.supabase_client.rpc(
+                "award_weekly_winner", {"league_table_name": league}
+            ).execute()
+            return response.data or []
+        except Exception as error:
+            await self.log_handler.report_error(
+                f"DatabaseHandler.award_weekly_winner({league})", error
+            )
+            return None
+
     async def seasonal_point_update(self) -> FuncStatus:
         """|coro|
         Synchronizes and awards seasonal points for all leagues. Done during
@@ -1076,7 +1328,7 @@ class DatabaseHandler:
 
         Iterates through every league table and performs two RPC calls per league:
 
-        1. ``sync_table_pp``: Ensures current pp matches the latest osu! API data.
+        1. ``sync_table_pp`` (full sync): Ensures current pp matches the latest osu! API data.
         2. ``award_seasonal_points``: Calculates and distributes points for the season during it's end
 
         If a league fails to update, the loop continues to the next one, but the
@@ -1091,17 +1343,9 @@ class DatabaseHandler:
         error_marker = FuncStatus.GOOD
         try:
             for a_league in [league for league in TablesLeagues]:
-                try:
-                    await self.supabase_client.rpc(
-                        "sync_table_pp", {"tbl_name": a_league}
-                    ).execute()
-                except Exception as error:
+                # already reported, seasonal points for this league are skipped
+                if await self.sync_league_pp(a_league, full=True) is None:
                     error_marker = FuncStatus.ERROR
-                    await self.log_handler.report_error(
-                        "DatabaseHandler.seasonal_point_update()",
-                        error,
-                        f"Error syncing {a_league}, seasonal points for these players won't be updated",
-                    )
                     continue
                 try:
                     await self.supabase_client.rpc(
@@ -1211,6 +1455,127 @@ class DatabaseHandler:
             )
             return FuncStatus.ERROR
 
+    async def snapshot_league(self, league: str, season: int) -> dict[str, Any] | None:
+        """|coro|
+        Copies a league table to its archive table ``{league}_{season}`` and
+        verifies the copy, via the RPC ``snapshot_league``.
+
+        The league is locked against writes while it's copied, then the row
+        count and an order independent checksum of every row are compared
+        between the league and the copy. A copy that doesn't match is rolled
+        back (the archive table doesn't exist afterwards), so a failed
+        snapshot can just be retried.
+
+        Accesses table : f"{TablesLeagues.(any)}", f"{TablesLeagues.(any)}_{season}"
+
+        Parameters
+        -----------
+        league : :class:`str`
+            The name of the league to snapshot (e.g., "gold").
+        season : :class:`int`
+            The season number to append to the archive table name.
+
+        Returns
+        -----------
+        dict[str, Any] | None
+            ``source_rows``, ``snapshot_rows``, ``source_checksum`` and
+            ``snapshot_checksum`` of the verified snapshot.
+            ``None`` if an error occurred or the copy didn't match.
+        """
+        new_table = f"{league}_{season}"
+        try:
+            response = await self.supabase_client.rpc(
+                "snapshot_league",
+                {"source_table": league, "new_table_name": new_table},
+            ).execute()
+            if not response.data:
+                raise Exception(f"snapshot_league returned nothing for {new_table}")
+            return response.data[0]
+        except Exception as error:
+            await self.log_handler.report_error(
+                f"DatabaseHandler.snapshot_league({league})",
+                error,
+                f"{new_table} was not created",
+            )
+            return None
+
+    async def get_missing_snapshots(self, season: int) -> list[str] | None:
+        """|coro|
+        Lists the leagues whose archive table ``{league}_{season}`` doesn't
+        exist yet, via the RPC ``missing_league_snapshots``.
+
+        :meth:`snapshot_league` rolls a copy back unless it matched its
+        league, so an archive table that exists is a verified one and only
+        the leagues returned here still need a snapshot.
+
+        Parameters
+        -----------
+        season : :class:`int`
+            The season the snapshots belong to.
+
+        Returns
+        -----------
+        list[str] | None
+            The leagues without a snapshot, empty if every league has one.
+            ``None`` if an error occurred.
+        """
+        try:
+            response = await self.supabase_client.rpc(
+                "missing_league_snapshots",
+                {
+                    "league_tables": [str(league) for league in TablesLeagues],
+                    "season": season,
+                },
+            ).execute()
+            return list(response.data or [])
+        except Exception as error:
+            await self.log_handler.report_error(
+                "DatabaseHandler.get_missing_snapshots()",
+                error,
+                f"Couldn't check the league snapshots of season {season}",
+            )
+            return None
+
+    async def close_season(self) -> list[dict[str, Any]] | None:
+        """|coro|
+        Ends the ongoing season in a single transaction, via the RPC
+        ``close_season``.
+
+        In order: marks the season archived, fully syncs and awards seasonal
+        points for every league and backs the seasonal points up to
+        ``historical_points``. If any step fails the whole thing is rolled
+        back, the season stays ongoing and can simply be closed again.
+
+        The league tables are snapshotted afterwards with
+        :meth:`snapshot_league`, which can run for several leagues at once,
+        and :meth:`get_missing_snapshots` tells which ones are left if some
+        of them failed.
+
+        Accesses table : seasons, discord_osu, historical_points,
+        f"{TablesLeagues.(any)}"
+
+        Returns
+        -----------
+        list[dict[str, Any]] | None
+            One row per step with ``season``, ``step``, ``rows_affected``
+            (``None`` where it doesn't apply) and ``elapsed_ms``.
+            ``None`` if an error occurred (nothing was changed).
+        """
+        try:
+            response = await self.supabase_client.rpc(
+                "close_season",
+                {"league_tables": [str(league) for league in TablesLeagues]},
+            ).execute()
+            self._set_current_season(None)
+            return response.data or []
+        except Exception as error:
+            await self.log_handler.report_error(
+                "DatabaseHandler.close_season()",
+                error,
+                "Season close rolled back, nothing was changed",
+            )
+            return None
+
     async def update_init_pp(self, league: str) -> FuncStatus:
         """|coro|
         Updates the 'initial_pp' value for all users in for the given league
@@ -1391,6 +1756,7 @@ class DatabaseHandler:
             ``True`` if the user was successfully deleted.
             ``False`` if the user was not found or an error occurred.
         """
+        self.identity_cache.invalidate(discord_id=discord_id)
         try:
             response = await (
                 self.supabase_client.table(TableMiscellaneous.DISCORD_OSU)
@@ -1560,6 +1926,96 @@ class DatabaseHandler:
             )
             return FuncStatus.ERROR
 
+    async def iter_rows(
+        self,
+        table: str,
+        columns: list[str],
+        key: str,
+        chunk_size: int | None = None,
+        filters: dict[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Reads a whole table (or the rows matching ``filters``) in chunks.
+
+        Uses keyset pagination on ``key``: every request asks for the next
+        ``chunk_size`` rows with ``key`` greater than the last one seen, so
+        nothing gets cut off by PostgREST's ``max-rows`` cap and no request
+        has to skip over earlier rows the way an ``offset`` does. ``key`` must
+        be unique and not null (a primary key or unique column).
+
+        Errors are not handled here, they bubble up to the caller.
+
+        Accesses table : ``table``
+
+        Parameters
+        -----------
+        table : class:`str`
+            The table to read.
+        columns : list[class:`str`]
+            Columns to select. ``key`` is added to the request if missing and
+            stripped from the yielded rows again.
+        key : class:`str`
+            Unique column the rows are ordered and paginated by.
+        chunk_size : class:`int` | None
+            Rows per request, defaults to the handler's ``chunk_size``.
+        filters : dict[str, Any] | None
+            ``column: value`` equality filters.
+        timeout : class:`float` | None
+            Timeout (in seconds) for every single request.
+
+        Yields
+        -----------
+        list[dict[str, Any]]
+            The rows of one chunk, in ``key`` order.
+        """
+        chunk_size = max(1, chunk_size or self.chunk_size)
+        strip_key = key not in columns
+        selector = ", ".join([*columns, key] if strip_key else columns)
+        last_key = None
+
+        while True:
+            query = self.supabase_client.table(table).select(selector)
+            for column, value in (filters or {}).items():
+                query = query.eq(column, value)
+            if last_key is not None:
+                query = query.gt(key, last_key)
+            query = query.order(key).limit(chunk_size)
+
+            if timeout:
+                response = await asyncio.wait_for(query.execute(), timeout)
+            else:
+                response = await query.execute()
+            rows = response.data or []
+            if not rows:
+                return
+
+            last_key = rows[-1][key]
+            if strip_key:
+                for row in rows:
+                    row.pop(key, None)
+            yield rows
+
+            if len(rows) < chunk_size:
+                return
+
+    async def fetch_all_rows(
+        self,
+        table: str,
+        columns: list[str],
+        key: str,
+        filters: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """|coro|
+        Collects every chunk of :meth:`iter_rows` into one list.
+
+        Only for reads whose result is needed as a whole anyway (e.g. to
+        render it). Errors bubble up to the caller.
+        """
+        rows = []
+        async for chunk in self.iter_rows(table, columns, key, filters=filters):
+            rows.extend(chunk)
+        return rows
+
     # ------------------------------------------------------------------------------
     # Internal / Helper Methods
     # ------------------------------------------------------------------------------
@@ -1567,10 +2023,73 @@ class DatabaseHandler:
     # in this functions. I've let some bubble up while others are handled in place.
     # So if you are gonna use them,
 
+    async def _negate_flag(
+        self, flag: DiscordOsuColumn, discord_ids: list[int], location: str
+    ) -> set[int]:
+        if not discord_ids:
+            return set()
+        try:
+            response = await (
+                self.supabase_client.table(TableMiscellaneous.DISCORD_OSU)
+                .update({flag: False})
+                .in_(DiscordOsuColumn.DISCORD_ID, list(discord_ids))
+                .eq(flag, True)
+                .execute()
+            )
+            return {row[DiscordOsuColumn.DISCORD_ID] for row in response.data or []}
+        except Exception as e:
+            await self.log_handler.report_error(
+                location,
+                e,
+                f"Failed to negate {flag} for {len(discord_ids)} players",
+            )
+            return set()
+
+    @coalesced
+    async def _load_current_season(self) -> int | None:
+        # concurrent cache misses share one read
+        try:
+            response = (
+                await self.supabase_client.table(TableMiscellaneous.SEASONS)
+                .select(SeasonColumn.SEASON)
+                .eq(SeasonColumn.STATUS, SeasonStatus.ONGOING)
+                .maybe_single()
+                .execute()
+            )
+            if response and response.data:
+                self._set_current_season(response.data[SeasonColumn.SEASON])
+                return self._current_season
+            self._set_current_season(None)
+            await self.log_handler.report_info(
+                "Couldn't find any ongoing season. Please check if it doesn't sound right!"
+            )
+            return None
+        except Exception as error:
+            await self.log_handler.report_error(
+                "DatabaseHandler.get_current_season()",
+                error,
+                "Can't get stuff for current ongoing season.",
+            )
+            return None
+
+    def _set_current_season(self, season: int | None) -> None:
+        self._current_season = season
+        self._season_loaded_at = time.monotonic()
+
+    def _cache_identity(self, row: dict[str, Any]) -> None:
+        if row.get(DiscordOsuColumn.DISCORD_ID) is None:
+            return
+        self.identity_cache.put(
+            row[DiscordOsuColumn.DISCORD_ID],
+            osu_username=row.get(DiscordOsuColumn.OSU_USERNAME),
+            osu_id=row.get(DiscordOsuColumn.OSU_ID),
+        )
+
     async def _id_from_osu(self, osu_username: str):
+        # the whole identity is selected so the cache entry is complete
         return (
             await self.supabase_client.table(TableMiscellaneous.DISCORD_OSU)
-            .select(DiscordOsuColumn.DISCORD_ID)
+            .select(IDENTITY_COLUMNS)
             .eq(DiscordOsuColumn.OSU_USERNAME, osu_username)
             .execute()
         )
@@ -1578,7 +2097,7 @@ class DatabaseHandler:
     async def _id_from_discord(self, discord_username: str):
         return (
             await self.supabase_client.table(TableMiscellaneous.DISCORD_OSU)
-            .select(DiscordOsuColumn.DISCORD_ID)
+            .select(IDENTITY_COLUMNS)
             .eq(DiscordOsuColumn.DISCORD_USERNAME, discord_username)
             .execute()
         )
@@ -1586,7 +2105,7 @@ class DatabaseHandler:
     async def _osu_from_id(self, discord_id: int):
         return (
             await self.supabase_client.table(TableMiscellaneous.DISCORD_OSU)
-            .select(DiscordOsuColumn.OSU_USERNAME)
+            .select(IDENTITY_COLUMNS)
             .eq(DiscordOsuColumn.DISCORD_ID, discord_id)
             .execute()
         )
@@ -1603,30 +2122,50 @@ class DatabaseHandler:
     async def _fetch_league_data(
         self, table_name: str
     ) -> tuple[list[str], list[tuple[Any]]]:
-        query_selector = ", ".join(
-            [
-                LeagueColumn.OSU_USERNAME,
-                LeagueColumn.INITIAL_PP,
-                LeagueColumn.CURRENT_PP,
-                LeagueColumn.PP_CHANGE,
-                LeagueColumn.PERCENTAGE_CHANGE,
-                LeagueColumn.II,
-            ]
-        )
+        try:
+            rows = await self.fetch_all_rows(
+                table_name, LEAGUE_TABLE_COLUMNS, LeagueColumn.ID
+            )
+            # read in key order, shown by pp gained like the old "order by
+            # pp_change desc" (nulls first, ties keep key order)
+            rows.sort(
+                key=lambda row: (
+                    row.get(LeagueColumn.PP_CHANGE) is not None,
+                    -(row.get(LeagueColumn.PP_CHANGE) or 0),
+                )
+            )
+            if rows:
+                return await self._arrange_table(rows)
+        except Exception as error:
+            await self.log_handler.report_error(
+                f"DatabaseHandler._fetch_league_data({table_name})", error
+            )
+            return [], []
+
+    async def _fetch_league_page(
+        self, table_name: str, page: int, page_size: int
+    ) -> tuple[list[str], list[tuple[Any]], int] | FuncStatus:
+        start = page * page_size
         try:
             response = (
                 await self.supabase_client.table(table_name)
-                .select(query_selector)
+                .select(", ".join(LEAGUE_TABLE_COLUMNS), count="exact")
+                # osu_username breaks pp_change ties so pages never overlap
                 .order(LeagueColumn.PP_CHANGE, desc=True)
+                .order(LeagueColumn.OSU_USERNAME)
+                .range(start, start + page_size - 1)
                 .execute()
             )
-            if response and response.data:
-                return await self._arrange_table(response.data)
+            total = response.count or 0
+            if response.data:
+                headers, rows = await self._arrange_table(response.data)
+                return headers, rows, total
+            return [], [], total
         except Exception as error:
             await self.log_handler.report_error(
-                f"DatabaseHandler._fetch_league_data({table_name})", error
+                f"DatabaseHandler._fetch_league_page({table_name}, {page})", error
             )
-            return [], []
+            return FuncStatus.ERROR
 
     async def _check_in_challenge_tble(self, discord_id: int, tble_type: str):
         query_eq = ".".join([TablesRivals.RIVALS, RivalsColumn.CHALLENGE_STATUS])
@@ -1885,6 +2424,7 @@ class DatabaseHandler:
                 )
                 .execute()
             )
+            self._set_current_season(current_season)
             return current_season
         except Exception as error:
             await self.log_handler.report_error(
@@ -0,0 +1,147 @@
+"""
+In-process cache of the discord_id <-> osu_username <-> osu_id mapping.
+"""
+
+from __future__ import annotations
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class Identity:
+    discord_id: int
+    osu_username: str | None
+    osu_id: int | None
+    expires_at: float
+
+
+class IdentityCache:
+    """Bidirectional TTL + LRU cache of player identities.
+
+    Entries are keyed by ``discord_id`` (the only identifier that can't
+    change) with secondary indexes on ``osu_username`` and ``osu_id``, so a
+    lookup from any side is a dict hit. Only players that exist get cached,
+    a miss always goes to the database.
+
+    The cache is per process, so writes made by another process (the web
+    linker, the updater) only show up once the entry expires or gets
+    refreshed through :meth:`put`.
+
+    Parameters
+    -----------
+    max_size: :class:`int`
+        Maximum number of players kept, least recently used ones go first.
+    ttl: :class:`float`
+        Seconds an entry stays valid after it was stored.
+    """
+
+    def __init__(self, max_size: int = 2048, ttl: float = 300.0):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._entries: OrderedDict[int, Identity] = OrderedDict()
+        self._by_osu_username: dict[str, int] = {}
+        self._by_osu_id: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        discord_id: int | None = None,
+        osu_username: str | None = None,
+        osu_id: int | None = None,
+    ) -> Identity | None:
+        """Looks a player up by whichever identifier is given (one at a time)."""
+        if discord_id is None:
+            if osu_username is not None:
+                discord_id = self._by_osu_username.get(osu_username)
+            elif osu_id is not None:
+                discord_id = self._by_osu_id.get(osu_id)
+
+        entry = self._entries.get(discord_id) if discord_id is not None else None
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._drop(entry)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(discord_id)
+        self.hits += 1
+        return entry
+
+    def put(
+        self,
+        discord_id: int,
+        osu_username: str | None = None,
+        osu_id: int | None = None,
+    ) -> None:
+        """Stores (or refreshes) a player, unknown fields keep their old value.
+
+        A changed ``osu_username`` replaces the old one in the index, so a
+        username refresh never leaves the stale name pointing at the player.
+        """
+        old = self._entries.get(discord_id)
+        if old is not None:
+            self._drop(old)
+            osu_username = (
+                osu_username if osu_username is not None else old.osu_username
+            )
+            osu_id = osu_id if osu_id is not None else old.osu_id
+
+        entry = Identity(discord_id, osu_username, osu_id, time.monotonic() + self.ttl)
+        self._entries[discord_id] = entry
+        if osu_username is not None:
+            self._by_osu_username[osu_username] = discord_id
+        if osu_id is not None:
+            self._by_osu_id[osu_id] = discord_id
+
+        while len(self._entries) > self.max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self._unindex(evicted)
+
+    def invalidate(
+        self,
+        discord_id: int | None = None,
+        osu_username: str | None = None,
+        osu_id: int | None = None,
+    ) -> None:
+        """Forgets a player, by whichever identifier is known."""
+        if discord_id is None:
+            if osu_username is not None:
+                discord_id = self._by_osu_username.get(osu_username)
+            elif osu_id is not None:
+                discord_id = self._by_osu_id.get(osu_id)
+        entry = self._entries.get(discord_id) if discord_id is not None else None
+        if entry is not None:
+            self._drop(entry)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_osu_username.clear()
+        self._by_osu_id.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _drop(self, entry: Identity) -> None:
+        self._entries.pop(entry.discord_id, None)
+        self._unindex(entry)
+
+    def _unindex(self, entry: Identity) -> None:
+        # only remove index entries that still point at this player
+        if entry.osu_username is not None:
+            key = entry.osu_username
+            if self._by_osu_username.get(key) == entry.discord_id:
+                del self._by_osu_username[key]
+        if (
+            entry.osu_id is not None
+            and self._by_osu_id.get(entry.osu_id) == entry.discord_id
+        ):
+            del self._by_osu_id[entry.osu_id]
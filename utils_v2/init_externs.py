@@ -5,6 +5,7 @@ from supabase import AsyncClient
 from osu import AsynchronousAuthHandler, AsynchronousClient, Scope
 
 from utils_v2 import LogHandler
+from utils_v2.osuapi_handler import OsuAPI_Handler, OsuClientPool, PoolStrategy
 
 
 class InitExterns:
@@ -52,6 +53,16 @@ class InitExterns:
                     )
                     await asyncio.sleep(5)
 
+    async def close_supabase_client(self, client: AsyncClient) -> None:
+        """Closes the client's realtime channels and HTTP connections, for
+        clients made per event loop (the updater's passes)."""
+        try:
+            await client.remove_all_channels()
+            await client.postgrest.aclose()
+            await client.auth.close()
+        except Exception as e:
+            self.logger.error(f"Closing the Supabase client failed: {e}")
+
     async def setup_osu_client(
         self, osu_auth: AsynchronousAuthHandler
     ) -> AsynchronousClient:
@@ -120,3 +131,50 @@ class InitExterns:
                         "Retrying in 5 seconds..."
                     )
                     await asyncio.sleep(5)
+
+    async def setup_osu_pool(
+        self,
+        credentials: list[tuple[int, str]],
+        redirect_url: str,
+        requests_per_minute: int,
+        strategy: PoolStrategy | str = PoolStrategy.LEAST_LOADED,
+    ) -> OsuClientPool:
+        """Builds one auth handler, client and rate budget per credential pair.
+
+        An unknown ``strategy`` (a misspelled ``OSU_POOL_STRATEGY``) logs a
+        warning and falls back to ``least_loaded``.
+        """
+        try:
+            strategy = PoolStrategy(strategy)
+        except ValueError:
+            self.logger.warning(
+                f"Unknown osu! pool strategy '{strategy}', expected one of "
+                f"{', '.join(PoolStrategy)}. Using '{PoolStrategy.LEAST_LOADED}'."
+            )
+            strategy = PoolStrategy.LEAST_LOADED
+
+        self.logger.info("-------------------")
+        self.logger.info(
+            f"Creating Osu Client Pool ({len(credentials)} credentials)...."
+        )
+
+        handlers = []
+        for client_id, client_secret in credentials:
+            if not client_id or not client_secret:
+                continue
+            auth = await self.setup_osu_auth(client_id, client_secret, redirect_url)
+            client = await self.setup_osu_client(auth)
+            handlers.append(
+                OsuAPI_Handler(client, requests_per_minute=requests_per_minute)
+            )
+
+        if not handlers:
+            self.logger.critical(
+                "CRITICAL FAILURE: No usable osu! credentials for the client pool.\n"
+                "Shutting down..."
+            )
+            sys.exit(1)
+
+        self.logger.info(f"Osu Client Pool created with {len(handlers)} clients")
+        self.logger.info("-------------------")
+        return OsuClientPool(handlers, strategy)
@@ -1,13 +1,61 @@
+import asyncio
+import atexit
+import copy
 import logging
 import datetime
+import gzip
 import io
+import json
+import os
+import queue
+import shutil
+import time
 import traceback
 import discord
+from collections import deque
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Hashable
 from load_env import ENV
 import aiohttp
 
 
+@dataclass
+class _Report:
+    """One webhook embed waiting in :class:`LogHandler`'s queue."""
+
+    key: Hashable
+    username: str
+    embed: discord.Embed
+    attachment: tuple[str, bytes] | None = None
+    count: int = 1
+
+
+@dataclass
+class _Repeats:
+    """Reports with one fingerprint since the first of them was forwarded."""
+
+    started: float
+    kind: str
+    location: str
+    text: str
+    count: int = 0
+    # ends the window, set once there's something to summarise
+    timer: asyncio.TimerHandle | None = None
+
+
 class LogHandler:
+    # one webhook message holds at most 10 embeds, 6000 characters in total
+    MAX_EMBEDS = 10
+    MAX_EMBED_CHARS = 6000
+    # (messages, seconds): a webhook takes 5 requests per 2 s, and a channel
+    # about 30 messages a minute
+    RATE_LIMITS = ((5, 2.0), (30, 60.0))
+    # seconds close() waits for the queue to be shipped
+    FLUSH_TIMEOUT = 10.0
+    # fingerprints remembered before the expired ones are pruned
+    MAX_FINGERPRINTS = 1000
+
     class LoggingFormatter(logging.Formatter):
         black = "\x1b[30m"
         red = "\x1b[31m"
@@ -27,15 +75,110 @@ class LogHandler:
             logging.CRITICAL: red + bold,
         }
 
-        def format(self, record):
-            log_color = self.COLORS[record.levelno]
-            format = "(black){asctime}(reset) (levelcolor){levelname:<8}(reset) (green){name}(reset) {message}"
-            format = format.replace("(black)", self.black + self.bold)
+        FORMAT = "(black){asctime}(reset) (levelcolor){levelname:<8}(reset) (green){name}(reset) {message}"
+        DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+        def __init__(self):
+            super().__init__(datefmt=self.DATEFMT, style="{")
+            # one formatter per level, built once instead of for every record
+            self.formatters = {
+                level: self._build(color) for level, color in self.COLORS.items()
+            }
+            self.fallback = self._build(self.reset)
+
+        def _build(self, level_color: str) -> logging.Formatter:
+            format = self.FORMAT.replace("(black)", self.black + self.bold)
             format = format.replace("(reset)", self.reset)
-            format = format.replace("(levelcolor)", log_color)
+            format = format.replace("(levelcolor)", level_color)
             format = format.replace("(green)", self.green + self.bold)
-            formatter = logging.Formatter(format, "%Y-%m-%d %H:%M:%S", style="{")
-            return formatter.format(record)
+            return logging.Formatter(format, self.DATEFMT, style="{")
+
+        def format(self, record):
+            return self.formatters.get(record.levelno, self.fallback).format(record)
+
+    class LazyQueueHandler(QueueHandler):
+        """Queues records with only their message merged.
+
+        The message is merged with its arguments right away, like the stock
+        :meth:`QueueHandler.prepare` does: the arguments can be live objects
+        (discord.py logs gateway payload dicts at DEBUG) that change once the
+        call returns. The traceback text and the coloured line are left to
+        the listener's formatters, which still see ``exc_info``. Records
+        never leave the process, so nothing has to be made picklable.
+        """
+
+        def prepare(self, record):
+            # a copy, other handlers up the hierarchy get the original
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = None
+            return record
+
+    class JsonFormatter(logging.Formatter):
+        """One JSON object per line, for grepping and aggregating big logs."""
+
+        def format(self, record):
+            entry = {
+                "time": datetime.datetime.fromtimestamp(
+                    record.created, datetime.timezone.utc
+                ).isoformat(timespec="milliseconds"),
+                "level": record.levelname,
+                "logger": record.name,
+                "message": record.getMessage(),
+                "module": record.module,
+                "line": record.lineno,
+            }
+            # the traceback gets its own key, the message stays one line
+            if record.exc_info:
+                entry["exception"] = record.exc_text or self.formatException(
+                    record.exc_info
+                )
+            return json.dumps(entry, ensure_ascii=False, default=str)
+
+    class RotatingFile(RotatingFileHandler):
+        """Appends to ``filename`` and rotates it once it's ``max_bytes`` big
+        or ``max_age`` seconds old (since it was opened), whichever comes
+        first. ``backups`` rotated files are kept, gzipped with ``compress``.
+        A ``0`` size or age is no limit.
+
+        Rotation runs on the log listener's thread, never on the event loop.
+        """
+
+        def __init__(
+            self,
+            filename: str,
+            max_bytes: int,
+            max_age: float,
+            backups: int,
+            compress: bool = False,
+        ):
+            super().__init__(
+                filename,
+                mode="a",
+                maxBytes=max_bytes,
+                backupCount=max(1, backups),
+                encoding="utf-8",
+            )
+            self.max_age = max_age
+            self.opened_at = time.time()
+            if compress:
+                self.namer = lambda name: name + ".gz"
+                self.rotator = self._gzip
+
+        def shouldRollover(self, record):
+            if self.max_age and time.time() - self.opened_at >= self.max_age:
+                return True
+            return super().shouldRollover(record)
+
+        def doRollover(self):
+            super().doRollover()
+            self.opened_at = time.time()
+
+        @staticmethod
+        def _gzip(source: str, dest: str) -> None:
+            with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(source)
 
     def __init__(self, logger_name: str = "discord") -> None:
         self.logger_name = logger_name
@@ -44,7 +187,46 @@ class LogHandler:
         self._setup_handlers()
         self.webhook_url = ENV.LOGS_WEBHOOK
 
+        # one keep-alive session for every report, made on first use
+        self._session: aiohttp.ClientSession | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
+        self._webhook: discord.Webhook | None = None
+
+        # reports are shipped by a background task, reporting never waits
+        self.queue_size = max(1, ENV.LOG_QUEUE_SIZE)
+        self.batch_delay = max(0.0, ENV.LOG_BATCH_DELAY)
+        self.spill_file = ENV.LOG_SPILL_FILE
+        self._queue: asyncio.Queue[_Report] | None = None
+        self._queue_loop: asyncio.AbstractEventLoop | None = None
+        self._worker: asyncio.Task | None = None
+        self._pending: dict[Hashable, _Report] = {}
+        self._sent_at: deque[float] = deque(
+            maxlen=max(limit for limit, _ in self.RATE_LIMITS)
+        )
+
+        # repeats of a forwarded report are only counted for a while
+        self.dedup_window = max(0.0, ENV.LOG_DEDUP_WINDOW)
+        self._repeats: dict[Hashable, _Repeats] = {}
+
+        # stop sending while the webhook keeps failing
+        self.breaker_failures = max(1, ENV.LOG_BREAKER_FAILURES)
+        self.breaker_cooldown = max(0.0, ENV.LOG_BREAKER_COOLDOWN)
+        self._consecutive_failures = 0
+        self._breaker_until = 0.0
+
+        self.sent = 0
+        self.reports_sent = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.suppressed = 0
+        self.breaker_trips = 0
+        self.last_failure: str | None = None
+        self._send_time = 0.0
+
     def _setup_handlers(self) -> None:
+        self.listener: QueueListener | None = None
         # cuz we don't wanna clear logger for quart one
         if self.logger_name == "discord":
             self.logger.handlers.clear()
@@ -52,20 +234,59 @@ class LogHandler:
             return
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(self.LoggingFormatter())
-        file_handler = logging.FileHandler(
-            filename="discord.log", encoding="utf-8", mode="w"
+        # one file per process, they'd rotate each other's file otherwise
+        filename = (
+            "discord.log"
+            if self.logger_name == "discord"
+            else f"discord.{self.logger_name}.log"
         )
-        file_handler_formatter = logging.Formatter(
-            "[{asctime}] [{levelname:<8}] {name}: {message}",
-            "%Y-%m-%d %H:%M:%S",
-            style="{",
+        os.makedirs(ENV.LOG_DIR, exist_ok=True)
+        file_handler = self.RotatingFile(
+            os.path.join(ENV.LOG_DIR, filename),
+            max_bytes=int(ENV.LOG_FILE_MAX_MB * 1024 * 1024),
+            max_age=ENV.LOG_FILE_MAX_AGE * 3600,
+            backups=ENV.LOG_FILE_BACKUPS,
+            compress=ENV.LOG_FILE_GZIP,
         )
+        if ENV.LOG_FILE_FORMAT == "json":
+            file_handler_formatter = self.JsonFormatter()
+        else:
+            file_handler_formatter = logging.Formatter(
+                "[{asctime}] [{levelname:<8}] {name}: {message}",
+                "%Y-%m-%d %H:%M:%S",
+                style="{",
+            )
         file_handler.setFormatter(file_handler_formatter)
 
-        self.logger.addHandler(console_handler)
-        self.logger.addHandler(file_handler)
+        # tracebacks, colours and console/file writes happen on the listener's
+        # thread, logging from the event loop only merges the message and puts
+        # the record on a queue
+        log_queue = queue.SimpleQueue()
+        self.listener = QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        self.listener.start()
+        # stop() drains the queue, nothing logged right before exit is lost
+        atexit.register(self.stop_listener)
+        self.logger.addHandler(self.LazyQueueHandler(log_queue))
+
+    def stop_listener(self) -> None:
+        """Writes out what's still queued and stops the log listener thread,
+        safe to call more than once."""
+        listener, self.listener = self.listener, None
+        if listener:
+            listener.stop()
 
     async def report_error(self, location: str, error: Exception, msg: str = None):
+        # repeats are dropped before any formatting, they cost next to nothing
+        if not self._first_in_window(
+            self._fingerprint(location, error),
+            "error",
+            location,
+            f"{type(error).__name__}: {error}",
+        ):
+            return
+
         trace = "".join(
             traceback.format_exception(type(error), error, error.__traceback__)
         )
@@ -80,34 +301,37 @@ class LogHandler:
             )
             return
 
-        async with aiohttp.ClientSession() as session:
-            webhook = discord.Webhook.from_url(self.webhook_url, session=session)
-            embed = discord.Embed(
-                title="⚠️ System Error",
-                color=discord.Color.red(),
-                timestamp=datetime.datetime.now(datetime.timezone.utc),
-            )
-            embed.add_field(name="Location", value=f"`{location}`", inline=False)
-            embed.add_field(
-                name="Message", value=f"```py\n{str(error)[:1000]}```", inline=False
+        embed = discord.Embed(
+            title="⚠️ System Error",
+            color=discord.Color.red(),
+            timestamp=datetime.datetime.now(datetime.timezone.utc),
+        )
+        embed.add_field(name="Location", value=f"`{location}`", inline=False)
+        embed.add_field(
+            name="Message", value=f"```py\n{str(error)[:1000]}```", inline=False
+        )
+        if msg:
+            embed.add_field(name="Note :", value=f"\n{msg}")
+
+        attachment = None
+        if len(trace) > 1000:
+            attachment = ("traceback.txt", trace.encode())
+        else:
+            embed.add_field(name="Traceback", value=f"```py\n{trace}```", inline=False)
+
+        self._enqueue(
+            _Report(
+                key=("error", location, type(error).__name__, str(error), msg),
+                username="OsuArena Error",
+                embed=embed,
+                attachment=attachment,
             )
-            if msg:
-                embed.add_field(name="Note :", value=f"\n{msg}")
-
-            if len(trace) > 1000:
-                with io.BytesIO(trace.encode()) as f:
-                    await webhook.send(
-                        embed=embed,
-                        file=discord.File(f, filename="traceback.txt"),
-                        username="OsuArena Error",
-                    )
-            else:
-                embed.add_field(
-                    name="Traceback", value=f"```py\n{trace}```", inline=False
-                )
-                await webhook.send(embed=embed, username="OsuArena Error")
+        )
 
     async def report_info(self, message: str, title: str = "ℹ️ System Info"):
+        if not self._first_in_window(("info", title, message), "info", title, message):
+            return
+
         if hasattr(self, "logger"):
             self.logger.info(f"{title}: {message}")
         else:
@@ -116,23 +340,333 @@ class LogHandler:
         if not self.webhook_url:
             return
 
-        async with aiohttp.ClientSession() as session:
-            webhook = discord.Webhook.from_url(self.webhook_url, session=session)
+        embed = discord.Embed(
+            title=title,
+            color=discord.Color.blue(),
+            timestamp=datetime.datetime.now(datetime.timezone.utc),
+        )
+
+        attachment = None
+        if len(message) > 4000:
+            embed.description = "Message too long to display. See attached file."
+            attachment = ("info_log.txt", message.encode())
+        else:
+            embed.description = message
 
-            embed = discord.Embed(
-                title=title,
-                color=discord.Color.blue(),
-                timestamp=datetime.datetime.now(datetime.timezone.utc),
+        self._enqueue(
+            _Report(
+                key=("info", title, message),
+                username="OsuArena Info",
+                embed=embed,
+                attachment=attachment,
             )
+        )
 
-            if len(message) > 4000:
-                embed.description = "Message too long to display. See attached file."
-                with io.BytesIO(message.encode()) as f:
-                    await webhook.send(
-                        embed=embed,
-                        file=discord.File(f, filename="info_log.txt"),
-                        username="OsuArena Info",
+    def stats(self) -> dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "reports_sent": self.reports_sent,
+            "failed": self.failed,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "suppressed": self.suppressed,
+            "breaker": "open" if self._breaker_open() else "closed",
+            "breaker_trips": self.breaker_trips,
+            "avg_latency": self._send_time / self.sent if self.sent else 0.0,
+            "last_failure": self.last_failure,
+        }
+
+    async def close(self) -> None:
+        """|coro|
+        Ships what's still queued (up to ``FLUSH_TIMEOUT`` seconds), then
+        stops the worker and closes the webhook session. The next report
+        starts them again.
+
+        Open repeat windows are summarised now, their timers would otherwise
+        fire on a closing loop or die with it (the updater's loop ends with
+        every pass).
+        """
+        loop = asyncio.get_running_loop()
+        for fingerprint, repeats in list(self._repeats.items()):
+            self._end_window(fingerprint, repeats)
+        if self._worker and self._queue_loop is loop:
+            if not self._worker.done():
+                try:
+                    await asyncio.wait_for(self._queue.join(), self.FLUSH_TIMEOUT)
+                except asyncio.TimeoutError:
+                    self.logger.warning(
+                        f"LogHandler: {self._queue.qsize()} reports not shipped on close"
                     )
-            else:
-                embed.description = message
-                await webhook.send(embed=embed, username="OsuArena Info")
+            self._worker.cancel()
+        self._worker = self._queue = self._queue_loop = None
+        self._pending.clear()
+
+        session, self._session, self._webhook = self._session, None, None
+        if session and not session.closed and self._session_loop is loop:
+            await session.close()
+        self._session_loop = None
+
+    @staticmethod
+    def _fingerprint(location: str, error: BaseException) -> Hashable:
+        """Where it was reported, what was raised and the frame raising it,
+        the message is left out (it often has ids or timestamps in it)."""
+        tb = error.__traceback__
+        while tb is not None and tb.tb_next is not None:
+            tb = tb.tb_next
+        frame = (tb.tb_frame.f_code.co_filename, tb.tb_lineno) if tb else None
+        return ("error", location, type(error).__qualname__, frame)
+
+    def _first_in_window(
+        self, fingerprint: Hashable, kind: str, location: str, text: str
+    ) -> bool:
+        """``True`` when the report should go out, ``False`` for a repeat of
+        one forwarded less than ``dedup_window`` seconds ago. Repeats are
+        counted and summarised once the window ends."""
+        if self.dedup_window <= 0:
+            return True
+        now = time.monotonic()
+        repeats = self._repeats.get(fingerprint)
+        if repeats is not None and now - repeats.started < self.dedup_window:
+            repeats.count += 1
+            self.suppressed += 1
+            if repeats.count == 1:
+                repeats.timer = asyncio.get_running_loop().call_later(
+                    repeats.started + self.dedup_window - now,
+                    self._end_window,
+                    fingerprint,
+                    repeats,
+                )
+            return False
+
+        if repeats is not None:
+            self._end_window(fingerprint, repeats)
+        if len(self._repeats) >= self.MAX_FINGERPRINTS:
+            self._repeats = {
+                key: value
+                for key, value in self._repeats.items()
+                # windows with repeats are still waiting for their summary
+                if now - value.started < self.dedup_window or value.count
+            }
+        self._repeats[fingerprint] = _Repeats(now, kind, location, text)
+        return True
+
+    def _end_window(self, fingerprint: Hashable, repeats: _Repeats) -> None:
+        if self._repeats.get(fingerprint) is repeats:
+            del self._repeats[fingerprint]
+        if repeats.timer is not None:
+            repeats.timer.cancel()
+            repeats.timer = None
+        # may run twice (timer and next occurrence), only summarise once
+        count, repeats.count = repeats.count, 0
+        if not count:
+            return
+
+        # shorter than the window when close() ends it early
+        window = min(self.dedup_window, time.monotonic() - repeats.started)
+        span = (
+            f"{window / 60:.0f} min" if window >= 60 else f"{max(1, round(window))} s"
+        )
+        summary = f"x{count + 1} in last {span}"
+        self.logger.warning(
+            f"{repeats.location} : {repeats.text} {summary} ({count} suppressed)"
+        )
+        if not self.webhook_url:
+            return
+
+        error = repeats.kind == "error"
+        embed = discord.Embed(
+            title="🔁 Repeated Error" if error else "🔁 Repeated Info",
+            color=discord.Color.red() if error else discord.Color.blue(),
+            timestamp=datetime.datetime.now(datetime.timezone.utc),
+        )
+        embed.add_field(
+            name="Location" if error else "Title",
+            value=f"`{repeats.location}`",
+            inline=False,
+        )
+        embed.add_field(
+            name="Message", value=f"```py\n{repeats.text[:1000]}```", inline=False
+        )
+        embed.add_field(name="Count", value=summary, inline=False)
+        self._enqueue(
+            _Report(
+                key=("repeats", fingerprint),
+                username="OsuArena Error" if error else "OsuArena Info",
+                embed=embed,
+            )
+        )
+
+    def _enqueue(self, report: _Report) -> None:
+        queue = self._ensure_worker()
+        # the same report still waiting to go out just gets counted
+        if (pending := self._pending.get(report.key)) is not None:
+            pending.count += 1
+            self.coalesced += 1
+            return
+        try:
+            queue.put_nowait(report)
+        except asyncio.QueueFull:
+            self._overflow(report)
+            return
+        self._pending[report.key] = report
+
+    def _ensure_worker(self) -> asyncio.Queue[_Report]:
+        loop = asyncio.get_running_loop()
+        # queues are bound to their loop too, same as the session
+        if self._worker is None or self._worker.done() or self._queue_loop is not loop:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._queue_loop = loop
+            self._pending.clear()
+            self._worker = loop.create_task(self._ship(self._queue), name="log-shipper")
+        return self._queue
+
+    def _overflow(self, report: _Report) -> None:
+        if not self.spill_file:
+            self.dropped += 1
+            return
+        line = {
+            "spilled_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "username": report.username,
+            "count": report.count,
+            "embed": report.embed.to_dict(),
+        }
+        if report.attachment:
+            line["attachment"] = report.attachment[1].decode(errors="replace")
+        try:
+            with open(self.spill_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(line, default=str) + "\n")
+            self.spilled += 1
+        except OSError:
+            self.dropped += 1
+
+    async def _ship(self, queue: asyncio.Queue[_Report]) -> None:
+        while True:
+            batch = [await queue.get()]
+            try:
+                # let a burst pile up behind the first report, it goes out
+                # in as few messages as possible and repeats get counted
+                await asyncio.sleep(self.batch_delay)
+                while True:
+                    try:
+                        batch.append(queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                for report in batch:
+                    if self._pending.get(report.key) is report:
+                        del self._pending[report.key]
+
+                for message in self._messages(batch):
+                    if self._breaker_open():
+                        # the webhook is failing, don't pile requests onto it
+                        for report in message:
+                            self._overflow(report)
+                        continue
+                    await self._wait_rate_limit()
+                    await self._send_batch(message)
+            except Exception as error:
+                self.logger.warning(f"LogHandler: failed to ship reports: {error}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _messages(self, batch: list[_Report]) -> list[list[_Report]]:
+        """Splits a batch into webhook messages, keeping the order."""
+        messages: list[list[_Report]] = []
+        current: list[_Report] = []
+        chars = 0
+        for report in batch:
+            if report.count > 1:
+                report.embed.set_footer(text=f"Repeated x{report.count}")
+            size = len(report.embed)
+            if current and (
+                report.username != current[0].username
+                or len(current) >= self.MAX_EMBEDS
+                or chars + size > self.MAX_EMBED_CHARS
+            ):
+                messages.append(current)
+                current, chars = [], 0
+            current.append(report)
+            chars += size
+        if current:
+            messages.append(current)
+        return messages
+
+    async def _wait_rate_limit(self) -> None:
+        while True:
+            now = time.monotonic()
+            delay = 0.0
+            for limit, period in self.RATE_LIMITS:
+                if len(self._sent_at) >= limit:
+                    delay = max(delay, self._sent_at[-limit] + period - now)
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+        self._sent_at.append(time.monotonic())
+
+    async def _send_batch(self, reports: list[_Report]) -> None:
+        kwargs: dict[str, Any] = {
+            "embeds": [report.embed for report in reports],
+            "username": reports[0].username,
+        }
+        attachments = [report.attachment for report in reports if report.attachment]
+        if attachments:
+            # numbered, several reports may attach a "traceback.txt"
+            kwargs["files"] = [
+                discord.File(
+                    io.BytesIO(data),
+                    filename=name if len(attachments) == 1 else f"{i}_{name}",
+                )
+                for i, (name, data) in enumerate(attachments, 1)
+            ]
+        if await self._send(**kwargs):
+            self.reports_sent += len(reports)
+
+    async def _send(self, **kwargs) -> bool:
+        """Sends one webhook message, a failed send is counted and logged
+        here instead of being raised into the reporting code."""
+        start = time.perf_counter()
+        try:
+            await self._get_webhook().send(**kwargs)
+        except Exception as error:
+            self.failed += 1
+            self.last_failure = f"{type(error).__name__}: {error}"
+            self.logger.warning(f"LogHandler: webhook send failed: {error}")
+            self._consecutive_failures += 1
+            # also re-opens right away when the one send after a cooldown fails
+            if self._consecutive_failures >= self.breaker_failures:
+                self._breaker_until = time.monotonic() + self.breaker_cooldown
+                self.breaker_trips += 1
+                self.logger.warning(
+                    f"LogHandler: webhook failed {self._consecutive_failures} times "
+                    f"in a row, not sending for {self.breaker_cooldown:g}s"
+                )
+            return False
+        if self._consecutive_failures >= self.breaker_failures:
+            self.logger.info("LogHandler: webhook is back, sending again")
+        self._consecutive_failures = 0
+        self.sent += 1
+        self._send_time += time.perf_counter() - start
+        return True
+
+    def _breaker_open(self) -> bool:
+        return time.monotonic() < self._breaker_until
+
+    def _get_webhook(self) -> discord.Webhook:
+        loop = asyncio.get_running_loop()
+        # sessions are bound to their loop, the updater runs a new loop per pass
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+        ):
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=15),
+            )
+            self._session_loop = loop
+            self._webhook = discord.Webhook.from_url(
+                self.webhook_url, session=self._session
+            )
+        return self._webhook
@@ -1,12 +1,341 @@
 from __future__ import annotations
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum, StrEnum
+from typing import Any, Awaitable, Callable
+
 from osu import AsynchronousClient
-from typing import TYPE_CHECKING
 
-if TYPE_CHECKING:
-    from bot import OsuArena
+
+class RequestPriority(IntEnum):
+    # lower value gets served first
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class TokenBucket:
+    """Classic token bucket, refilled continuously at ``rate_per_minute``.
+
+    ``burst`` is the bucket size, i.e. how many requests can go out back to
+    back after an idle period.
+    """
+
+    def __init__(self, rate_per_minute: int, burst: int | None = None):
+        self.rate = rate_per_minute / 60
+        self.capacity = float(burst if burst else max(1, rate_per_minute // 6))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def try_acquire(self) -> float:
+        """Takes a token if one is available.
+
+        Returns ``0`` on success, otherwise the seconds until the next token.
+        """
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def refund(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + 1)
 
 
 class OsuAPI_Handler:
-    def __init__(self, bot: OsuArena, osu_client: AsynchronousClient) -> None:
-        self.bot = bot
+    """Rate limited front for an :class:`osu.AsynchronousClient`.
+
+    Every osu! API call of the bot, the web linker and the updater should go
+    through one of these instead of hitting the client directly. Requests
+    wait for a token from a shared :class:`TokenBucket` and waiting requests
+    are served by :class:`RequestPriority` first (interactive commands before
+    background refreshes), then in arrival order.
+
+    Parameters
+    -----------
+    osu_client: :class:`osu.AsynchronousClient`
+        The client all requests are sent through.
+    requests_per_minute: :class:`int`
+        Sustained request budget.
+    burst: :class:`int` | None
+        Bucket size, defaults to a tenth of a minute's budget.
+    """
+
+    def __init__(
+        self,
+        osu_client: AsynchronousClient,
+        requests_per_minute: int = 60,
+        burst: int | None = None,
+    ) -> None:
         self.osu_client = osu_client
+        self.bucket = TokenBucket(requests_per_minute, burst)
+
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+
+        self._requests = {priority: 0 for priority in RequestPriority}
+        self._max_depth = {priority: 0 for priority in RequestPriority}
+        self._wait_total = {priority: 0.0 for priority in RequestPriority}
+        self._in_flight = 0
+        self._errors = 0
+        self._rate_limited = 0
+
+    # ------------------------------------------------------------------
+    # Wrapped endpoints
+    # ------------------------------------------------------------------
+
+    async def get_user(
+        self,
+        user,
+        mode=None,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        timeout: float | None = None,
+    ):
+        return await self.call(
+            self.osu_client.get_user, user, mode, priority=priority, timeout=timeout
+        )
+
+    async def get_user_scores(
+        self,
+        user,
+        type,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        timeout: float | None = None,
+        **kwargs,
+    ):
+        return await self.call(
+            self.osu_client.get_user_scores,
+            user,
+            type,
+            priority=priority,
+            timeout=timeout,
+            **kwargs,
+        )
+
+    async def get_score_by_id_only(
+        self,
+        score_id: int,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        timeout: float | None = None,
+    ):
+        return await self.call(
+            self.osu_client.get_score_by_id_only,
+            score_id,
+            priority=priority,
+            timeout=timeout,
+        )
+
+    async def call(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        *args,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        timeout: float | None = None,
+        **kwargs,
+    ) -> Any:
+        """|coro|
+        Waits for a token, then awaits ``func(*args, **kwargs)``.
+
+        ``func`` doesn't have to belong to :attr:`osu_client`, so one-off
+        clients (e.g. the OAuth one made in the web linker) can still share
+        this handler's budget.
+
+        ``timeout`` (seconds) only covers the request itself, not the time
+        spent waiting for a token, a busy limiter never times a call out.
+        """
+        await self._acquire(priority)
+        self._in_flight += 1
+        try:
+            return await asyncio.wait_for(func(*args, **kwargs), timeout)
+        except Exception as error:
+            self._errors += 1
+            if getattr(error, "status", None) == 429:
+                self._rate_limited += 1
+            raise
+        finally:
+            self._in_flight -= 1
+
+    @property
+    def load(self) -> int:
+        """Requests currently queued or in flight."""
+        return len(self._waiters) + self._in_flight
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth and usage counters, per priority lane."""
+        depth = {priority: 0 for priority in RequestPriority}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                depth[RequestPriority(priority)] += 1
+
+        return {
+            "tokens": round(self.bucket.tokens, 2),
+            "in_flight": self._in_flight,
+            "errors": self._errors,
+            "rate_limited": self._rate_limited,
+            "lanes": {
+                priority.name.lower(): {
+                    "queued": depth[priority],
+                    "max_queued": self._max_depth[priority],
+                    "requests": self._requests[priority],
+                    "avg_wait": (
+                        self._wait_total[priority] / self._requests[priority]
+                        if self._requests[priority]
+                        else 0.0
+                    ),
+                }
+                for priority in RequestPriority
+            },
+        }
+
+    async def close(self) -> None:
+        """|coro|
+        Stops the dispatcher and cancels the requests still waiting for a
+        token, for handlers made per event loop (the updater's passes).
+
+        :class:`osu.AsynchronousClient` opens a session per request, so there
+        are no connections left to close.
+        """
+        for _, _, future in self._waiters:
+            future.cancel()
+        self._waiters.clear()
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _acquire(self, priority: RequestPriority) -> None:
+        start = time.monotonic()
+        if not self._waiters and self.bucket.try_acquire() == 0:
+            self._record(priority, start)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        depth = sum(1 for lane, _, _ in self._waiters if lane == priority)
+        self._max_depth[priority] = max(self._max_depth[priority], depth)
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        await future
+        self._record(priority, start)
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            wait = self.bucket.try_acquire()
+            if wait:
+                await asyncio.sleep(wait)
+                continue
+
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                # waiter got cancelled, give the token to the next one
+                self.bucket.refund()
+                continue
+            future.set_result(None)
+
+    def _record(self, priority: RequestPriority, start: float) -> None:
+        self._requests[priority] += 1
+        self._wait_total[priority] += time.monotonic() - start
+
+
+class PoolStrategy(StrEnum):
+    ROUND_ROBIN = "round_robin"
+    LEAST_LOADED = "least_loaded"
+
+
+class OsuClientPool:
+    """Spreads requests over several :class:`OsuAPI_Handler`, one per osu!
+    application (credential pair).
+
+    Each handler owns its own client, auth handler (so its own token refresh)
+    and token bucket, so the total budget grows with the number of registered
+    apps. Meant for background fetches; it exposes the same endpoints as
+    :class:`OsuAPI_Handler` so the two are interchangeable for callers.
+
+    Parameters
+    -----------
+    handlers: list[:class:`OsuAPI_Handler`]
+        One handler per credential. Must not be empty.
+    strategy: :class:`PoolStrategy`
+        ``round_robin`` cycles through the handlers, ``least_loaded`` picks
+        the one with the fewest queued + in flight requests.
+    """
+
+    def __init__(
+        self,
+        handlers: list[OsuAPI_Handler],
+        strategy: PoolStrategy = PoolStrategy.LEAST_LOADED,
+    ) -> None:
+        if not handlers:
+            raise ValueError("OsuClientPool needs at least one handler")
+        self.handlers = handlers
+        self.strategy = PoolStrategy(strategy)
+        self._next = itertools.cycle(range(len(handlers)))
+
+    async def get_user(
+        self,
+        user,
+        mode=None,
+        priority: RequestPriority = RequestPriority.BACKGROUND,
+        timeout: float | None = None,
+    ):
+        return await self._pick().get_user(
+            user, mode, priority=priority, timeout=timeout
+        )
+
+    async def get_user_scores(
+        self,
+        user,
+        type,
+        priority: RequestPriority = RequestPriority.BACKGROUND,
+        timeout: float | None = None,
+        **kwargs,
+    ):
+        return await self._pick().get_user_scores(
+            user, type, priority=priority, timeout=timeout, **kwargs
+        )
+
+    async def get_score_by_id_only(
+        self,
+        score_id: int,
+        priority: RequestPriority = RequestPriority.BACKGROUND,
+        timeout: float | None = None,
+    ):
+        return await self._pick().get_score_by_id_only(
+            score_id, priority=priority, timeout=timeout
+        )
+
+    async def close(self) -> None:
+        for handler in self.handlers:
+            await handler.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "strategy": self.strategy.value,
+            "clients": [handler.stats() for handler in self.handlers],
+        }
+
+    def _pick(self) -> OsuAPI_Handler:
+        if self.strategy == PoolStrategy.ROUND_ROBIN:
+            return self.handlers[next(self._next)]
+        # ties go to the one with more tokens left
+        return min(
+            self.handlers, key=lambda handler: (handler.load, -handler.bucket.tokens)
+        )
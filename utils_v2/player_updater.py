@@ -0,0 +1,277 @@
+"""
+Background pp/rank/top play refresher for every linked player.
+Used by the supaabse.py worker, runs every player concurrently (bounded).
+"""
+
+from __future__ import annotations
+import asyncio
+import sys
+import time
+from typing import Any, AsyncIterator
+
+from osu import GameModeStr, SoloScore, UserScoreType
+from supabase import AsyncClient
+
+from utils_v2.db_handler import DatabaseHandler
+from utils_v2.log_handler import LogHandler
+from utils_v2.osuapi_handler import OsuAPI_Handler, OsuClientPool, RequestPriority
+
+from .enums import DiscordOsuColumn, TableMiscellaneous
+
+LEAGUE_MODES = {
+    1000: "master",
+    3000: "elite",
+    10000: "diamond",
+    30000: "platinum",
+    80000: "gold",
+    150000: "silver",
+    250000: "bronze",
+    sys.maxsize: "novice",
+}
+
+
+class PlayerUpdater:
+    """Refreshes osu! stats and top plays for every row in discord_osu.
+
+    Each player is processed in its own task, with at most ``concurrency``
+    players in flight at once. Every osu! API call and Supabase write is
+    bounded by ``request_timeout`` so one stuck request can't hold the pass.
+    For osu! calls that's the request itself, waiting for a rate limit token
+    doesn't count.
+
+    Parameters
+    -----------
+    log_handler: :class:`LogHandler`
+        The logger used for error handling and reporting the pass summary.
+    supabase_client: :class:`supabase.AsyncClient`
+        The asynchronous client used to communicate with the Supabase API.
+    osu_api: :class:`OsuAPI_Handler` | :class:`OsuClientPool`
+        The rate limited osu! client (or pool of them) used to fetch player data.
+    concurrency: :class:`int`
+        Maximum number of players processed at the same time.
+    request_timeout: :class:`float`
+        Timeout (in seconds) for every single osu!/Supabase request.
+    chunk_size: :class:`int`
+        Players read from discord_osu per request. Players are refreshed a
+        chunk at a time, so memory doesn't grow with the table.
+    """
+
+    def __init__(
+        self,
+        log_handler: LogHandler,
+        supabase_client: AsyncClient,
+        osu_api: OsuAPI_Handler | OsuClientPool,
+        concurrency: int = 8,
+        request_timeout: float = 15.0,
+        chunk_size: int = 1000,
+    ):
+        self.log_handler = log_handler
+        self.logger = log_handler.logger
+        self.supabase_client = supabase_client
+        self.osu_api = osu_api
+        self.concurrency = max(1, concurrency)
+        self.request_timeout = request_timeout
+        self.db_handler = DatabaseHandler(
+            log_handler, supabase_client, chunk_size=chunk_size
+        )
+
+    async def run(self) -> dict[str, float]:
+        """|coro|
+        Runs one full refresh pass over the discord_osu table.
+
+        Returns
+        -----------
+        dict[str, float]
+            Pass summary with ``players``, ``failed``, ``duration`` (seconds)
+            and ``players_per_sec``.
+        """
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(user: dict[str, Any]) -> bool:
+            async with semaphore:
+                return await self._update_one(user)
+
+        players = 0
+        failed = 0
+        async for users in self._fetch_users():
+            results = await asyncio.gather(
+                *(bounded(user) for user in users), return_exceptions=True
+            )
+            players += len(users)
+            failed += sum(1 for result in results if result is not True)
+
+        if not players:
+            self.logger.info("No users found in the discord_osu table.")
+            return {"players": 0, "failed": 0, "duration": 0.0, "players_per_sec": 0.0}
+
+        duration = time.perf_counter() - start
+        rate = players / duration if duration > 0 else 0.0
+        await self.log_handler.report_info(
+            f"Refreshed {players} players ({failed} failed) in {duration:.1f}s "
+            f"({rate:.2f} players/sec, concurrency {self.concurrency}).",
+            "Player Update Pass",
+        )
+        return {
+            "players": players,
+            "failed": failed,
+            "duration": duration,
+            "players_per_sec": rate,
+        }
+
+    async def _fetch_users(self) -> AsyncIterator[list[dict[str, Any]]]:
+        # a failed read ends the pass early, players already read are kept
+        query_selector = [
+            DiscordOsuColumn.OSU_ID,
+            DiscordOsuColumn.TOP_PLAY_ID,
+            DiscordOsuColumn.TOP_PLAY_PP,
+            DiscordOsuColumn.CURRENT_PP,
+            DiscordOsuColumn.II,
+        ]
+        try:
+            async for users in self.db_handler.iter_rows(
+                TableMiscellaneous.DISCORD_OSU,
+                query_selector,
+                DiscordOsuColumn.DISCORD_ID,
+                timeout=self.request_timeout,
+            ):
+                yield users
+        except Exception as error:
+            await self.log_handler.report_error("PlayerUpdater._fetch_users()", error)
+
+    async def _update_one(self, user: dict[str, Any]) -> bool:
+        osu_id = user.get(DiscordOsuColumn.OSU_ID)
+        if not osu_id:
+            return False
+
+        top_play_id = user.get(DiscordOsuColumn.TOP_PLAY_ID)
+        top_play_pp = user.get(DiscordOsuColumn.TOP_PLAY_PP)
+        current_pp = user.get(DiscordOsuColumn.CURRENT_PP)
+        current_ii = user.get(DiscordOsuColumn.II, 0)
+
+        data, top_play_data = await asyncio.gather(
+            self._get_user_data(osu_id), self._get_top_play(osu_id)
+        )
+
+        success = data is not None
+        if data is not None:
+            _, _, pp, ii = data
+            if current_pp != pp or current_ii != ii:
+                success = await self._update_scores(data, osu_id)
+
+        if top_play_data is not None:
+            _, _, _, score_id = top_play_data
+            if score_id != top_play_id:
+                # first time player so no announcement
+                announce = top_play_id is not None
+                success = (
+                    await self._update_top_plays(
+                        top_play_data, osu_id, top_play_pp, announce
+                    )
+                    and success
+                )
+
+        return success
+
+    async def _get_user_data(self, osu_id: int) -> tuple[str, int, int, float] | None:
+        try:
+            user = await self.osu_api.get_user(
+                osu_id,
+                GameModeStr.STANDARD,
+                priority=RequestPriority.BACKGROUND,
+                timeout=self.request_timeout,
+            )
+            pp = round(user.statistics.pp)
+            hours_played = user.statistics.play_time / 3600
+            ii = self._get_ii(pp, hours_played)
+            return user.username, user.statistics.global_rank, pp, ii
+        except Exception as error:
+            self.logger.error(f"Error fetching data for {osu_id}: {error}")
+            return None
+
+    async def _get_top_play(self, osu_id: int) -> tuple[str, Any, float, int] | None:
+        try:
+            top_scores = await self.osu_api.get_user_scores(
+                osu_id,
+                UserScoreType.BEST,
+                priority=RequestPriority.BACKGROUND,
+                timeout=self.request_timeout,
+                mode=GameModeStr.STANDARD,
+                limit=1,
+            )
+            for score in top_scores or []:
+                date = (
+                    score.ended_at if isinstance(score, SoloScore) else score.created_at
+                )
+                return score.beatmapset.title, date, score.pp, score.id
+        except Exception as error:
+            self.logger.error(f"Error fetching top play for {osu_id}: {error}")
+        return None
+
+    async def _update_scores(self, data: tuple, osu_id: int) -> bool:
+        username, rank, pp, ii = data
+        league = "Unranked"
+        if rank is not None:
+            for threshold, league_try in LEAGUE_MODES.items():
+                if rank < threshold:
+                    league = league_try
+                    break
+        try:
+            await asyncio.wait_for(
+                self.supabase_client.table(TableMiscellaneous.DISCORD_OSU)
+                .update(
+                    {
+                        DiscordOsuColumn.CURRENT_PP: pp,
+                        DiscordOsuColumn.OSU_USERNAME: username,
+                        DiscordOsuColumn.GLOBAL_RANK: rank,
+                        DiscordOsuColumn.FUTURE_LEAGUE: league,
+                        DiscordOsuColumn.II: ii,
+                    }
+                )
+                .eq(DiscordOsuColumn.OSU_ID, osu_id)
+                .execute(),
+                self.request_timeout,
+            )
+            self.logger.debug(
+                f"{username}'s osu! pp: {pp}, rank: {rank} updated. League: {league}"
+            )
+            return True
+        except Exception as error:
+            self.logger.error(f"Failed to update {osu_id}: {error}")
+            return False
+
+    async def _update_top_plays(
+        self, top_play_data: tuple, osu_id: int, top_play_pp: int, announce: bool
+    ) -> bool:
+        title, date, p_points, score_id = top_play_data
+        update_payload = {
+            DiscordOsuColumn.TOP_PLAY_MAP: title,
+            DiscordOsuColumn.TOP_PLAY_PP: int(p_points) if p_points else 0,
+            DiscordOsuColumn.TOP_PLAY_DATE: date.isoformat(),
+            DiscordOsuColumn.TOP_PLAY_ID: score_id,
+            DiscordOsuColumn.PREV_TOP_PP: top_play_pp,
+        }
+        if announce:
+            update_payload[DiscordOsuColumn.TOP_PLAY_ANNOUNCE] = True
+
+        try:
+            await asyncio.wait_for(
+                self.supabase_client.table(TableMiscellaneous.DISCORD_OSU)
+                .update(update_payload)
+                .eq(DiscordOsuColumn.OSU_ID, osu_id)
+                .execute(),
+                self.request_timeout,
+            )
+            self.logger.debug(f"Updated top play for {osu_id}, with {title} {p_points}")
+            return True
+        except Exception as error:
+            self.logger.error(f"Error updating top play for {osu_id}: {error}")
+            return False
+
+    @staticmethod
+    def _get_ii(pp, hours):
+        numerator = -12 + 0.0781 * pp + 6.01e-6 * (pp**2)
+        if hours == 0:
+            return 0
+        ii = round(numerator / hours, 2)
+        return ii
@@ -0,0 +1,156 @@
+"""
+Cache for rendered leaderboard images, keyed by a hash of what was drawn.
+"""
+
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Sequence
+
+
+class RenderCache:
+    """Two tier (memory + optional disk) cache of rendered PNG bytes.
+
+    The memory tier is an LRU bounded by total size. Entries stored with
+    ``permanent=True`` (immutable data, e.g. archived seasons) are pinned in
+    memory and never pruned from disk. The disk tier is only used when
+    ``disk_dir`` is set, it survives restarts and keeps at most
+    ``max_disk_files`` non permanent images.
+
+    Parameters
+    -----------
+    max_bytes: :class:`int`
+        Size budget of the non permanent part of the memory tier.
+    disk_dir: :class:`str` | None
+        Directory for the disk tier, ``None`` to keep everything in memory.
+    max_disk_files: :class:`int`
+        Maximum number of non permanent images kept on disk.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_dir: str | None = None,
+        max_disk_files: int = 500,
+    ):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_files = max_disk_files
+
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._pinned: dict[str, bytes] = {}
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if disk_dir:
+            os.makedirs(os.path.join(disk_dir, "permanent"), exist_ok=True)
+            os.makedirs(os.path.join(disk_dir, "lru"), exist_ok=True)
+
+    @staticmethod
+    def make_key(
+        headers: Sequence[str], rows: Sequence[Sequence[Any]], style: Any
+    ) -> str:
+        """sha256 over the table content and everything that affects its look."""
+        payload = json.dumps(
+            [list(headers), [list(row) for row in rows], style],
+            default=str,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> bytes | None:
+        if (data := self._pinned.get(key)) is not None:
+            self.hits += 1
+            return data
+        if (data := self._memory.get(key)) is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return data
+
+        if self.disk_dir:
+            for permanent in (True, False):
+                path = self._path(key, permanent)
+                data = await asyncio.to_thread(self._read, path)
+                if data is not None:
+                    self.disk_hits += 1
+                    self._remember(key, data, permanent)
+                    return data
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, data: bytes, permanent: bool = False) -> None:
+        self._remember(key, data, permanent)
+        if self.disk_dir:
+            await asyncio.to_thread(self._write, self._path(key, permanent), data)
+            if not permanent:
+                await asyncio.to_thread(self._prune_disk)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "pinned": len(self._pinned),
+            "memory_bytes": self._memory_bytes
+            + sum(len(data) for data in self._pinned.values()),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+    def _remember(self, key: str, data: bytes, permanent: bool) -> None:
+        if permanent:
+            self._pinned[key] = data
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _path(self, key: str, permanent: bool) -> str:
+        return os.path.join(
+            self.disk_dir, "permanent" if permanent else "lru", f"{key}.png"
+        )
+
+    @staticmethod
+    def _read(path: str) -> bytes | None:
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            # bump mtime so disk pruning is least recently used too
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        # write then rename so a reader never sees half a file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+
+    def _prune_disk(self) -> None:
+        lru_dir = os.path.join(self.disk_dir, "lru")
+        entries = [
+            entry for entry in os.scandir(lru_dir) if entry.name.endswith(".png")
+        ]
+        if len(entries) <= self.max_disk_files:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[: len(entries) - self.max_disk_files]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,153 @@
+"""
+Leaderboard rendering off the event loop.
+
+The ``draw_leaderboard*`` backends live in the top level ``leaderboard_draw``
+module so a worker process can unpickle them without importing this
+package, :class:`RenderPool` runs them there.
+"""
+
+from __future__ import annotations
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+
+class RenderQueueFull(Exception):
+    """Raised when :class:`RenderPool` already has ``max_pending`` jobs."""
+
+
+class RenderPool:
+    """Runs render functions in a pool of worker processes.
+
+    matplotlib isn't thread safe and rendering is CPU bound, so it goes to
+    processes, not threads. Workers are started with ``spawn`` so they don't
+    inherit the bot's event loop, sockets and threads through ``fork``.
+
+    At most ``max_pending`` jobs are queued or running at once, any more are
+    rejected with :class:`RenderQueueFull` right away instead of piling up.
+    A job that takes longer than ``timeout`` raises :class:`TimeoutError`
+    for the caller and the pool is recycled: its workers are terminated so a
+    hung render can't hold a slot, the jobs still in it fail and the next one
+    starts a fresh pool (same as after a worker crash).
+
+    Parameters
+    -----------
+    workers: :class:`int`
+        Number of worker processes.
+    max_pending: :class:`int`
+        Jobs allowed in the pool (queued + running) at the same time.
+    timeout: :class:`float`
+        Seconds a caller waits for one job.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 8, timeout: float = 30.0):
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self.timeout = timeout
+
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._busy_time = 0.0
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """|coro|
+        Runs ``func(*args)`` in a worker process and returns its result.
+
+        Raises
+        -------
+        RenderQueueFull
+            ``max_pending`` jobs are already in the pool.
+        TimeoutError
+            The job didn't finish within ``timeout``.
+        """
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise RenderQueueFull(f"{self._pending} render jobs already pending")
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        self._pending += 1
+        try:
+            executor = self._get_executor()
+            future = loop.run_in_executor(executor, func, *args)
+        except Exception:
+            self._pending -= 1
+            raise
+        # the slot is freed when the job ends, including when it fails
+        # because its pool got recycled
+        future.add_done_callback(self._job_done)
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._reset_executor(executor, terminate=True)
+            raise
+        except BrokenProcessPool:
+            # a worker died (or the pool was recycled), the next job gets a
+            # fresh pool
+            self.failed += 1
+            self._reset_executor(executor)
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+
+        self.completed += 1
+        self._busy_time += time.perf_counter() - start
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "avg_duration": self._busy_time / self.completed if self.completed else 0.0,
+        }
+
+    def close(self) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _job_done(self, future: asyncio.Future) -> None:
+        self._pending -= 1
+        if not future.cancelled():
+            # nobody awaits a timed out job anymore, don't let its error
+            # be logged as never retrieved
+            future.exception()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _reset_executor(
+        self, executor: ProcessPoolExecutor, terminate: bool = False
+    ) -> None:
+        """Drops ``executor`` if it's still the current one, terminating its
+        workers first with ``terminate`` (for a hung job, which ``shutdown``
+        alone would wait on forever)."""
+        if self._executor is not executor:
+            # an older pool, already replaced by another job
+            return
+        self._executor = None
+        processes = list((executor._processes or {}).values()) if terminate else []
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
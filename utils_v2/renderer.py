@@ -1,16 +1,18 @@
 from __future__ import annotations
+import asyncio
 import discord
-import pandas as pd
-import matplotlib.pyplot as plt
 
 from datetime import datetime
 from io import BytesIO
 from typing import List, Tuple, Any, Optional
 
-from plottable import Table, ColumnDefinition
-
 from osu import LegacyScore, SoloScore
 
+from leaderboard_draw import RENDER_BACKENDS
+from utils_v2.render_cache import RenderCache
+from utils_v2.render_worker import RenderPool, RenderQueueFull
+from utils_v2.single_flight import SingleFlight
+
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -26,6 +28,7 @@ class BaseRenderer:
     def __init__(self, bot: OsuArena):
         self.bot = bot
         self.osu_client = bot.osu_client
+        self.osu_api = bot.osu_api
 
     def get_flag(self, country_code: str) -> str:
         if not country_code:
@@ -46,7 +49,7 @@ class BaseRenderer:
     async def ensure_full_user(self, user):
         if user.statistics is None or user.country_code is None:
             try:
-                return await self.osu_client.get_user(user.id, mode="osu")
+                return await self.osu_api.get_user(user.id, mode="osu")
             except Exception as e:
                 print(f"Renderer Error: Could not fetch full user: {e}")
                 return user
@@ -54,10 +57,10 @@ class BaseRenderer:
 
 
 class Renderer(BaseRenderer):
-    def __init__(self, bot: OsuArena):
+    def __init__(self, bot: OsuArena, leaderboard_backend: Optional[str] = None):
         super().__init__(bot)
         self.score = ScoreRenderer(bot)
-        self.leaderboard = LeaderboardRenderer(bot)
+        self.leaderboard = LeaderboardRenderer(bot, leaderboard_backend)
 
 
 class ScoreRenderer(BaseRenderer):
@@ -162,77 +165,110 @@ class LeaderboardRenderer(BaseRenderer):
     EVEN_ROW_COLOR = "#222222"
     TEXT_COLOR = "white"
     FONT_SIZE = 14
+    DPI = 250
+    BOLD_COLUMNS = ("osu_username", "challenger", "challenged")
+
+    DEFAULT_BACKEND = "plottable"
+
+    def __init__(self, bot: OsuArena, backend: Optional[str] = None):
+        """``backend`` is a key of ``RENDER_BACKENDS``, defaults to the bot's
+        ``render_backend`` (``ENV.RENDER_BACKEND``)."""
+        super().__init__(bot)
+        backend = backend or getattr(bot, "render_backend", self.DEFAULT_BACKEND)
+        self.log_handler = bot.log_handler
+        if backend not in RENDER_BACKENDS:
+            self.log_handler.logger.warning(
+                f"LeaderboardRenderer: unknown backend '{backend}', "
+                f"using '{self.DEFAULT_BACKEND}'"
+            )
+            backend = self.DEFAULT_BACKEND
+        self.backend = backend
+        self.draw = RENDER_BACKENDS[backend]
+        self.render_cache: Optional[RenderCache] = getattr(bot, "render_cache", None)
+        self.render_pool: Optional[RenderPool] = getattr(bot, "render_pool", None)
+        # shared through the bot so renderers of different cogs coalesce too
+        self.flight: SingleFlight = getattr(bot, "render_flight", None) or SingleFlight(
+            "render"
+        )
 
     async def render_image(
-        self, headers: List[str], rows: List[Tuple[Any, ...]]
+        self,
+        headers: List[str],
+        rows: List[Tuple[Any, ...]],
+        permanent: bool = False,
     ) -> Optional[BytesIO]:
+        """Renders the table as a PNG, reusing a cached render of the same
+        content if there is one.
+
+        ``permanent`` marks the data as immutable (archived seasons), so the
+        render is kept for good instead of being subject to LRU eviction.
+        Concurrent calls for the same content share a single render.
+        """
         if not rows:
             return None
 
-        df = pd.DataFrame(rows, columns=headers)
-        first_col_name = df.columns[0]
-        n_rows, n_cols = df.shape
-
-        fig_width = n_cols * 3
-        fig_height = n_rows * 0.6 + 1
-
-        fig = None
+        style = self._style()
+        key = RenderCache.make_key(headers, rows, style)
+        data = await self.flight.run(
+            key, self._render_bytes, key, headers, rows, style, permanent
+        )
+        # every caller gets its own buffer, the bytes are shared
+        return BytesIO(data) if data else None
+
+    async def _render_bytes(
+        self,
+        key: str,
+        headers: List[str],
+        rows: List[Tuple[Any, ...]],
+        style: dict[str, Any],
+        permanent: bool,
+    ) -> Optional[bytes]:
+        if self.render_cache:
+            if (data := await self.render_cache.get(key)) is not None:
+                return data
 
         try:
-            fig, ax = plt.subplots(figsize=(fig_width, fig_height))
-            fig.set_facecolor("black")
-            ax.axis("off")
-
-            Table(
-                df,
-                ax=ax,
-                index_col=first_col_name,
-                textprops={
-                    "fontsize": self.FONT_SIZE,
-                    "color": self.TEXT_COLOR,
-                    "ha": "center",
-                    "family": "sans-serif",
-                },
-                column_definitions=self._get_column_defs(),
-                col_label_cell_kw={
-                    "facecolor": self.HEADER_COLOR,
-                    "edgecolor": "white",
-                    "linewidth": 1.5,
-                },
-                cell_kw={"edgecolor": "white", "linewidth": 1.5},
-                odd_row_color=self.ODD_ROW_COLOR,
-                even_row_color=self.EVEN_ROW_COLOR,
+            if self.render_pool:
+                data = await self.render_pool.run(
+                    self.draw, list(headers), [tuple(row) for row in rows], style
+                )
+            else:
+                data = self.draw(headers, rows, style)
+        except RenderQueueFull as e:
+            # shedding load on purpose, the caller tells the user to retry
+            self.log_handler.logger.warning(f"LeaderboardRenderer busy: {e}")
+            return None
+        except asyncio.TimeoutError as e:
+            await self.log_handler.report_error(
+                "LeaderboardRenderer._render_bytes()",
+                e,
+                f"Render of {len(rows)} rows timed out",
             )
-
-            buf = BytesIO()
-            plt.savefig(
-                buf,
-                format="png",
-                bbox_inches="tight",
-                dpi=250,
-                facecolor=fig.get_facecolor(),
+            return None
+        except Exception as e:
+            await self.log_handler.report_error(
+                "LeaderboardRenderer._render_bytes()",
+                e,
+                f"Render of {len(rows)} rows failed ({self.backend})",
             )
-            buf.seek(0)
-            return buf
+            return None
 
-        except Exception as e:
-            print(f"LeaderboardRenderer Error: {e}")
+        if not data:
             return None
-        finally:
-            if fig:
-                plt.close(fig)
-
-    def _get_column_defs(self) -> List[ColumnDefinition]:
-        return [
-            ColumnDefinition(
-                name="osu_username",
-                textprops={"weight": "bold", "ha": "left"},
-                width=1.2,
-            ),
-            ColumnDefinition(
-                name="challenger", textprops={"weight": "bold", "ha": "left"}, width=1.2
-            ),
-            ColumnDefinition(
-                name="challenged", textprops={"weight": "bold", "ha": "left"}, width=1.2
-            ),
-        ]
+        if self.render_cache:
+            await self.render_cache.put(key, data, permanent=permanent)
+        return data
+
+    def _style(self) -> dict[str, Any]:
+        # everything that changes how the same rows look, this is also part
+        # of the render cache key
+        return {
+            "backend": self.backend,
+            "odd_row_color": self.ODD_ROW_COLOR,
+            "even_row_color": self.EVEN_ROW_COLOR,
+            "text_color": self.TEXT_COLOR,
+            "header_color": self.HEADER_COLOR,
+            "font_size": self.FONT_SIZE,
+            "dpi": self.DPI,
+            "bold_columns": list(self.BOLD_COLUMNS),
+        }
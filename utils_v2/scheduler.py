@@ -0,0 +1,213 @@
+"""
+Small adaptive scheduler for the Monitor cog's background detectors.
+"""
+
+from __future__ import annotations
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from utils_v2.log_handler import LogHandler
+
+
+class AdaptiveInterval:
+    """Interval that shrinks while there's work and backs off while there isn't.
+
+    Every run that found work divides the interval by ``factor`` (down to
+    ``min_interval``), every idle or failed run multiplies it (up to
+    ``max_interval``). :meth:`next_delay` adds +-``jitter`` so jobs that back
+    off together don't fire together.
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        factor: float = 2.0,
+        jitter: float = 0.1,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.factor = factor
+        self.jitter = jitter
+        self.current = min_interval
+
+    def shrink(self) -> None:
+        self.current = max(self.min_interval, self.current / self.factor)
+
+    def grow(self) -> None:
+        self.current = min(self.max_interval, self.current * self.factor)
+
+    def next_delay(self) -> float:
+        return self.current * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    func: Callable[[], Awaitable[int]]
+    interval: AdaptiveInterval
+    floor: Callable[[], float] | None = None
+    next_run: float = 0.0
+    runs: int = 0
+    events: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    last_latency: float | None = None
+    max_latency: float = 0.0
+    total_latency: float = 0.0
+    last_run_at: float | None = None
+    last_error: str | None = None
+
+
+class AdaptiveScheduler:
+    """Runs registered jobs on their own :class:`AdaptiveInterval`.
+
+    Every job runs in its own task, so a slow run of one job never delays
+    another. A job is a coroutine function returning how many events it handled, a
+    positive count shrinks its interval, zero or an exception grows it.
+    Exceptions are swallowed so one detector can't stop the others, and are
+    only reported once a job failed ``max_failures`` runs in a row.
+
+    Parameters
+    -----------
+    log_handler: :class:`LogHandler`
+        The logger used for error handling and exception reporting.
+    name: :class:`str`
+        Used in log and error messages.
+    max_failures: :class:`int`
+        Consecutive failures before a job's error gets reported.
+    """
+
+    def __init__(self, log_handler: LogHandler, name: str, max_failures: int = 3):
+        self.log_handler = log_handler
+        self.logger = log_handler.logger
+        self.name = name
+        self.max_failures = max_failures
+        self.jobs: dict[str, ScheduledJob] = {}
+        self._ready: asyncio.Future | None = None
+        self._runners: dict[str, asyncio.Task] = {}
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[int]],
+        min_interval: float,
+        max_interval: float,
+        floor: Callable[[], float] | None = None,
+    ) -> ScheduledJob:
+        """Registers ``func`` under ``name``.
+
+        ``floor`` is re-read before every sleep and raises the delay above the
+        adaptive one, e.g. while another source already delivers the events.
+        """
+        job = ScheduledJob(
+            name=name,
+            func=func,
+            interval=AdaptiveInterval(min_interval, max_interval),
+            floor=floor,
+        )
+        self.jobs[name] = job
+        return job
+
+    def start(self, wait_for: Awaitable[Any] | None = None) -> None:
+        """Starts one runner task per job, after ``wait_for`` finished if given."""
+        if self.running:
+            return
+        self._ready = asyncio.ensure_future(wait_for) if wait_for else None
+        self._runners = {
+            name: asyncio.create_task(
+                self._run_forever(job), name=f"{self.name}.{name}"
+            )
+            for name, job in self.jobs.items()
+        }
+
+    def stop(self) -> None:
+        if self._ready:
+            self._ready.cancel()
+            self._ready = None
+        for runner in self._runners.values():
+            runner.cancel()
+        self._runners = {}
+
+    @property
+    def running(self) -> bool:
+        return any(not runner.done() for runner in self._runners.values())
+
+    def status(self) -> list[dict[str, Any]]:
+        """Current interval, last run latency and counters for every job."""
+        now = time.monotonic()
+        return [
+            {
+                "name": job.name,
+                "interval": job.interval.current,
+                "next_in": max(0.0, job.next_run - now),
+                "last_latency": job.last_latency,
+                "avg_latency": job.total_latency / job.runs if job.runs else None,
+                "max_latency": job.max_latency,
+                "running": name in self._runners and not self._runners[name].done(),
+                "last_run_ago": (
+                    now - job.last_run_at if job.last_run_at is not None else None
+                ),
+                "runs": job.runs,
+                "events": job.events,
+                "failures": job.failures,
+                "consecutive_failures": job.consecutive_failures,
+                "last_error": job.last_error,
+            }
+            for name, job in self.jobs.items()
+        ]
+
+    async def _run_forever(self, job: ScheduledJob) -> None:
+        if self._ready is not None:
+            # shared by every runner, shielded so one being cancelled
+            # doesn't cancel the wait for the others
+            await asyncio.shield(self._ready)
+        while True:
+            delay = job.next_run - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self._run_job(job)
+
+    async def _run_job(self, job: ScheduledJob) -> None:
+        start = time.monotonic()
+        try:
+            handled = await job.func() or 0
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            job.failures += 1
+            job.consecutive_failures += 1
+            job.last_error = f"{type(error).__name__}: {error}"
+            job.interval.grow()
+            self.logger.warning(
+                f"{self.name} job '{job.name}' failed "
+                f"({job.consecutive_failures}/{self.max_failures}): {error}"
+            )
+            if job.consecutive_failures == self.max_failures:
+                await self.log_handler.report_error(
+                    f"{self.name}.{job.name}()",
+                    error,
+                    f"Failed {self.max_failures} runs in a row, backing off to "
+                    f"{job.interval.current:.1f}s.",
+                )
+        else:
+            job.consecutive_failures = 0
+            job.events += handled
+            if handled:
+                job.interval.shrink()
+            else:
+                job.interval.grow()
+        finally:
+            job.runs += 1
+            job.last_run_at = time.monotonic()
+            job.last_latency = job.last_run_at - start
+            job.total_latency += job.last_latency
+            job.max_latency = max(job.max_latency, job.last_latency)
+
+            delay = job.interval.next_delay()
+            if job.floor:
+                delay = max(delay, job.floor())
+            job.next_run = job.last_run_at + delay
@@ -0,0 +1,157 @@
+from __future__ import annotations
+import math
+import re
+import discord
+from typing import TYPE_CHECKING
+
+from load_env import ENV
+from utils_v2.enums.status import FuncStatus
+from utils_v2.enums.tables import TablesLeagues
+from utils_v2.renderer import Renderer
+
+if TYPE_CHECKING:
+    from bot import OsuArena
+
+
+class ShowPageView(discord.ui.View):
+    """Prev / page / next buttons under a paged ``/show`` league table.
+
+    The prev and next buttons are :class:`ShowPageButton` items, so they keep
+    working after a restart without the view being stored anywhere.
+    """
+
+    def __init__(self, league: str, page: int, pages: int):
+        super().__init__(timeout=None)
+        last = pages - 1
+        self.add_item(ShowPageButton(league, max(page - 1, 0), "◀", disabled=page <= 0))
+        self.add_item(
+            discord.ui.Button(
+                label=f"{page + 1}/{pages}",
+                style=discord.ButtonStyle.secondary,
+                custom_id=f"show::{league}::current",
+                disabled=True,
+            )
+        )
+        self.add_item(
+            ShowPageButton(league, min(page + 1, last), "▶", disabled=page >= last)
+        )
+
+
+class ShowPageButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"show::(?P<league>[a-z_]+)::(?P<page>\d+)",
+):
+    def __init__(
+        self, league: str, page: int, label: str = "▶", disabled: bool = False
+    ) -> None:
+        super().__init__(
+            discord.ui.Button(
+                label=label,
+                style=discord.ButtonStyle.primary,
+                custom_id=f"show::{league}::{page}",
+                disabled=disabled,
+            )
+        )
+        self.league = league
+        self.page = page
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        interaction: discord.Interaction,
+        item: discord.ui.Button,
+        match: re.Match[str],
+        /,
+    ):
+        return cls(match["league"], int(match["page"]))
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        await interaction.response.defer()
+        bot: OsuArena = interaction.client
+
+        if self.league not in [t.value for t in TablesLeagues]:
+            return await interaction.followup.send(
+                "❌ This table can't be paged anymore.", ephemeral=True
+            )
+
+        # the table was synced when /show ran, paging only reads
+        result = await build_league_page(bot, self.league, self.page, sync=False)
+        if result is FuncStatus.EMPTY:
+            return await interaction.edit_original_response(
+                content="⚠️ This table is empty.",
+                embed=None,
+                attachments=[],
+                view=None,
+            )
+        if result is FuncStatus.ERROR:
+            return await interaction.followup.send(
+                "⚠️ Failed to load this page.", ephemeral=True
+            )
+
+        embed, file, view = result
+        await interaction.edit_original_response(
+            embed=embed, attachments=[file], view=view
+        )
+
+
+async def build_league_page(
+    bot: OsuArena, league: str, page: int, sync: bool = True
+) -> tuple[discord.Embed, discord.File, ShowPageView | None] | FuncStatus:
+    """|coro|
+    Fetches and renders a single page of a current league table.
+
+    Only the rows of ``page`` are fetched and drawn, so the image stays the
+    same size no matter how many players the league has. A page past the
+    end (the league shrank since the buttons were made) falls back to the
+    last page.
+
+    Parameters
+    -----------
+    bot : class:`OsuArena`
+        The bot, for its database handler and render cache/pool.
+    league : class:`str`
+        The league table (one of ``TablesLeagues``).
+    page : class:`int`
+        Zero based page number.
+    sync : class:`bool`
+        Sync the league's PP values before reading.
+
+    Returns
+    -----------
+    tuple[discord.Embed, discord.File, ShowPageView | None] | FuncStatus
+        The embed, its image and the buttons (``None`` for a single page),
+        ``FuncStatus.EMPTY`` for an empty league or ``FuncStatus.ERROR``.
+    """
+    page_size = max(1, ENV.SHOW_PAGE_SIZE)
+    result = await bot.db_handler.get_current_league_page(
+        league, page, page_size, sync=sync
+    )
+    if result is FuncStatus.ERROR:
+        return FuncStatus.ERROR
+    headers, rows, total = result
+    if not rows and total:
+        page = math.ceil(total / page_size) - 1
+        result = await bot.db_handler.get_current_league_page(
+            league, page, page_size, sync=False
+        )
+        if result is FuncStatus.ERROR:
+            return FuncStatus.ERROR
+        headers, rows, total = result
+    if not rows:
+        return FuncStatus.EMPTY if total == 0 else FuncStatus.ERROR
+
+    image_buf = await Renderer(bot).leaderboard.render_image(headers, rows)
+    if not image_buf:
+        return FuncStatus.ERROR
+
+    pages = max(1, math.ceil(total / page_size))
+    start = page * page_size
+    file = discord.File(fp=image_buf, filename="table.png")
+    embed = discord.Embed(title=league.capitalize(), color=discord.Color.blue())
+    embed.set_image(url="attachment://table.png")
+    embed.set_footer(
+        text=f"Page {page + 1}/{pages} • #{start + 1}-{start + len(rows)} of {total}"
+    )
+
+    view = ShowPageView(league, page, pages) if pages > 1 else None
+    return embed, file, view
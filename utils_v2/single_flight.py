@@ -0,0 +1,83 @@
+"""
+Request coalescing: concurrent identical calls share one in-flight call.
+"""
+
+from __future__ import annotations
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time.
+
+    A call made while another call with the same key is still running
+    doesn't start its own, it waits for the running one and gets the same
+    result (or exception). Nothing is kept once the call finished, this is
+    not a cache, the next call after that runs again.
+
+    The shared call is shielded, so a waiter being cancelled (e.g. an
+    interaction timing out) never cancels it for the others.
+
+    Parameters
+    -----------
+    name: :class:`str`
+        Used in the task names, to tell flights apart when debugging.
+    """
+
+    def __init__(self, name: str = "flight"):
+        self.name = name
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.deduplicated = 0
+
+    async def run(
+        self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs
+    ) -> Any:
+        """|coro|
+        Returns ``await func(*args, **kwargs)``, shared with every concurrent
+        call made with the same ``key``.
+
+        Results are shared as is, callers must not mutate them.
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.deduplicated += 1
+        else:
+            self.calls += 1
+            task = asyncio.create_task(
+                func(*args, **kwargs), name=f"{self.name}:{key!r}"
+            )
+            self._in_flight[key] = task
+            task.add_done_callback(functools.partial(self._done, key))
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, Any]:
+        requests = self.calls + self.deduplicated
+        return {
+            "in_flight": len(self._in_flight),
+            "calls": self.calls,
+            "deduplicated": self.deduplicated,
+            "dedup_rate": self.deduplicated / requests if requests else 0.0,
+        }
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # every waiter may be gone, don't let the error go "never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+
+def coalesced(method: Callable[..., Awaitable[Any]]):
+    """Decorator for async methods of objects with a ``flight`` attribute
+    (a :class:`SingleFlight`), concurrent calls with the same arguments share
+    one call. Every argument has to be hashable.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        return await self.flight.run(key, method, self, *args, **kwargs)
+
+    return wrapper
@@ -213,6 +213,58 @@ $$;
 ALTER FUNCTION "public"."backup_historical_points"("column_name" "text") OWNER TO "postgres";
 
 
+CREATE OR REPLACE FUNCTION "public"."close_season"("league_tables" "text"[]) RETURNS TABLE("season" integer, "step" "text", "rows_affected" integer, "elapsed_ms" double precision)
+    LANGUAGE "plpgsql" SECURITY DEFINER
+    AS $$
+#variable_conflict use_column
+DECLARE
+  league text;
+  step_start timestamptz;
+BEGIN
+  -- everything below runs in the caller's single transaction, any error
+  -- rolls the whole season close back, nothing is left half archived.
+  -- the league snapshots are taken afterwards, in parallel, by snapshot_league;
+  -- missing_league_snapshots tells which of them still have to be retried
+
+  step_start := clock_timestamp();
+  SELECT s.season INTO season
+  FROM seasons s
+  WHERE s.status = 'Ongoing'
+  FOR UPDATE;
+  IF season IS NULL THEN
+    RAISE EXCEPTION 'close_season: no ongoing season';
+  END IF;
+
+  UPDATE seasons SET status = 'Archived'
+  WHERE seasons.season = close_season.season AND status = 'Ongoing';
+  GET DIAGNOSTICS rows_affected = ROW_COUNT;
+  step := 'archive season';
+  elapsed_ms := extract(epoch FROM clock_timestamp() - step_start) * 1000;
+  RETURN NEXT;
+
+  FOREACH league IN ARRAY league_tables LOOP
+    step_start := clock_timestamp();
+    PERFORM sync_table_pp(league);
+    PERFORM award_seasonal_points(league);
+    step := 'points ' || league;
+    rows_affected := NULL;
+    elapsed_ms := extract(epoch FROM clock_timestamp() - step_start) * 1000;
+    RETURN NEXT;
+  END LOOP;
+
+  step_start := clock_timestamp();
+  PERFORM backup_historical_points('season_' || season);
+  step := 'backup points';
+  rows_affected := NULL;
+  elapsed_ms := extract(epoch FROM clock_timestamp() - step_start) * 1000;
+  RETURN NEXT;
+END;
+$$;
+
+
+ALTER FUNCTION "public"."close_season"("league_tables" "text"[]) OWNER TO "postgres";
+
+
 CREATE OR REPLACE FUNCTION "public"."decline_challenge"("p_challenge_id" integer, OUT "out_challenger_id" bigint, OUT "out_challenged_id" bigint, OUT "out_for_pp" numeric) RETURNS "record"
     LANGUAGE "plpgsql"
     AS $$
@@ -279,10 +331,14 @@ CREATE TABLE IF NOT EXISTS "public"."discord_osu" (
     "top_play_announce" boolean DEFAULT false,
     "new_player_announce" boolean DEFAULT false,
     "points" integer DEFAULT 0,
-    "seasonal_points" integer DEFAULT 0
+    "seasonal_points" integer DEFAULT 0,
+    "pp_updated_at" timestamp with time zone DEFAULT "clock_timestamp"() NOT NULL
 );
 
 
+ALTER TABLE ONLY "public"."discord_osu" REPLICA IDENTITY FULL;
+
+
 ALTER TABLE "public"."discord_osu" OWNER TO "postgres";
 
 
@@ -290,6 +346,10 @@ COMMENT ON COLUMN "public"."discord_osu"."points" IS 'Stores points for players
 
 
 
+COMMENT ON COLUMN "public"."discord_osu"."pp_updated_at" IS 'Last change of a column sync_table_pp copies into the league tables, kept by touch_pp_updated_at()';
+
+
+
 CREATE OR REPLACE FUNCTION "public"."get_mismatched_rows"() RETURNS SETOF "public"."discord_osu"
     LANGUAGE "sql" SECURITY DEFINER
     AS $$
@@ -345,6 +405,20 @@ $$;
 ALTER FUNCTION "public"."log_to_challenge_table"("discord_username" "text", "osu_username" "text", "discord_id" bigint, "challenge_id" "text", "challenge_table" "text") OWNER TO "postgres";
 
 
+CREATE OR REPLACE FUNCTION "public"."missing_league_snapshots"("league_tables" "text"[], "season" integer) RETURNS SETOF "text"
+    LANGUAGE "sql" STABLE SECURITY DEFINER
+    AS $$
+  -- a snapshot only exists once it passed snapshot_league's checks (a bad
+  -- copy is rolled back), so any archive table that exists is complete
+  SELECT league
+  FROM unnest(league_tables) AS league
+  WHERE to_regclass(format('public.%I', league || '_' || season)) IS NULL;
+$$;
+
+
+ALTER FUNCTION "public"."missing_league_snapshots"("league_tables" "text"[], "season" integer) OWNER TO "postgres";
+
+
 CREATE OR REPLACE FUNCTION "public"."reset_seasonal_points"() RETURNS "void"
     LANGUAGE "plpgsql"
     AS $$begin
@@ -358,6 +432,96 @@ end;$$;
 ALTER FUNCTION "public"."reset_seasonal_points"() OWNER TO "postgres";
 
 
+CREATE OR REPLACE FUNCTION "public"."settle_finished_rivals"() RETURNS TABLE("challenge_id" integer, "winner" "text", "loser" "text", "winner_id" bigint, "loser_id" bigint, "for_pp" integer, "msg_id" bigint)
+    LANGUAGE "plpgsql"
+    AS $$
+#variable_conflict use_column
+begin
+  -- Finishes every unfinished rival that crossed for_pp and hands out the
+  -- points in the same statement. Concurrent callers can't settle the same
+  -- challenge twice: the second one re-checks challenge_status after the
+  -- row lock and skips it.
+  return query
+  with finished as (
+    update rivals r
+    set
+      challenge_status = 'Finished',
+      winner = case when r.challenger_stats >= r.for_pp then r.challenger else r.challenged end,
+      ended_at = now()
+    where r.challenge_status = 'Unfinished'
+      and (r.challenger_stats >= r.for_pp or r.challenged_stats >= r.for_pp)
+    returning
+      r.challenge_id,
+      r.winner,
+      case when r.challenger_stats >= r.for_pp then r.challenged else r.challenger end as loser,
+      r.for_pp
+  ),
+  deltas as (
+    select f.winner as osu_username, f.for_pp::integer as delta from finished f
+    union all
+    -- float8 round() rounds half to even, same as the bot's python round()
+    select f.loser, -round((f.for_pp / 2.0)::float8)::integer from finished f
+  ),
+  awarded as (
+    update discord_osu d
+    set
+      points = coalesce(d.points, 0) + t.delta,
+      seasonal_points = coalesce(d.seasonal_points, 0) + t.delta
+    from (
+      select osu_username, sum(delta)::integer as delta from deltas group by osu_username
+    ) t
+    where d.osu_username = t.osu_username
+    returning d.osu_username, d.discord_id
+  )
+  select
+    f.challenge_id::integer,
+    f.winner,
+    f.loser,
+    w.discord_id,
+    l.discord_id,
+    f.for_pp::integer,
+    m.msg_id
+  from finished f
+  left join awarded w on w.osu_username = f.winner
+  left join awarded l on l.osu_username = f.loser
+  left join lateral (
+    select mi.msg_id from mesg_id mi where mi.challenge_id = f.challenge_id limit 1
+  ) m on true;
+end;
+$$;
+
+
+ALTER FUNCTION "public"."settle_finished_rivals"() OWNER TO "postgres";
+
+
+CREATE OR REPLACE FUNCTION "public"."snapshot_league"("source_table" "text", "new_table_name" "text") RETURNS TABLE("source_rows" bigint, "snapshot_rows" bigint, "source_checksum" "text", "snapshot_checksum" "text")
+    LANGUAGE "plpgsql" SECURITY DEFINER
+    AS $$
+DECLARE
+  -- order independent checksum of every row, as text
+  checksum_sql constant text :=
+    'SELECT count(*), md5(coalesce(string_agg(md5(t::text), '''' ORDER BY md5(t::text)), '''')) FROM %I t';
+BEGIN
+  -- no writes to the league while it's copied and compared
+  EXECUTE format('LOCK TABLE %I IN SHARE MODE', source_table);
+  EXECUTE format('CREATE TABLE %I AS SELECT * FROM %I', new_table_name, source_table);
+
+  EXECUTE format(checksum_sql, source_table) INTO source_rows, source_checksum;
+  EXECUTE format(checksum_sql, new_table_name) INTO snapshot_rows, snapshot_checksum;
+
+  -- a bad copy is rolled back with the error, so the snapshot can be retried
+  IF source_rows <> snapshot_rows OR source_checksum <> snapshot_checksum THEN
+    RAISE EXCEPTION 'snapshot_league: % does not match % (% vs % rows)',
+      new_table_name, source_table, snapshot_rows, source_rows;
+  END IF;
+  RETURN NEXT;
+END;
+$$;
+
+
+ALTER FUNCTION "public"."snapshot_league"("source_table" "text", "new_table_name" "text") OWNER TO "postgres";
+
+
 CREATE OR REPLACE FUNCTION "public"."sync_rivals"() RETURNS "void"
     LANGUAGE "plpgsql"
     AS $$BEGIN 
@@ -405,6 +569,85 @@ $$;
 ALTER FUNCTION "public"."sync_table_pp"("tbl_name" "text") OWNER TO "postgres";
 
 
+CREATE OR REPLACE FUNCTION "public"."sync_table_pp_dirty"("tbl_name" "text") RETURNS integer
+    LANGUAGE "plpgsql"
+    AS $_$
+DECLARE
+  started timestamptz := clock_timestamp();
+  since timestamptz;
+  synced integer := 0;
+  dirty boolean;
+  -- players changed since $1 whose league row doesn't match them yet
+  changed_sql constant text :=
+    'FROM discord_osu u
+     JOIN %I s ON s.discord_username = u.discord_username
+     WHERE u.pp_updated_at > $1
+       AND (s.current_pp, s.osu_username, s.global_rank, s.ii)
+           IS DISTINCT FROM (u.current_pp, u.osu_username, u.global_rank, u.ii)';
+BEGIN
+  -- the overlap catches discord_osu writes that were still uncommitted when
+  -- the previous sync ran, re-checking them is free thanks to the
+  -- IS DISTINCT FROM guard
+  SELECT s.synced_at - interval '1 minute' INTO since
+  FROM league_sync_state s
+  WHERE s.league = tbl_name;
+
+  -- nothing dirty: no lock and no write, a read of the changed rows only
+  IF since IS NOT NULL THEN
+    EXECUTE format('SELECT EXISTS (SELECT 1 ' || changed_sql || ')', tbl_name)
+      INTO dirty USING since;
+    IF NOT dirty THEN
+      RETURN 0;
+    END IF;
+  END IF;
+
+  SELECT s.synced_at INTO since
+  FROM league_sync_state s
+  WHERE s.league = tbl_name
+  FOR UPDATE;
+  since := coalesce(since - interval '1 minute', '-infinity');
+
+  EXECUTE format(
+    'UPDATE %I s
+     SET current_pp = u.current_pp, osu_username = u.osu_username, global_rank = u.global_rank, ii = u.ii
+     FROM discord_osu u
+     WHERE u.pp_updated_at > $1
+       AND s.discord_username = u.discord_username
+       AND (s.current_pp, s.osu_username, s.global_rank, s.ii)
+           IS DISTINCT FROM (u.current_pp, u.osu_username, u.global_rank, u.ii);',
+    tbl_name
+  ) USING since;
+  GET DIAGNOSTICS synced = ROW_COUNT;
+
+  INSERT INTO league_sync_state (league, synced_at)
+  VALUES (tbl_name, started)
+  ON CONFLICT (league) DO UPDATE SET synced_at = excluded.synced_at;
+
+  RETURN synced;
+END;
+$_$;
+
+
+ALTER FUNCTION "public"."sync_table_pp_dirty"("tbl_name" "text") OWNER TO "postgres";
+
+
+CREATE OR REPLACE FUNCTION "public"."touch_pp_updated_at"() RETURNS "trigger"
+    LANGUAGE "plpgsql"
+    AS $$
+BEGIN
+  -- discord_username is the key the league rows are matched on
+  IF (NEW.current_pp, NEW.osu_username, NEW.global_rank, NEW.ii, NEW.discord_username)
+     IS DISTINCT FROM (OLD.current_pp, OLD.osu_username, OLD.global_rank, OLD.ii, OLD.discord_username) THEN
+    NEW.pp_updated_at := clock_timestamp();
+  END IF;
+  RETURN NEW;
+END;
+$$;
+
+
+ALTER FUNCTION "public"."touch_pp_updated_at"() OWNER TO "postgres";
+
+
 CREATE OR REPLACE FUNCTION "public"."update_init_pp"("tbl_name" "text") RETURNS "void"
     LANGUAGE "plpgsql"
     AS $$
@@ -786,6 +1029,19 @@ ALTER TABLE "public"."historical_points" ALTER COLUMN "id" ADD GENERATED BY DEFA
 
 
 
+CREATE TABLE IF NOT EXISTS "public"."league_sync_state" (
+    "league" "text" NOT NULL,
+    "synced_at" timestamp with time zone NOT NULL
+);
+
+
+ALTER TABLE "public"."league_sync_state" OWNER TO "postgres";
+
+
+COMMENT ON TABLE "public"."league_sync_state" IS 'When sync_table_pp_dirty() last ran for each league table';
+
+
+
 CREATE TABLE IF NOT EXISTS "public"."master" (
     "discord_username" "text",
     "osu_username" "text",
@@ -1257,6 +1513,11 @@ ALTER TABLE ONLY "public"."historical_points"
 
 
 
+ALTER TABLE ONLY "public"."league_sync_state"
+    ADD CONSTRAINT "league_sync_state_pkey" PRIMARY KEY ("league");
+
+
+
 ALTER TABLE ONLY "public"."master"
     ADD CONSTRAINT "master_discord_username_key" UNIQUE ("discord_username");
 
@@ -1327,6 +1588,14 @@ ALTER TABLE ONLY "public"."silver"
 
 
 
+CREATE INDEX "discord_osu_pp_updated_at_idx" ON "public"."discord_osu" USING "btree" ("pp_updated_at");
+
+
+
+CREATE OR REPLACE TRIGGER "discord_osu_touch_pp_updated_at" BEFORE UPDATE ON "public"."discord_osu" FOR EACH ROW EXECUTE FUNCTION "public"."touch_pp_updated_at"();
+
+
+
 ALTER TABLE ONLY "public"."challenged"
     ADD CONSTRAINT "challenged_challenge_id_fkey" FOREIGN KEY ("challenge_id") REFERENCES "public"."rivals"("challenge_id") ON DELETE CASCADE;
 
@@ -1476,6 +1745,9 @@ ALTER TABLE "public"."gold" ENABLE ROW LEVEL SECURITY;
 ALTER TABLE "public"."historical_points" ENABLE ROW LEVEL SECURITY;
 
 
+ALTER TABLE "public"."league_sync_state" ENABLE ROW LEVEL SECURITY;
+
+
 ALTER TABLE "public"."master" ENABLE ROW LEVEL SECURITY;
 
 
@@ -1505,6 +1777,10 @@ ALTER TABLE "public"."silver" ENABLE ROW LEVEL SECURITY;
 ALTER PUBLICATION "supabase_realtime" OWNER TO "postgres";
 
 
+ALTER PUBLICATION "supabase_realtime" ADD TABLE ONLY "public"."discord_osu";
+ALTER PUBLICATION "supabase_realtime" ADD TABLE ONLY "public"."rivals";
+
+
 GRANT USAGE ON SCHEMA "public" TO "postgres";
 GRANT USAGE ON SCHEMA "public" TO "anon";
 GRANT USAGE ON SCHEMA "public" TO "authenticated";
@@ -1693,6 +1969,12 @@ GRANT ALL ON FUNCTION "public"."backup_historical_points"("column_name" "text")
 
 
 
+GRANT ALL ON FUNCTION "public"."close_season"("league_tables" "text"[]) TO "anon";
+GRANT ALL ON FUNCTION "public"."close_season"("league_tables" "text"[]) TO "authenticated";
+GRANT ALL ON FUNCTION "public"."close_season"("league_tables" "text"[]) TO "service_role";
+
+
+
 GRANT ALL ON FUNCTION "public"."decline_challenge"("p_challenge_id" integer, OUT "out_challenger_id" bigint, OUT "out_challenged_id" bigint, OUT "out_for_pp" numeric) TO "anon";
 GRANT ALL ON FUNCTION "public"."decline_challenge"("p_challenge_id" integer, OUT "out_challenger_id" bigint, OUT "out_challenged_id" bigint, OUT "out_for_pp" numeric) TO "authenticated";
 GRANT ALL ON FUNCTION "public"."decline_challenge"("p_challenge_id" integer, OUT "out_challenger_id" bigint, OUT "out_challenged_id" bigint, OUT "out_for_pp" numeric) TO "service_role";
@@ -1730,12 +2012,30 @@ GRANT ALL ON FUNCTION "public"."log_to_challenge_table"("discord_username" "text
 
 
 
+GRANT ALL ON FUNCTION "public"."missing_league_snapshots"("league_tables" "text"[], "season" integer) TO "anon";
+GRANT ALL ON FUNCTION "public"."missing_league_snapshots"("league_tables" "text"[], "season" integer) TO "authenticated";
+GRANT ALL ON FUNCTION "public"."missing_league_snapshots"("league_tables" "text"[], "season" integer) TO "service_role";
+
+
+
 GRANT ALL ON FUNCTION "public"."reset_seasonal_points"() TO "anon";
 GRANT ALL ON FUNCTION "public"."reset_seasonal_points"() TO "authenticated";
 GRANT ALL ON FUNCTION "public"."reset_seasonal_points"() TO "service_role";
 
 
 
+GRANT ALL ON FUNCTION "public"."settle_finished_rivals"() TO "anon";
+GRANT ALL ON FUNCTION "public"."settle_finished_rivals"() TO "authenticated";
+GRANT ALL ON FUNCTION "public"."settle_finished_rivals"() TO "service_role";
+
+
+
+GRANT ALL ON FUNCTION "public"."snapshot_league"("source_table" "text", "new_table_name" "text") TO "anon";
+GRANT ALL ON FUNCTION "public"."snapshot_league"("source_table" "text", "new_table_name" "text") TO "authenticated";
+GRANT ALL ON FUNCTION "public"."snapshot_league"("source_table" "text", "new_table_name" "text") TO "service_role";
+
+
+
 GRANT ALL ON FUNCTION "public"."sync_rivals"() TO "anon";
 GRANT ALL ON FUNCTION "public"."sync_rivals"() TO "authenticated";
 GRANT ALL ON FUNCTION "public"."sync_rivals"() TO "service_role";
@@ -1748,6 +2048,18 @@ GRANT ALL ON FUNCTION "public"."sync_table_pp"("tbl_name" "text") TO "service_ro
 
 
 
+GRANT ALL ON FUNCTION "public"."sync_table_pp_dirty"("tbl_name" "text") TO "anon";
+GRANT ALL ON FUNCTION "public"."sync_table_pp_dirty"("tbl_name" "text") TO "authenticated";
+GRANT ALL ON FUNCTION "public"."sync_table_pp_dirty"("tbl_name" "text") TO "service_role";
+
+
+
+GRANT ALL ON FUNCTION "public"."touch_pp_updated_at"() TO "anon";
+GRANT ALL ON FUNCTION "public"."touch_pp_updated_at"() TO "authenticated";
+GRANT ALL ON FUNCTION "public"."touch_pp_updated_at"() TO "service_role";
+
+
+
 GRANT ALL ON FUNCTION "public"."update_init_pp"("tbl_name" "text") TO "anon";
 GRANT ALL ON FUNCTION "public"."update_init_pp"("tbl_name" "text") TO "authenticated";
 GRANT ALL ON FUNCTION "public"."update_init_pp"("tbl_name" "text") TO "service_role";
@@ -1929,6 +2241,12 @@ GRANT ALL ON SEQUENCE "public"."historical_point_id_seq" TO "service_role";
 
 
 
+GRANT SELECT,INSERT,REFERENCES,DELETE,TRIGGER,TRUNCATE,UPDATE ON TABLE "public"."league_sync_state" TO "anon";
+GRANT SELECT,INSERT,REFERENCES,DELETE,TRIGGER,TRUNCATE,UPDATE ON TABLE "public"."league_sync_state" TO "authenticated";
+GRANT SELECT,INSERT,REFERENCES,DELETE,TRIGGER,TRUNCATE,UPDATE ON TABLE "public"."league_sync_state" TO "service_role";
+
+
+
 GRANT SELECT,INSERT,REFERENCES,DELETE,TRIGGER,TRUNCATE,UPDATE ON TABLE "public"."master" TO "anon";
 GRANT SELECT,INSERT,REFERENCES,DELETE,TRIGGER,TRUNCATE,UPDATE ON TABLE "public"."master" TO "authenticated";
 GRANT SELECT,INSERT,REFERENCES,DELETE,TRIGGER,TRUNCATE,UPDATE ON TABLE "public"."master" TO "service_role";
@@ -13,6 +13,7 @@ class QuartApp:
         self.web_helper = None
         self.log_handler = LogHandler(logger_name="web")
         self.app.secret_key = ENV.QUART_SECKEY
+        self.app.after_serving(self.log_handler.close)
 
         self.register_routes()
 
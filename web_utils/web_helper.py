@@ -13,8 +13,8 @@ from osu import (
     AsynchronousAuthHandler,
 )
 from supabase import AsyncClient
-from utils_v2 import InitExterns, LogHandler
-from utils_v2.db_handler import DatabaseHandler
+from utils_v2 import IdentityCache, InitExterns, LogHandler, OsuAPI_Handler
+from utils_v2.db_handler import IDENTITY_COLUMNS, DatabaseHandler
 from utils_v2.enums.status import FuncStatus
 from utils_v2.enums.tables import TableMiscellaneous
 from utils_v2.enums.tables_internals import DiscordOsuColumn, LeagueColumn
@@ -37,6 +37,7 @@ class WebHelper:
         self.osu_auth: Optional[AsynchronousAuthHandler] = None
         self.supabase_client: Optional[AsyncClient] = None
         self.osu_client: Optional[AsynchronousClient] = None
+        self.osu_api: Optional[OsuAPI_Handler] = None
         self.db_handler: DatabaseHandler = None
 
     @classmethod
@@ -51,14 +52,24 @@ class WebHelper:
             ENV.SUPABASE_URL, ENV.SUPABASE_KEY
         )
         self.osu_client = await init_obj.setup_osu_client(self.osu_auth)
-        self.db_handler = DatabaseHandler(self.log_handler, self.supabase_client)
+        # the bot uses the same app, this is the linker's part of its budget
+        self.osu_api = OsuAPI_Handler(
+            self.osu_client, requests_per_minute=ENV.WEB_OSU_API_RPM
+        )
+        self.db_handler = DatabaseHandler(
+            self.log_handler,
+            self.supabase_client,
+            IdentityCache(ENV.IDENTITY_CACHE_SIZE, ENV.IDENTITY_CACHE_TTL),
+            season_cache_ttl=ENV.SEASON_CACHE_TTL,
+            chunk_size=ENV.DB_CHUNK_SIZE,
+        )
 
         return self
 
     async def get_top_play(self, osu_id) -> dict[str, Any]:
         if osu_id:
             try:
-                top_scores = await self.osu_client.get_user_scores(
+                top_scores = await self.osu_api.get_user_scores(
                     osu_id, UserScoreType.BEST, limit=1
                 )
                 for score in top_scores:
@@ -108,13 +119,13 @@ class WebHelper:
     async def get_osu_user(self, code: str, discord_id: int):
         try:
             try:
-                await self.osu_auth.get_auth_token(code)
+                await self.osu_api.call(self.osu_auth.get_auth_token, code)
 
                 client = AsynchronousClient(self.osu_auth)
             except RequestException as _:
                 return FuncStatus.BAD_REQ
 
-            user = await client.get_own_data(mode="osu")
+            user = await self.osu_api.call(client.get_own_data, mode="osu")
 
             uname = user.username
             pp = round(user.statistics.pp)
@@ -208,6 +219,13 @@ class WebHelper:
             )
             return FuncStatus.ERROR
 
+        # freshly linked, replaces whatever was cached for this player
+        self.db_handler.identity_cache.put(
+            player_data[DiscordOsuColumn.DISCORD_ID],
+            osu_username=player_data[DiscordOsuColumn.OSU_USERNAME],
+            osu_id=player_data[DiscordOsuColumn.OSU_ID],
+        )
+
         try:
             await (
                 self.supabase_client.table(player_data[DiscordOsuColumn.LEAGUE])
@@ -277,16 +295,24 @@ class WebHelper:
         return discord_id
 
     async def check_ouser_existence(self, osu_id: int):
+        # always read, a stale cached link would block relinking this account
+        identity_cache = self.db_handler.identity_cache
         try:
             response = (
                 await self.supabase_client.table(TableMiscellaneous.DISCORD_OSU)
-                .select(DiscordOsuColumn.DISCORD_ID)
+                .select(IDENTITY_COLUMNS)
                 .eq(DiscordOsuColumn.OSU_ID, osu_id)
                 .maybe_single()
                 .execute()
             )
             if response and response.data:
+                identity_cache.put(
+                    response.data[DiscordOsuColumn.DISCORD_ID],
+                    osu_username=response.data[DiscordOsuColumn.OSU_USERNAME],
+                    osu_id=osu_id,
+                )
                 return response.data[DiscordOsuColumn.DISCORD_ID]
+            identity_cache.invalidate(osu_id=osu_id)
             return None
         except Exception as error:
             await self.log_handler.report_error(